@@ -0,0 +1,3 @@
+from benchmarks.common import agreement, match_counts, read_frames
+
+__all__ = ['agreement', 'match_counts', 'read_frames']
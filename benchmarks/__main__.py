@@ -0,0 +1,61 @@
+import argparse
+import json
+import sys
+
+from benchmarks.common import print_table, write_json
+from benchmarks.suite import compare, run_suite
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Per-stage latency and throughput benchmark for the detection pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[320, 640, 1280])
+    parser.add_argument("--densities", type=int, nargs="+", default=[0, 4, 16])
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--no-engine", action="store_true", help="skip the end-to-end DetectionEngine run")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown")
+    return parser.parse_args()
+
+
+def main():
+    args = _parse_args()
+    results = run_suite(args.sizes, args.densities, args.frames, args.seed, engine=not args.no_engine, device=args.device)
+
+    rows = []
+    for case in results['cases']:
+        stages = case['stages']
+        rows.append({
+            'size': case['size'],
+            'density': case['density'],
+            'fps': case['throughput_fps'],
+            'engine_fps': case.get('engine_fps', ''),
+            'dets': case['detections_per_frame'],
+            'infer_p50': stages['inference']['p50'],
+            'infer_p99': stages['inference']['p99'],
+            'total_p50': stages['total']['p50'],
+            'total_p99': stages['total']['p99'],
+            'rss_mb': case['peak_rss_mb'],
+        })
+    print_table(rows, list(rows[0]) if rows else [])
+
+    if args.json:
+        write_json(args.json, results)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
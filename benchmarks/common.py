@@ -0,0 +1,105 @@
+import json
+import sys
+
+import cv2
+import numpy as np
+
+from core.tracking import greedy_match, iou_matrix
+
+
+def read_frames(path, limit=None):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while limit is None or len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def match_counts(reference, candidate, iou_threshold=0.5):
+    iou = iou_matrix(reference.xyxy, candidate.xyxy)
+    iou[reference.cls[:, None] != candidate.cls[None, :]] = 0
+    return len(greedy_match(iou, iou_threshold)), len(reference.cls), len(candidate.cls)
+
+
+def agreement(reference_frames, candidate_frames, iou_threshold=0.5):
+    matched = expected = found = 0
+    for reference, candidate in zip(reference_frames, candidate_frames):
+        m, r, c = match_counts(reference, candidate, iou_threshold)
+        matched += m
+        expected += r
+        found += c
+
+    precision = matched / found if found else 1.0
+    recall = matched / expected if expected else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {'precision': round(precision, 4), 'recall': round(recall, 4), 'f1': round(f1, 4)}
+
+
+def average_precision(reference_frames, candidate_frames, iou_threshold=0.5):
+    scores, hits, totals = {}, {}, {}
+    for reference, candidate in zip(reference_frames, candidate_frames):
+        iou = iou_matrix(candidate.xyxy, reference.xyxy)
+        iou[candidate.cls[:, None] != reference.cls[None, :]] = 0
+        taken = np.zeros(len(reference.cls), bool)
+        for i in np.argsort(-candidate.conf, kind='stable').tolist():
+            row = np.where(taken, 0, iou[i])
+            j = int(row.argmax()) if len(row) else -1
+            hit = j >= 0 and row[j] >= iou_threshold
+            if hit:
+                taken[j] = True
+            cls = int(candidate.cls[i])
+            scores.setdefault(cls, []).append(float(candidate.conf[i]))
+            hits.setdefault(cls, []).append(hit)
+        for cls in reference.cls.tolist():
+            totals[cls] = totals.get(cls, 0) + 1
+
+    points = np.linspace(0, 1, 101)
+    aps = []
+    for cls, total in totals.items():
+        if cls not in scores:
+            aps.append(0.0)
+            continue
+        order = np.argsort(-np.asarray(scores[cls]), kind='stable')
+        tp = np.cumsum(np.asarray(hits[cls])[order])
+        recall = tp / total
+        precision = np.maximum.accumulate((tp / np.arange(1, len(tp) + 1))[::-1])[::-1]
+        index = np.searchsorted(recall, points, side='left')
+        aps.append(float(np.where(index < len(precision), precision[np.minimum(index, len(precision) - 1)], 0).mean()))
+    return round(float(np.mean(aps)), 4) if aps else 1.0
+
+
+def mean_average_precision(reference_frames, candidate_frames, thresholds=np.arange(0.5, 0.96, 0.05)):
+    return round(float(np.mean([average_precision(reference_frames, candidate_frames, t) for t in thresholds])), 4)
+
+
+def print_table(rows, columns):
+    widths = [max(len(str(column)), *(len(str(row.get(column, ''))) for row in rows)) for column in columns]
+    print("  ".join(str(column).ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row.get(column, '')).ljust(width) for column, width in zip(columns, widths)))
+
+
+def write_json(path, payload):
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+
+
+def latency_summary(samples_ms):
+    if not samples_ms:
+        return {'p50': None, 'p95': None, 'p99': None, 'mean': None}
+    values = np.asarray(samples_ms, np.float64)
+    p50, p95, p99 = np.percentile(values, (50, 95, 99)).tolist()
+    return {'p50': round(p50, 3), 'p95': round(p95, 3), 'p99': round(p99, 3), 'mean': round(float(values.mean()), 3)}
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
@@ -0,0 +1,100 @@
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+from benchmarks.common import read_frames
+from benchmarks.synthetic import synthetic_frames
+
+BOUNDARY = "frame"
+
+
+class FrameSource:
+    def __init__(self, frames, fps, quality, outage_every, outage_for):
+        self._frames = [cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])[1].tobytes()
+                        for frame in frames]
+        self._interval = 1.0 / fps
+        self._outage_every = outage_every
+        self._outage_for = outage_for
+        self._start = time.perf_counter()
+
+    def in_outage(self):
+        if not self._outage_every:
+            return False
+        return (time.perf_counter() - self._start) % (self._outage_every + self._outage_for) >= self._outage_every
+
+    def current(self):
+        elapsed = time.perf_counter() - self._start
+        return self._frames[int(elapsed / self._interval) % len(self._frames)]
+
+    @property
+    def interval(self):
+        return self._interval
+
+
+def make_handler(source):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if source.in_outage():
+                self.send_error(503)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', f'multipart/x-mixed-replace; boundary={BOUNDARY}')
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            next_time = time.perf_counter()
+            try:
+                while not source.in_outage():
+                    jpeg = source.current()
+                    self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                     f"Content-Length: {len(jpeg)}\r\n\r\n".encode())
+                    self.wfile.write(jpeg)
+                    self.wfile.write(b"\r\n")
+                    next_time += source.interval
+                    time.sleep(max(0.0, next_time - time.perf_counter()))
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(frames, host="127.0.0.1", port=8081, fps=25.0, quality=80, outage_every=0.0, outage_for=0.0):
+    source = FrameSource(frames, fps, quality, outage_every, outage_for)
+    server = ThreadingHTTPServer((host, port), make_handler(source))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.mjpeg_server",
+                                     description="Local MJPEG-over-HTTP camera stand-in with optional simulated outages.")
+    parser.add_argument("--clip", help="video to loop; synthetic frames are used when omitted")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--density", type=int, default=6, help="objects per synthetic frame")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--fps", type=float, default=25.0)
+    parser.add_argument("--quality", type=int, default=80)
+    parser.add_argument("--outage-every", type=float, default=0.0, help="seconds of service between outages")
+    parser.add_argument("--outage-for", type=float, default=5.0, help="length of each outage in seconds")
+    args = parser.parse_args()
+
+    frames = read_frames(args.clip, args.frames) if args.clip else synthetic_frames(args.density, args.frames)
+    server = serve(frames, args.host, args.port, args.fps, args.quality, args.outage_every, args.outage_for)
+    print(f"Streaming {len(frames)} frames at {args.fps:g} fps on http://{args.host}:{server.server_address[1]}/")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import average_precision, mean_average_precision, print_table, read_frames, write_json
+from config import BACKEND_ONNXRUNTIME, BACKEND_TORCH, DEFAULT_INFERENCE_SIZE, BACKEND_LABELS
+from core.backends import QUANTIZED_BACKENDS, calibration_dir, set_calibration_dir, unavailable_reason
+from core.processor import FrameProcessor
+from core.tracking import greedy_match, iou_matrix
+
+
+def run(backend, frames, size, conf_threshold):
+    processor = FrameProcessor(backend=backend, conf_threshold=conf_threshold, inference_size=size)
+    processor.warm_up()
+    detections = []
+    start = time.perf_counter()
+    for frame in frames:
+        results, geometries = processor.infer([frame])
+        detections.append(processor.extract(results[0], geometries[0]))
+    return detections, (time.perf_counter() - start) * 1000 / len(frames)
+
+
+def box_drift(reference_frames, candidate_frames, iou_threshold=0.5):
+    ious, shifts, confs = [], [], []
+    for reference, candidate in zip(reference_frames, candidate_frames):
+        iou = iou_matrix(reference.xyxy, candidate.xyxy)
+        iou[reference.cls[:, None] != candidate.cls[None, :]] = 0
+        for i, j in greedy_match(iou, iou_threshold):
+            a = reference.xyxy[i].astype(np.float32)
+            b = candidate.xyxy[j].astype(np.float32)
+            ious.append(iou[i, j])
+            shifts.append(np.abs(a - b).mean())
+            confs.append(abs(float(reference.conf[i]) - float(candidate.conf[j])))
+    if not ious:
+        return {'mean_iou': None, 'box_drift_px': None, 'conf_drift': None}
+    return {
+        'mean_iou': round(float(np.mean(ious)), 4),
+        'box_drift_px': round(float(np.mean(shifts)), 2),
+        'conf_drift': round(float(np.mean(confs)), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.quantization",
+                                     description="Accuracy and speed of INT8 models against the FP32 model on one clip.")
+    parser.add_argument("clip")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--size", type=int, default=DEFAULT_INFERENCE_SIZE)
+    parser.add_argument("--conf", type=float, default=0.05, help="low threshold so AP sees the full score range")
+    parser.add_argument("--reference", default=BACKEND_TORCH, choices=[BACKEND_TORCH, BACKEND_ONNXRUNTIME])
+    parser.add_argument("--calibration-dir", default=calibration_dir(),
+                        help="representative frames for the calibrated INT8 model")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    set_calibration_dir(args.calibration_dir)
+
+    frames = read_frames(args.clip, args.frames)
+    reference, reference_ms = run(args.reference, frames, args.size, args.conf)
+    rows = [{'model': f"FP32 ({BACKEND_LABELS[args.reference]})", 'ms_per_frame': round(reference_ms, 2),
+             'speedup': 1.0, 'ap50': 1.0, 'map': 1.0, 'mean_iou': 1.0, 'box_drift_px': 0.0, 'conf_drift': 0.0}]
+
+    for backend in QUANTIZED_BACKENDS:
+        reason = unavailable_reason(backend)
+        if reason:
+            print(f"Skipping {BACKEND_LABELS[backend]}: {reason}")
+            continue
+        candidate, ms = run(backend, frames, args.size, args.conf)
+        rows.append({
+            'model': BACKEND_LABELS[backend],
+            'ms_per_frame': round(ms, 2),
+            'speedup': round(reference_ms / ms, 2),
+            'ap50': average_precision(reference, candidate, 0.5),
+            'map': mean_average_precision(reference, candidate),
+            **box_drift(reference, candidate),
+        })
+
+    print_table(rows, ['model', 'ms_per_frame', 'speedup', 'ap50', 'map', 'mean_iou', 'box_drift_px', 'conf_drift'])
+    if args.json:
+        write_json(args.json, {'clip': args.clip, 'frames': len(frames), 'size': args.size,
+                               'reference': args.reference, 'results': rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import os
+import threading
+import time
+
+from benchmarks.common import print_table, read_frames, write_json
+from config import DEFAULT_CONFIDENCE, DEFAULT_INFERENCE_SIZE
+from core.processor import FrameProcessor
+from core.workers import InferencePool
+
+
+def run_inline(frames, size, threads):
+    import torch
+
+    torch.set_num_threads(threads)
+    processor = FrameProcessor(inference_size=size)
+    processor.warm_up()
+    start = time.perf_counter()
+    for frame in frames:
+        results, geometries = processor.infer([frame])
+        processor.extract(results[0], geometries[0])
+    return len(frames) / (time.perf_counter() - start)
+
+
+def run_pool(frames, size, workers):
+    pool = InferencePool(workers)
+    pool.start(frames[0].nbytes, size)
+    order = []
+    stamps = []
+
+    def consume():
+        for index, _ in pool.results():
+            order.append(index)
+            stamps.append(time.perf_counter())
+
+    consumer = threading.Thread(target=consume)
+    try:
+        consumer.start()
+        for index, frame in enumerate(frames):
+            pool.submit(index, frame, DEFAULT_CONFIDENCE, size)
+        pool.close()
+        consumer.join()
+    finally:
+        pool.stop()
+
+    if order != list(range(len(frames))):
+        raise RuntimeError("Pool returned results out of order")
+    warm = min(workers, len(frames) - 1)
+    elapsed = stamps[-1] - stamps[warm]
+    return (len(frames) - 1 - warm) / elapsed if elapsed > 0 else 0.0, pool.threads
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.scaling",
+                                     description="Inference throughput by worker process count.")
+    parser.add_argument("clip")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--size", type=int, default=DEFAULT_INFERENCE_SIZE)
+    parser.add_argument("--workers", type=int, nargs="+", default=[n for n in (1, 2, 4, 8, 16, 32) if n <= cpus])
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    frames = read_frames(args.clip, args.frames)
+    inline_fps = run_inline(frames, args.size, cpus)
+    rows = [{'mode': 'in-process', 'workers': 0, 'threads': cpus, 'fps': round(inline_fps, 1),
+             'speedup': 1.0, 'efficiency': None}]
+
+    for workers in args.workers:
+        fps, threads = run_pool(frames, args.size, workers)
+        rows.append({
+            'mode': 'pool',
+            'workers': workers,
+            'threads': threads,
+            'fps': round(fps, 1),
+            'speedup': round(fps / inline_fps, 2),
+            'efficiency': round(fps / inline_fps / workers, 2),
+        })
+
+    print_table(rows, ['mode', 'workers', 'threads', 'fps', 'speedup', 'efficiency'])
+    if args.json:
+        write_json(args.json, {'clip': args.clip, 'frames': len(frames), 'size': args.size, 'cpus': cpus,
+                               'results': rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import multiprocessing
+import os
+import platform
+import time
+
+import cv2
+
+from benchmarks.common import latency_summary, peak_rss_mb
+from benchmarks.synthetic import synthetic_frames, write_clip
+from config import DROP_POLICY_BLOCK, MODEL_PATH, PACING_THROUGHPUT
+from core.processor import FrameProcessor
+
+STAGES = ('decode', 'preprocess', 'inference', 'postprocess', 'extract', 'draw', 'count', 'total')
+LOWER_IS_BETTER = ('p50', 'p95')
+
+
+def run_stages(processor, path):
+    samples = {stage: [] for stage in STAGES}
+    detections_seen = 0
+    frames = 0
+    cap = cv2.VideoCapture(path)
+    start = time.perf_counter()
+
+    while True:
+        t0 = time.perf_counter()
+        ret, frame = cap.read()
+        t1 = time.perf_counter()
+        if not ret:
+            break
+
+        results, geometries = processor.infer([frame])
+        t2 = time.perf_counter()
+        detections = processor.extract(results[0], geometries[0])
+        t3 = time.perf_counter()
+        processor.draw(frame, detections)
+        t4 = time.perf_counter()
+        processor.count(detections)
+        t5 = time.perf_counter()
+
+        speed = results[0].speed
+        samples['decode'].append((t1 - t0) * 1000)
+        samples['preprocess'].append(processor.preprocess_ms)
+        samples['inference'].append(speed.get('inference') or (t2 - t1) * 1000 - processor.preprocess_ms)
+        samples['postprocess'].append(speed.get('postprocess') or 0.0)
+        samples['extract'].append((t3 - t2) * 1000)
+        samples['draw'].append((t4 - t3) * 1000)
+        samples['count'].append((t5 - t4) * 1000)
+        samples['total'].append((t5 - t0) * 1000)
+        detections_seen += len(detections.cls)
+        frames += 1
+
+    cap.release()
+    elapsed = time.perf_counter() - start
+    return {
+        'frames': frames,
+        'throughput_fps': round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+        'detections_per_frame': round(detections_seen / frames, 2) if frames else 0.0,
+        'stages': {stage: latency_summary(values) for stage, values in samples.items()},
+    }
+
+
+def run_engine(processor, path):
+    from PyQt5.QtCore import QCoreApplication
+    from core.detection import DetectionEngine
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    engine = DetectionEngine(processor)
+    engine.source = path
+    engine.drop_policy = DROP_POLICY_BLOCK
+    engine.pacing = PACING_THROUGHPUT
+    engine.running = True
+
+    engine.finished.connect(app.quit)
+
+    start = time.perf_counter()
+    engine.start()
+    app.exec_()
+    engine.stop()
+    elapsed = time.perf_counter() - start
+    return round(engine.annotated_frames / elapsed, 2) if elapsed > 0 else 0.0
+
+
+def run_case(path, size, density, engine, device):
+    processor = FrameProcessor(device=device, inference_size=size)
+    processor.warm_up()
+    case = {'size': size, 'density': density, **run_stages(processor, path)}
+    if engine:
+        case['engine_fps'] = run_engine(processor, path)
+    case['peak_rss_mb'] = peak_rss_mb()
+    return case
+
+
+def run_suite(sizes, densities, frame_count, seed=0, resolution=(1280, 720), engine=True, device='cpu'):
+    cases = []
+    context = multiprocessing.get_context('spawn')
+    for density in densities:
+        path = write_clip(synthetic_frames(density, frame_count, resolution, seed))
+        try:
+            for size in sizes:
+                with context.Pool(1) as pool:
+                    cases.append(pool.apply(run_case, (path, size, density, engine, device)))
+        finally:
+            os.remove(path)
+
+    return {
+        'meta': {
+            'model': MODEL_PATH,
+            'device': device,
+            'frames': frame_count,
+            'seed': seed,
+            'resolution': list(resolution),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'opencv': cv2.__version__,
+        },
+        'cases': cases,
+    }
+
+
+def compare(current, baseline, tolerance):
+    baseline_cases = {(case['size'], case['density']): case for case in baseline['cases']}
+    regressions = []
+
+    for case in current['cases']:
+        reference = baseline_cases.get((case['size'], case['density']))
+        if reference is None:
+            continue
+        label = f"size={case['size']} density={case['density']}"
+
+        for key in ('throughput_fps', 'engine_fps'):
+            new, old = case.get(key), reference.get(key)
+            if new and old and new < old * (1 - tolerance):
+                regressions.append(f"{label} {key}: {old} -> {new} ({(new / old - 1) * 100:+.1f}%)")
+
+        for stage, summary in case['stages'].items():
+            for stat in LOWER_IS_BETTER:
+                new = summary.get(stat)
+                old = reference['stages'].get(stage, {}).get(stat)
+                if new is not None and old and new > old * (1 + tolerance):
+                    regressions.append(f"{label} {stage}.{stat}: {old}ms -> {new}ms ({(new / old - 1) * 100:+.1f}%)")
+
+    return regressions
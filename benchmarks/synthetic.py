@@ -0,0 +1,65 @@
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from config import VIDEO_FPS
+
+SPRITE_IMAGE = "bus.jpg"
+SPRITE_BOX = (40, 390, 250, 910)
+
+
+def _sprite_path():
+    from ultralytics.utils import ASSETS
+
+    return os.path.join(str(ASSETS), SPRITE_IMAGE)
+
+
+def _load_sprite(width):
+    path = _sprite_path()
+    image = cv2.imread(path)
+    if image is None:
+        raise FileNotFoundError(path)
+    x1, y1, x2, y2 = SPRITE_BOX
+    sprite = image[y1:y2, x1:x2]
+    height = int(sprite.shape[0] * width / sprite.shape[1])
+    return cv2.resize(sprite, (width, height), interpolation=cv2.INTER_AREA)
+
+
+def synthetic_frames(density, count, size=(1280, 720), seed=0):
+    rng = np.random.default_rng(seed)
+    width, height = size
+    background = np.linspace(20, 90, width, dtype=np.float32)[None, :, None].repeat(height, 0).repeat(3, 2)
+    background = np.clip(background + rng.normal(0, 6, background.shape), 0, 255).astype(np.uint8)
+
+    sprite_width = max(48, width // max(4, int(np.sqrt(max(density, 1))) * 2))
+    sprite = _load_sprite(sprite_width)
+    sh, sw = sprite.shape[:2]
+    positions = rng.uniform((0, 0), (width - sw, height - sh), (density, 2))
+    velocities = rng.uniform(-6, 6, (density, 2))
+
+    frames = []
+    for _ in range(count):
+        frame = background.copy()
+        for x, y in positions.astype(int).tolist():
+            frame[y:y + sh, x:x + sw] = sprite
+        frames.append(frame)
+
+        positions += velocities
+        bounce = (positions < 0) | (positions > (width - sw, height - sh))
+        velocities[bounce] *= -1
+        np.clip(positions, 0, (width - sw, height - sh), out=positions)
+    return frames
+
+
+def write_clip(frames, path=None, fps=VIDEO_FPS):
+    if path is None:
+        handle, path = tempfile.mkstemp(suffix='.avi')
+        os.close(handle)
+    h, w = frames[0].shape[:2]
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, (w, h))
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+    return path
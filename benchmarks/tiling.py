@@ -0,0 +1,123 @@
+import argparse
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from benchmarks.common import agreement, match_counts, print_table, write_json
+from config import DEFAULT_INFERENCE_SIZE, IMAGE_SUFFIXES
+from core.processor import FrameProcessor
+from core.results import Detections, concat_detections, empty_detections, offset_detections
+from core.tiling import TileGrid, nms_detections
+
+SMALL_AREA = 32 * 32
+
+
+def label_path(image_path):
+    image_path = Path(image_path)
+    if image_path.parent.name == 'images':
+        candidate = image_path.parent.parent / 'labels' / f"{image_path.stem}.txt"
+        if candidate.exists():
+            return candidate
+    return image_path.with_suffix('.txt')
+
+
+def read_labels(path, width, height):
+    path = Path(path)
+    if not path.exists() or not path.read_text().strip():
+        return empty_detections()
+    rows = np.loadtxt(path, ndmin=2)
+    cls = rows[:, 0].astype(np.int32)
+    cx, cy, w, h = (rows[:, 1:5] * (width, height, width, height)).T
+    xyxy = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1).round().astype(np.int32)
+    return Detections(xyxy, np.ones(len(cls), np.float32), cls)
+
+
+def load_dataset(root, limit=None):
+    root = Path(root)
+    images = sorted(p for p in root.rglob('*') if p.suffix.lower() in IMAGE_SUFFIXES)[:limit]
+    samples = []
+    for path in images:
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        h, w = image.shape[:2]
+        samples.append((image, read_labels(label_path(path), w, h)))
+    return samples
+
+
+def detect(processor, image, tiles):
+    results, geometries = processor.infer([image[y1:y2, x1:x2] for x1, y1, x2, y2 in tiles])
+    parts = [offset_detections(processor.extract(result, geometry), x1, y1)
+             for (x1, y1, _, _), result, geometry in zip(tiles, results, geometries)]
+    merged = concat_detections(parts)
+    return nms_detections(merged) if len(parts) > 1 else merged
+
+
+def small_recall(truths, predictions):
+    matched = expected = 0
+    for truth, prediction in zip(truths, predictions):
+        area = (truth.xyxy[:, 2] - truth.xyxy[:, 0]) * (truth.xyxy[:, 3] - truth.xyxy[:, 1])
+        small = area < SMALL_AREA
+        subset = Detections(truth.xyxy[small], truth.conf[small], truth.cls[small])
+        m, r, _ = match_counts(subset, prediction)
+        matched += m
+        expected += r
+    return round(matched / expected, 4) if expected else None
+
+
+def run(processor, samples, tiled, overlap):
+    predictions = []
+    tiles = 0
+    start = time.perf_counter()
+    for image, _ in samples:
+        h, w = image.shape[:2]
+        regions = TileGrid(w, h, processor.inference_size, overlap).tiles if tiled else [(0, 0, w, h)]
+        tiles += len(regions)
+        predictions.append(detect(processor, image, regions))
+    seconds = time.perf_counter() - start
+    return predictions, seconds, tiles / len(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.tiling",
+                                     description="Recall gained vs time spent by tiled inference on labelled high-resolution images.")
+    parser.add_argument("dataset", help="folder of images with YOLO-format .txt labels (next to them or in ../labels)")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--size", type=int, default=DEFAULT_INFERENCE_SIZE)
+    parser.add_argument("--overlaps", type=float, nargs="+", default=[0.1, 0.2, 0.3])
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    samples = load_dataset(args.dataset, args.limit)
+    if not samples:
+        parser.error(f"no images found in {args.dataset}")
+    truths = [truth for _, truth in samples]
+
+    processor = FrameProcessor(inference_size=args.size)
+    processor.warm_up()
+
+    modes = [('full frame', False, 0.0)] + [(f"tiled {overlap:.0%}", True, overlap) for overlap in args.overlaps]
+    rows = []
+    for name, tiled, overlap in modes:
+        predictions, seconds, tiles = run(processor, samples, tiled, overlap)
+        rows.append({
+            'mode': name,
+            'tiles': round(tiles, 1),
+            'ms_per_image': round(seconds * 1000 / len(samples), 1),
+            **agreement(truths, predictions),
+            'small_recall': small_recall(truths, predictions),
+        })
+
+    base_ms = rows[0]['ms_per_image']
+    for row in rows:
+        row['cost'] = round(row['ms_per_image'] / base_ms, 2) if base_ms else None
+
+    print_table(rows, ['mode', 'tiles', 'ms_per_image', 'cost', 'precision', 'recall', 'f1', 'small_recall'])
+    if args.json:
+        write_json(args.json, {'dataset': args.dataset, 'images': len(samples), 'size': args.size, 'results': rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import time
+
+from benchmarks.common import agreement, print_table, read_frames, write_json
+from config import DEFAULT_INFERENCE_SIZE
+from core.processor import FrameProcessor
+from core.tracking import DetectionScheduler, IoUTracker
+
+
+def run_full(processor, frames):
+    start = time.perf_counter()
+    detections = []
+    for frame in frames:
+        results, geometries = processor.infer([frame])
+        detections.append(processor.extract(results[0], geometries[0]))
+    return detections, time.perf_counter() - start
+
+
+def run_tracked(processor, frames, interval):
+    scheduler = DetectionScheduler(interval)
+    tracker = IoUTracker()
+    start = time.perf_counter()
+    detections = []
+    for frame in frames:
+        if scheduler.should_detect():
+            results, geometries = processor.infer([frame])
+            tracked, _ = tracker.update(processor.extract(results[0], geometries[0]))
+            scheduler.feedback(tracker.stability)
+        else:
+            tracked, _ = tracker.predict()
+        detections.append(tracked)
+    return detections, time.perf_counter() - start, scheduler.detected_ratio
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.tracking",
+                                     description="Throughput gained vs accuracy lost by detect-every-N tracking.")
+    parser.add_argument("clip")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--size", type=int, default=DEFAULT_INFERENCE_SIZE)
+    parser.add_argument("--intervals", type=int, nargs="+", default=[2, 4, 8, 0], help="0 means adaptive")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    frames = read_frames(args.clip, args.frames)
+    processor = FrameProcessor(inference_size=args.size)
+    processor.warm_up()
+
+    reference, full_seconds = run_full(processor, frames)
+    full_fps = len(frames) / full_seconds
+    rows = [{'mode': 'every frame', 'fps': round(full_fps, 1), 'speedup': 1.0, 'detected_pct': 100.0,
+             'precision': 1.0, 'recall': 1.0, 'f1': 1.0}]
+
+    for interval in args.intervals:
+        tracked, seconds, detected_ratio = run_tracked(processor, frames, interval)
+        fps = len(frames) / seconds
+        rows.append({
+            'mode': 'adaptive' if interval == 0 else f"every {interval}",
+            'fps': round(fps, 1),
+            'speedup': round(fps / full_fps, 2),
+            'detected_pct': round(detected_ratio * 100, 1),
+            **agreement(reference, tracked),
+        })
+
+    print_table(rows, ['mode', 'fps', 'speedup', 'detected_pct', 'precision', 'recall', 'f1'])
+    if args.json:
+        write_json(args.json, {'clip': args.clip, 'frames': len(frames), 'size': args.size, 'results': rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,39 @@ DETECTION_COLORS = ['#38bdf8', '#10b981', '#f97316', '#8b5cf6', '#ec4899', '#ef4
 
 DEFAULT_CONFIDENCE = 0.25
 DEFAULT_INFERENCE_SIZE = 640
+DEFAULT_BATCH_SIZE = 4
+DEFAULT_INTERPOLATION = "linear"
+MODEL_STRIDE = 32
+LETTERBOX_FILL = 114
 MIN_INFERENCE_SIZE = 320
 MAX_INFERENCE_SIZE = 1280
 
 MODEL_PATH = "yolov8n.pt"
+MODEL_CACHE_DIR = "model_cache"
+
+BACKEND_TORCH = "torch"
+BACKEND_ONNXRUNTIME = "onnxruntime"
+BACKEND_OPENVINO = "openvino"
+BACKEND_TORCHSCRIPT = "torchscript"
+BACKEND_INT8_DYNAMIC = "int8-dynamic"
+BACKEND_INT8_STATIC = "int8-static"
+DEFAULT_BACKEND = BACKEND_TORCH
+BACKEND_LABELS = {
+    BACKEND_TORCH: "PyTorch",
+    BACKEND_ONNXRUNTIME: "ONNX Runtime",
+    BACKEND_OPENVINO: "OpenVINO",
+    BACKEND_TORCHSCRIPT: "TorchScript",
+    BACKEND_INT8_DYNAMIC: "INT8 dynamic",
+    BACKEND_INT8_STATIC: "INT8 calibrated",
+}
+CALIBRATION_DIR = "calibration"
+CALIBRATION_DIR_ENV = "YOLO_CALIBRATION_DIR"
+CALIBRATION_MAX_IMAGES = 200
 OUTPUT_VIDEO = "output.avi"
 
 VIDEO_EXTENSIONS = "Videos (*.mp4 *.avi *.mov)"
+VIDEO_SUFFIXES = ('.mp4', '.avi', '.mov')
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.bmp')
 SCREENSHOT_PREFIX = "screenshot_"
 
 DEFAULT_WINDOW_WIDTH = 1400
@@ -16,6 +42,97 @@ DEFAULT_WINDOW_HEIGHT = 900
 SIDE_PANEL_WIDTH = 320
 
 UI_UPDATE_INTERVAL_MS = 33
+GUI_LOAD_WINDOW_S = 1.0
+COUNTER_EMIT_INTERVAL_S = UI_UPDATE_INTERVAL_MS / 1000
+FRAME_RING_SLOTS = 3
 LOADING_ANIMATION_INTERVAL_MS = 300
 FPS_CALCULATION_FRAMES = 10
 VIDEO_FPS = 20.0
+RECORD_QUEUE_SIZE = 64
+RECORD_SEGMENT_SECONDS = 600
+RECORD_SEGMENT_BYTES = 1 << 30
+RECORD_FPS_PROBE_FRAMES = 30
+RECORD_SIZE_CHECK_FRAMES = 30
+
+DETECTION_LOG_DIR = "detection_log"
+DETECTION_LOG_CHUNK_ROWS = 65536
+DETECTION_LOG_FLUSH_S = 5.0
+
+PIPELINE_QUEUE_SIZE = 4
+DROP_POLICY_LATEST = "latest"
+DROP_POLICY_BLOCK = "block"
+
+DEFAULT_DETECT_INTERVAL = 1
+ADAPTIVE_MAX_INTERVAL = 8
+TRACK_IOU_THRESHOLD = 0.3
+TRACK_MAX_MISSED = 5
+TRACK_VELOCITY_SMOOTHING = 0.5
+
+MOTION_SCALE_WIDTH = 320
+MOTION_THRESHOLD = 25
+MOTION_BACKGROUND_ALPHA = 0.05
+MOTION_MIN_AREA_RATIO = 0.0005
+MOTION_PADDING = 32
+MOTION_FULL_FRAME_RATIO = 0.6
+MOTION_MAX_REGIONS = 4
+
+MULTI_STREAM_WAIT_S = 0.1
+GRID_TILE_MIN_WIDTH = 320
+GRID_TILE_MIN_HEIGHT = 240
+
+HEADLESS_OUTPUT_DIR = "headless_output"
+HEADLESS_CHUNK_FRAMES = 1800
+HEADLESS_VIDEO_NAME = "annotated.avi"
+
+METRICS_ENABLED = True
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = None
+METRICS_BUCKETS_MS = (
+    0.1, 0.25, 0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 40, 50, 75,
+    100, 150, 200, 300, 500, 750, 1000, 2000, 5000,
+)
+
+QUALITY_TARGET_FPS = "fps"
+QUALITY_TARGET_LATENCY = "latency"
+QUALITY_WINDOW_FRAMES = 30
+QUALITY_HYSTERESIS = 0.15
+QUALITY_COOLDOWN_WINDOWS = 1
+QUALITY_SIZE_STEP = 64
+QUALITY_MAX_SKIP = 3
+
+TILE_OVERLAP = 0.2
+TILE_MIN_SCALE = 1.5
+TILE_INCLUDE_FULL_FRAME = True
+TILE_NMS_METRIC = "ios"
+TILE_NMS_THRESHOLD = 0.6
+TILE_BATCH_SIZE = 8
+
+INFERENCE_WORKERS = 0
+WORKER_SLOTS_PER_WORKER = 2
+WORKER_START_TIMEOUT_S = 120
+WORKER_POLL_S = 1.0
+
+RESULT_CACHE_DIR = "result_cache"
+RESULT_CACHE_MIN_CONF = 0.01
+RESULT_CACHE_MAX_BYTES = 2 << 30
+RESULT_CACHE_SAMPLE_BYTES = 1 << 20
+RESULT_CACHE_SAMPLES = 8
+
+PLAYBACK_INDEX_DIR = "playback_index"
+PLAYBACK_CACHE_BYTES = 512 << 20
+PLAYBACK_MIN_CACHE_FRAMES = 8
+PLAYBACK_PREFETCH_RATIO = 0.4
+
+STREAM_URL_SCHEMES = ("rtsp://", "rtsps://", "rtmp://", "http://", "https://", "udp://", "tcp://")
+GRABBER_FFMPEG_OPTIONS = "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay"
+GRABBER_OPEN_TIMEOUT_MS = 5000
+GRABBER_READ_TIMEOUT_MS = 5000
+GRABBER_BACKOFF_INITIAL_S = 0.5
+GRABBER_BACKOFF_MAX_S = 10.0
+GRABBER_WAIT_S = 0.5
+
+PACING_REALTIME = "realtime"
+PACING_THROUGHPUT = "throughput"
+DEFAULT_PACING = PACING_REALTIME
+REALTIME_PREFETCH_FRAMES = 2
+REALTIME_LATE_FRAMES = 1.0
@@ -63,22 +63,25 @@ QComboBox QAbstractItemView {
     padding: 12px;
 }
 #collapsibleHeader:hover { background-color: transparent; }
-#detectionList QListWidget {
+#detectionList QListView {
     background-color: transparent;
     border: none;
     font-size: 13px;
 }
-#detectionList QListWidget::item {
+#detectionList QListView::item {
     padding: 6px 8px;
     border-radius: 4px;
     margin: 2px 0;
 }
-#detectionList QListWidget::item:hover { background-color: #1a1a1a; }
+#detectionList QListView::item:hover { background-color: #1a1a1a; }
 #statsCard { background-color: #141414; border-radius: 10px; padding: 10px; }
 #statValue { font-size: 22px; font-weight: bold; color: #38bdf8; }
 #statLabel { font-size: 10px; color: #666; text-transform: uppercase; }
 #titleLabel { font-size: 20px; font-weight: 700; letter-spacing: 2px; color: #fff; }
 #subtitleLabel { font-size: 11px; color: #555; }
+#latencyOverlay { font-family: monospace; font-size: 10px; color: #888; }
+#playbackTime { font-size: 11px; color: #888; }
+#tileLabel { font-size: 11px; color: #10b981; }
 #fpsLabel { font-size: 13px; font-weight: 600; color: #10b981; }
 #loadingLabel { font-size: 13px; color: #38bdf8; font-weight: 500; }
 .section-label { color: #666; font-size: 10px; text-transform: uppercase; margin-top: 8px; }
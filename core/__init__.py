@@ -1,3 +1,18 @@
-from core.detection import DetectionEngine, ColorManager
+from core.colors import ColorManager
+from core.processor import FrameProcessor
+from core.startup import StartupTimer
 
-__all__ = ['DetectionEngine', 'ColorManager']
+__all__ = ['DetectionEngine', 'MultiStreamEngine', 'ModelPreloader', 'ColorManager', 'FrameProcessor', 'StartupTimer']
+
+
+def __getattr__(name):
+    if name == 'DetectionEngine':
+        from core.detection import DetectionEngine
+        return DetectionEngine
+    if name == 'MultiStreamEngine':
+        from core.multistream import MultiStreamEngine
+        return MultiStreamEngine
+    if name == 'ModelPreloader':
+        from core.preload import ModelPreloader
+        return ModelPreloader
+    raise AttributeError(f"module 'core' has no attribute '{name}'")
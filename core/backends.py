@@ -0,0 +1,180 @@
+import hashlib
+import importlib.util
+import os
+import shutil
+
+from config import (
+    MODEL_PATH,
+    MODEL_CACHE_DIR,
+    BACKEND_TORCH,
+    BACKEND_ONNXRUNTIME,
+    BACKEND_OPENVINO,
+    BACKEND_TORCHSCRIPT,
+    BACKEND_INT8_DYNAMIC,
+    BACKEND_INT8_STATIC,
+    BACKEND_LABELS,
+    CALIBRATION_DIR,
+    CALIBRATION_DIR_ENV,
+    CALIBRATION_MAX_IMAGES,
+    IMAGE_SUFFIXES,
+)
+
+BACKEND_MODULES = {
+    BACKEND_TORCH: ('torch',),
+    BACKEND_ONNXRUNTIME: ('onnxruntime',),
+    BACKEND_OPENVINO: ('openvino',),
+    BACKEND_TORCHSCRIPT: ('torch',),
+    BACKEND_INT8_DYNAMIC: ('onnxruntime', 'onnx'),
+    BACKEND_INT8_STATIC: ('onnxruntime', 'onnx'),
+}
+
+EXPORT_FORMATS = {
+    BACKEND_ONNXRUNTIME: ('onnx', '.onnx'),
+    BACKEND_OPENVINO: ('openvino', '_openvino_model'),
+    BACKEND_TORCHSCRIPT: ('torchscript', '.torchscript'),
+    BACKEND_INT8_DYNAMIC: ('onnx', '.onnx'),
+    BACKEND_INT8_STATIC: ('onnx', '.onnx'),
+}
+
+QUANTIZED_BACKENDS = (BACKEND_INT8_DYNAMIC, BACKEND_INT8_STATIC)
+
+CUDA_BACKENDS = (BACKEND_TORCH, BACKEND_TORCHSCRIPT)
+
+
+def missing_modules(backend):
+    return [module for module in BACKEND_MODULES[backend] if importlib.util.find_spec(module) is None]
+
+
+def unavailable_reason(backend):
+    missing = missing_modules(backend)
+    if missing:
+        return f"{BACKEND_LABELS[backend]} needs {', '.join(missing)}"
+    if backend == BACKEND_INT8_STATIC and not calibration_images():
+        return (f"No calibration images in {os.path.abspath(calibration_dir())} "
+                f"(use --calibration-dir or set {CALIBRATION_DIR_ENV})")
+    return None
+
+
+def available_backends():
+    return [backend for backend in BACKEND_MODULES if unavailable_reason(backend) is None]
+
+
+def calibration_dir():
+    return os.environ.get(CALIBRATION_DIR_ENV) or CALIBRATION_DIR
+
+
+def set_calibration_dir(folder):
+    os.environ[CALIBRATION_DIR_ENV] = folder
+
+
+def calibration_images(folder=None):
+    folder = folder or calibration_dir()
+    if not os.path.isdir(folder):
+        return []
+    images = sorted(entry for entry in os.listdir(folder) if entry.lower().endswith(IMAGE_SUFFIXES))
+    return [os.path.join(folder, entry) for entry in images[:CALIBRATION_MAX_IMAGES]]
+
+
+def calibration_hash(folder=None):
+    digest = hashlib.sha256()
+    for path in calibration_images(folder):
+        digest.update(f"{os.path.basename(path)}:{os.path.getsize(path)}:{int(os.path.getmtime(path))}".encode())
+    return digest.hexdigest()[:8]
+
+
+def backend_tag(backend):
+    return f"{backend}-{calibration_hash()}" if backend == BACKEND_INT8_STATIC else backend
+
+
+def supports_batch(backend):
+    return backend != BACKEND_TORCHSCRIPT
+
+
+def weights_hash(path=MODEL_PATH):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _ensure_weights():
+    if not os.path.exists(MODEL_PATH):
+        from ultralytics import YOLO
+
+        YOLO(MODEL_PATH, task="detect")
+
+
+def cached_model_path(backend, size):
+    _ensure_weights()
+    stem = os.path.splitext(os.path.basename(MODEL_PATH))[0]
+    suffix = EXPORT_FORMATS[backend][1]
+    return os.path.join(MODEL_CACHE_DIR, f"{stem}-{weights_hash()}-{backend_tag(backend)}-{size}{suffix}")
+
+
+def resolve_model(backend, size):
+    if backend == BACKEND_TORCH:
+        return MODEL_PATH
+
+    target = cached_model_path(backend, size)
+    if not os.path.exists(target):
+        if backend in QUANTIZED_BACKENDS:
+            _quantize(backend, size, target)
+        else:
+            _export(backend, size, target)
+    return target
+
+
+def _export(backend, size, target):
+    from ultralytics import YOLO
+
+    export_format = EXPORT_FORMATS[backend][0]
+    model = YOLO(MODEL_PATH, task="detect")
+    exported = model.export(format=export_format, imgsz=size, dynamic=supports_batch(backend), verbose=False)
+
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    if os.path.exists(target):
+        shutil.rmtree(target) if os.path.isdir(target) else os.remove(target)
+    shutil.move(str(exported), target)
+
+
+class _CalibrationReader:
+    def __init__(self, input_name, size, paths):
+        self._input_name = input_name
+        self._size = size
+        self._paths = iter(paths)
+        self._letterbox = None
+
+    def get_next(self):
+        import cv2
+        from core.preprocess import Letterbox
+
+        if self._letterbox is None:
+            self._letterbox = Letterbox(self._size)
+        for path in self._paths:
+            frame = cv2.imread(path)
+            if frame is not None:
+                tensor, _ = self._letterbox([frame])
+                return {self._input_name: tensor.numpy().copy()}
+        return None
+
+
+def _quantize(backend, size, target):
+    import onnx
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_dynamic, quantize_static
+
+    source = resolve_model(BACKEND_ONNXRUNTIME, size)
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    partial = f"{target}.partial"
+    if backend == BACKEND_INT8_DYNAMIC:
+        quantize_dynamic(source, partial, weight_type=QuantType.QUInt8)
+    else:
+        paths = calibration_images()
+        if not paths:
+            raise FileNotFoundError(unavailable_reason(backend))
+        input_name = onnx.load(source, load_external_data=False).graph.input[0].name
+        quantize_static(source, partial, _CalibrationReader(input_name, size, paths),
+                        quant_format=QuantFormat.QDQ, activation_type=QuantType.QUInt8,
+                        weight_type=QuantType.QInt8, per_channel=True,
+                        calibrate_method=CalibrationMethod.MinMax)
+    os.replace(partial, target)
@@ -0,0 +1,40 @@
+import numpy as np
+
+from config import DETECTION_COLORS
+
+
+class ColorManager:
+    _instance = None
+    _class_colors = {}
+    _palette = np.zeros((0, 3), np.uint8)
+    _assigned = np.zeros(0, bool)
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def get_color(self, cls_name):
+        if cls_name not in self._class_colors:
+            self._class_colors[cls_name] = DETECTION_COLORS[len(self._class_colors) % len(DETECTION_COLORS)]
+        return self._class_colors[cls_name]
+
+    def get_rgb(self, cls_name):
+        color = self.get_color(cls_name).lstrip('#')
+        return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+    def palette_for(self, cls_ids, names):
+        if len(self._palette) < len(names):
+            self._palette = np.zeros((len(names), 3), np.uint8)
+            self._assigned = np.zeros(len(names), bool)
+
+        unique = np.unique(cls_ids)
+        for cls in unique[~self._assigned[unique]].tolist():
+            self._palette[cls] = self.get_rgb(names[cls])
+            self._assigned[cls] = True
+        return self._palette[cls_ids]
+
+    def reset(self):
+        self._class_colors = {}
+        self._palette = np.zeros((0, 3), np.uint8)
+        self._assigned = np.zeros(0, bool)
@@ -1,61 +1,101 @@
 import cv2
+import queue
+import threading
 import time
 from PyQt5.QtCore import QThread, pyqtSignal
-from PyQt5.QtGui import QColor
-from ultralytics import YOLO
 
 from config import (
-    DETECTION_COLORS,
-    DEFAULT_CONFIDENCE,
-    DEFAULT_INFERENCE_SIZE,
-    MODEL_PATH,
-    OUTPUT_VIDEO,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_DETECT_INTERVAL,
     FPS_CALCULATION_FRAMES,
-    VIDEO_FPS,
+    COUNTER_EMIT_INTERVAL_S,
+    METRICS_ENABLED,
+    QUALITY_WINDOW_FRAMES,
+    INFERENCE_WORKERS,
+    GRABBER_WAIT_S,
+    BACKEND_TORCH,
+    PIPELINE_QUEUE_SIZE,
+    DROP_POLICY_LATEST,
+    DROP_POLICY_BLOCK,
+    DEFAULT_PACING,
+    TILE_BATCH_SIZE,
+    PACING_REALTIME,
+    REALTIME_PREFETCH_FRAMES,
+    REALTIME_LATE_FRAMES,
 )
-
-
-class ColorManager:
-    _instance = None
-    _class_colors = {}
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-    def get_color(self, cls_name):
-        if cls_name not in self._class_colors:
-            self._class_colors[cls_name] = DETECTION_COLORS[len(self._class_colors) % len(DETECTION_COLORS)]
-        return self._class_colors[cls_name]
-
-    def get_rgb(self, cls_name):
-        color = self.get_color(cls_name)
-        c = QColor(color)
-        return (c.red(), c.green(), c.blue())
-
-    def reset(self):
-        self._class_colors = {}
+from core.pipeline import FrameQueue
+from core.playback import PlaybackDecoder
+from core.detection_log import DetectionLog
+from core.framering import FrameRing
+from core.grabber import FrameGrabber, is_stream_url
+from core.metrics import PipelineMetrics
+from core.motion import MotionGate
+from core.preprocess import padded_size
+from core.processor import FrameProcessor
+from core.quality import QualityController
+from core.recorder import VideoRecorder
+from core.result_cache import ResultCache
+from core.tiling import TileGrid, nms_detections
+from core.workers import InferencePool
+from core.results import concat_detections, empty_detections, filter_detections, offset_detections, outside_regions
+from core.tracking import DetectionScheduler, IoUTracker
 
 
 class DetectionEngine(QThread):
-    frame_ready = pyqtSignal(object)
+    frame_ready = pyqtSignal(int, int)
     counter_updated = pyqtSignal(dict)
     loading_status = pyqtSignal(str)
     fps_updated = pyqtSignal(float)
+    metrics_updated = pyqtSignal(dict)
+    histograms_updated = pyqtSignal(dict)
+    quality_changed = pyqtSignal(dict)
+    recording_changed = pyqtSignal(bool)
+    status_message = pyqtSignal(str)
 
-    def __init__(self):
+    def __init__(self, processor=None):
         super().__init__()
         self._running = False
-        self._conf_threshold = DEFAULT_CONFIDENCE
-        self._device = 'cpu'
         self._source = 0
         self._recording = False
-        self._video_writer = None
-        self._inference_size = DEFAULT_INFERENCE_SIZE
-        self._model = None
-        self._model_loaded = False
-        self._color_manager = ColorManager()
+        self._recorder = None
+        self._detection_logging = False
+        self._detection_log = None
+        self._batch_size = DEFAULT_BATCH_SIZE
+        self._processor = processor or FrameProcessor()
+        self._drop_policy = None
+        self._decode_queue = None
+        self._annotate_queue = None
+        self._detect_interval = DEFAULT_DETECT_INTERVAL
+        self._scheduler = None
+        self._tracker = None
+        self._motion_gating = False
+        self._motion_gate = None
+        self._tiling = False
+        self._tile_grid = None
+        self._result_caching = False
+        self._result_cache = None
+        self._playback = None
+        self._grabber = None
+        self._pacing = DEFAULT_PACING
+        self._realtime_skipped = 0
+        self._speed = None
+        self._cuts = set()
+        self._last_detections = None
+        self._motion_detections = None
+        self._frame_ring = FrameRing()
+        self._frame_seq = 0
+        self._annotated_frames = 0
+        self._detections_total = 0
+        self._pending_counter = None
+        self._counter_emitted = 0.0
+        self._frame_index = 0
+        self._last_frame = None
+        self._metrics = PipelineMetrics() if METRICS_ENABLED else None
+        self._quality_target = None
+        self._quality = None
+        self._frame_skip = 0
+        self._workers = INFERENCE_WORKERS
+        self._pool = None
 
     @property
     def running(self):
@@ -65,6 +105,10 @@ class DetectionEngine(QThread):
     def running(self, value):
         self._running = value
 
+    @property
+    def processor(self):
+        return self._processor
+
     @property
     def source(self):
         return self._source
@@ -73,114 +117,772 @@ class DetectionEngine(QThread):
     def source(self, value):
         self._source = value
 
+    @property
+    def live(self):
+        return isinstance(self._source, int) or is_stream_url(self._source)
+
     @property
     def conf_threshold(self):
-        return self._conf_threshold
+        return self._processor.conf_threshold
 
     @conf_threshold.setter
     def conf_threshold(self, value):
-        self._conf_threshold = value
+        self._processor.conf_threshold = value
 
     @property
     def inference_size(self):
-        return self._inference_size
+        return self._processor.inference_size
 
     @inference_size.setter
     def inference_size(self, value):
-        self._inference_size = value
+        self._processor.inference_size = value
+        quality = self._quality
+        if quality is not None:
+            quality.reset(value)
+            self._frame_skip = 0
 
     @property
-    def recording(self):
-        return self._recording
+    def quality_target(self):
+        return self._quality_target
 
-    def load_model(self):
-        if not self._model_loaded:
-            self.loading_status.emit("start")
-            self._model = YOLO(MODEL_PATH, task="detect")
-            self._model.to(self._device)
-            self._model_loaded = True
-            self.loading_status.emit("finished")
+    def set_quality_target(self, mode, target):
+        self._quality_target = (mode, target) if mode else None
+        self._frame_skip = 0
+        self._quality = self._create_quality() if self._running else None
 
-    def run(self):
-        self.load_model()
-        self._color_manager.reset()
+    @property
+    def frame_skip(self):
+        return self._frame_skip
 
-        cap = cv2.VideoCapture(self._source)
-        if not cap.isOpened():
+    def _create_quality(self):
+        if self._quality_target is None or self._workers:
+            return None
+        mode, target = self._quality_target
+        return QualityController(mode, target, self.inference_size,
+                                 resizable=self._processor.backend == BACKEND_TORCH)
+
+    @property
+    def batch_size(self):
+        return self._batch_size
+
+    @batch_size.setter
+    def batch_size(self, value):
+        self._batch_size = max(1, int(value))
+
+    @property
+    def detect_interval(self):
+        return self._detect_interval
+
+    @detect_interval.setter
+    def detect_interval(self, value):
+        self._detect_interval = max(0, int(value))
+
+    @property
+    def motion_gating(self):
+        return self._motion_gating
+
+    @motion_gating.setter
+    def motion_gating(self, value):
+        self._motion_gating = bool(value)
+
+    @property
+    def workers(self):
+        return self._workers
+
+    @workers.setter
+    def workers(self, value):
+        self._workers = max(0, int(value))
+
+    @property
+    def playback(self):
+        return self._playback
+
+    @property
+    def pacing(self):
+        return self._pacing
+
+    @pacing.setter
+    def pacing(self, value):
+        self._pacing = value
+
+    def seek(self, index):
+        playback = self._playback
+        if playback is not None:
+            playback.seek(index)
+
+    def step(self, delta):
+        playback = self._playback
+        if playback is not None:
+            playback.step(delta)
+
+    def set_paused(self, paused):
+        playback = self._playback
+        if playback is None:
             return
+        if paused:
+            playback.pause()
+        else:
+            playback.resume()
 
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        frame_times = []
+    @property
+    def result_caching(self):
+        return self._result_caching
 
-        while self._running:
-            loop_start = time.time()
+    @result_caching.setter
+    def result_caching(self, value):
+        self._result_caching = bool(value)
 
-            ret, frame = cap.read()
-            if not ret:
-                break
+    @property
+    def tiling(self):
+        return self._tiling
 
-            frame = self._process_frame(frame)
+    @tiling.setter
+    def tiling(self, value):
+        self._tiling = bool(value)
 
-            if self._recording and self._video_writer:
-                self._video_writer.write(frame)
+    @property
+    def detection_logging(self):
+        return self._detection_logging
 
-            frame_times.append(time.time() - loop_start)
-            if len(frame_times) >= FPS_CALCULATION_FRAMES:
-                fps = 1.0 / (sum(frame_times) / len(frame_times)) if frame_times else 0
-                self.fps_updated.emit(fps)
-                frame_times = []
+    @detection_logging.setter
+    def detection_logging(self, value):
+        self._detection_logging = bool(value)
+
+    @property
+    def drop_policy(self):
+        if self._drop_policy is not None:
+            return self._drop_policy
+        return DROP_POLICY_LATEST if self.live else DROP_POLICY_BLOCK
+
+    @drop_policy.setter
+    def drop_policy(self, value):
+        self._drop_policy = value
 
-        cap.release()
-        if self._video_writer:
-            self._video_writer.release()
+    @property
+    def metrics(self):
+        return self._metrics
+
+    @property
+    def instrumentation(self):
+        return self._metrics is not None
+
+    @instrumentation.setter
+    def instrumentation(self, value):
+        if not value:
+            self._metrics = None
+        elif self._metrics is None:
+            self._metrics = PipelineMetrics()
+
+    @property
+    def frame_ring(self):
+        return self._frame_ring
 
-    def _process_frame(self, frame):
-        h, w = frame.shape[:2]
-        scale = self._inference_size / max(w, h)
-        inference_frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR) if scale < 1 else frame
+    def set_display_size(self, width, height):
+        self._frame_ring.target = (width, height)
 
-        results = self._model(inference_frame, stream=True, conf=self._conf_threshold, verbose=False)
-        counter = {}
+    @property
+    def has_frame(self):
+        return self._last_frame is not None
+
+    def snapshot(self):
+        frame = self._last_frame
+        return frame.copy() if frame is not None else None
+
+    @property
+    def annotated_frames(self):
+        return self._annotated_frames
 
-        for r in results:
-            for box in r.boxes:
-                cls = int(box.cls[0])
-                label = self._model.names[cls]
-                counter[label] = counter.get(label, 0) + 1
+    @property
+    def detections_total(self):
+        return self._detections_total
 
-                x1, y1, x2, y2 = box.xyxy[0]
-                if scale < 1:
-                    x1, y1, x2, y2 = int(x1 / scale), int(y1 / scale), int(x2 / scale), int(y2 / scale)
+    @property
+    def recording(self):
+        return self._recording
+
+    def load_model(self):
+        if self._processor.needs_load:
+            self.loading_status.emit("start")
+            self._processor.load()
+            self.loading_status.emit("finished")
+
+    def run(self):
+        self.load_model()
+        self._processor.reset_colors()
+
+        cap = playback = grabber = None
+        if is_stream_url(self._source):
+            grabber = FrameGrabber(self._source)
+            grabber.start()
+            decoder = threading.Thread(target=self._grabber_loop, args=(grabber,), daemon=True)
+        elif isinstance(self._source, str):
+            playback = PlaybackDecoder(self._source, on_index=self._index_ready)
+            if not playback.opened:
+                playback.close()
+                return
+            playback.start()
+            decoder = threading.Thread(target=self._playback_loop, args=(playback,), daemon=True)
+        else:
+            cap = cv2.VideoCapture(self._source)
+            if not cap.isOpened():
+                return
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            decoder = threading.Thread(target=self._decode_loop, args=(cap,), daemon=True)
+
+        self._playback = playback
+        self._grabber = grabber
+        self._frame_ring.reset()
+        self._last_frame = None
+        self._decode_queue = FrameQueue(PIPELINE_QUEUE_SIZE, self.drop_policy)
+        self._annotate_queue = FrameQueue(PIPELINE_QUEUE_SIZE, DROP_POLICY_BLOCK)
+        self._scheduler = DetectionScheduler(self._detect_interval)
+        self._tracker = IoUTracker() if self._detect_interval != 1 else None
+        self._motion_gate = self._create_motion_gate()
+        self._last_detections = empty_detections()
+        self._motion_detections = empty_detections()
+        self._frame_index = 0
+        self._frame_skip = 0
+        self._realtime_skipped = 0
+        self._speed = None
+        self._cuts.clear()
+        self._annotated_frames = 0
+        self._detections_total = 0
+        self._pending_counter = None
+        self._quality = self._create_quality()
+        if self._metrics is not None:
+            self._metrics.reset()
+        self._detection_log = DetectionLog(names=self._processor.names) if self._detection_logging else None
+        self._result_cache = self._open_result_cache()
+
+        annotator = threading.Thread(target=self._annotate_loop, daemon=True)
+        decoder.start()
+        annotator.start()
+
+        try:
+            if self._workers:
+                self._pool_loop()
+            else:
+                self._inference_loop()
+        finally:
+            self._decode_queue.close()
+            self._annotate_queue.close()
+            decoder.join()
+            annotator.join()
+
+            if playback is not None:
+                playback.close()
+                self._playback = None
+            elif grabber is not None:
+                grabber.stop()
+                grabber.join()
+                self._grabber = None
+            else:
+                cap.release()
+            if self._recorder:
+                self.stop_recording()
+            if self._detection_log:
+                self._detection_log.close()
+                self._detection_log = None
+            if self._result_cache:
+                self._result_cache.close()
+                self._result_cache = None
+
+    def _create_motion_gate(self):
+        if not self._motion_gating or self._workers:
+            return None
+        return MotionGate(self.inference_size // 2, self._tiling or self._processor.rect_input)
+
+    def _open_result_cache(self):
+        if not self._result_caching or self._workers or self.live:
+            return None
+        mode = 'tiled' if self._tiling else 'full'
+        try:
+            return ResultCache(self._source, self._processor.backend, self.inference_size, mode,
+                               self._processor.interpolation)
+        except OSError as e:
+            self.status_message.emit(f"Result cache unavailable: {e}")
+            return None
+
+    def _decode_loop(self, cap):
+        index = 0
+        while self._running:
+            start = time.perf_counter()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            decoded = time.perf_counter()
+            metrics = self._metrics
+            if metrics is not None:
+                metrics.observe('decode', (decoded - start) * 1000)
+            if not self._decode_queue.put((frame, decoded, index)):
+                break
+            index += 1
+            for _ in range(self._frame_skip):
+                cap.grab()
+                index += 1
+        self._decode_queue.close()
+
+    def _index_ready(self, index):
+        if not index.exact_keyframes:
+            self.status_message.emit("No keyframe index (install PyAV): seeks use OpenCV frame positioning")
+
+    def _playback_loop(self, playback):
+        video_index = None
+        pacing = anchor = generation = None
+        last = expected = -1
+        while self._running:
+            if video_index is not playback.index:
+                video_index = playback.index
+                late = REALTIME_LATE_FRAMES / video_index.fps
+                anchor = None
+            if pacing != self._pacing:
+                pacing = self._pacing
+                playback.prefetch = REALTIME_PREFETCH_FRAMES if pacing == PACING_REALTIME else None
+                anchor = None
+            item = playback.read()
+            if item is None:
+                break
+            index, frame = item
+            if last >= 0 and index != expected:
+                self._cuts.add(index)
+            expected = index + 1
+            if pacing == PACING_REALTIME:
+                media = video_index.timestamp(index)
+                now = time.perf_counter()
+                if anchor is None or generation != playback.generation or index <= last:
+                    anchor = (now, media)
+                    generation = playback.generation
+                due = anchor[0] + media - anchor[1]
+                if due > now:
+                    time.sleep(due - now)
+                elif now - due > late:
+                    behind = video_index.frame_at(anchor[1] + now - anchor[0]) - index - 1
+                    if behind > 0:
+                        playback.skip(behind)
+                        self._realtime_skipped += behind
+                        expected += behind
+            last = index
+            if not self._decode_queue.put((frame, time.perf_counter(), index)):
+                break
+            skip = self._frame_skip
+            if skip:
+                playback.skip(skip)
+                expected += skip
+        self._decode_queue.close()
+
+    def _grabber_loop(self, grabber):
+        last_seq = 0
+        while self._running:
+            item = grabber.wait(last_seq, GRABBER_WAIT_S)
+            if item is None:
+                if not grabber.is_alive():
+                    break
+                continue
+            last_seq, frame, captured = item
+            if not self._decode_queue.put((frame, captured, last_seq)):
+                break
+        self._decode_queue.close()
+
+    def _inference_loop(self, first=None):
+        batch_size = self._batch_size if not self.live else 1
+        window_frames = 0
+        window_batches = 0
+        window_busy = 0.0
+
+        while self._running:
+            batch = self._next_batch(batch_size, first)
+            first = None
+            if not batch:
+                break
+            self.load_model()
+
+            frames, decoded, indices = zip(*batch)
+            metrics = self._metrics
+            if metrics is not None:
+                now = time.perf_counter()
+                for t in decoded:
+                    metrics.observe('queue_wait', (now - t) * 1000)
+
+            start = time.perf_counter()
+            detections, static = self._detect_batch(frames, indices)
+            window_busy += time.perf_counter() - start
+            window_frames += len(frames)
+            window_batches += 1
+            if window_frames >= QUALITY_WINDOW_FRAMES:
+                self._adjust_quality(window_frames, window_batches, window_busy)
+                window_frames = window_batches = 0
+                window_busy = 0.0
+
+            for item in zip(frames, detections, static, decoded, indices):
+                if not self._annotate_queue.put(item):
+                    return
+
+    def _pool_loop(self):
+        item = self._decode_queue.get()
+        while item is not None and self._running:
+            pool = self._start_pool(item[0].nbytes)
+            if pool is None:
+                break
+            item, healthy = self._run_pool(pool, item)
+            if not healthy:
+                break
+        if item is not None and self._running:
+            self._inference_loop(item)
+
+    def _start_pool(self, frame_nbytes):
+        pool = InferencePool(self._workers, self._processor.device, self._processor.backend)
+        self.loading_status.emit("start")
+        try:
+            pool.start(frame_nbytes, self.inference_size)
+        except (RuntimeError, queue.Empty) as e:
+            self.loading_status.emit("finished")
+            self.status_message.emit(f"Worker pool unavailable, running in-process: {e}")
+            return None
+        self.loading_status.emit("finished")
+        ignored = self._worker_ignored_controls()
+        if ignored:
+            self.status_message.emit(f"Not applied with inference workers: {', '.join(ignored)}")
+        return pool
+
+    def _worker_ignored_controls(self):
+        controls = (
+            ('tiling', self._tiling),
+            ('motion gating', self._motion_gating),
+            ('quality target', self._quality_target is not None),
+            ('result cache', self._result_caching and not self.live),
+        )
+        return [name for name, enabled in controls if enabled]
+
+    def _run_pool(self, pool, item):
+        self._pool = pool
+        pending = {}
+        drain = threading.Thread(target=self._drain_pool, args=(pool, pending), daemon=True)
+        drain.start()
+        index = 0
+        try:
+            while item is not None and self._running and item[0].nbytes <= pool.slot_bytes:
+                pending[index] = item
+                if self._scheduler.should_detect():
+                    pool.submit(index, item[0], self.conf_threshold, self.inference_size)
                 else:
-                    x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+                    pool.skip(index)
+                index += 1
+                item = self._decode_queue.get()
+        except RuntimeError as e:
+            self.status_message.emit(f"Worker pool failed, running in-process: {e}")
+            return item, False
+        finally:
+            pool.close()
+            drain.join()
+            self._pool = None
+            pool.stop()
+        return item, True
+
+    def _drain_pool(self, pool, pending):
+        errors = 0
+        for index, detections in pool.results():
+            frame, decoded, frame_index = pending.pop(index)
+            if pool.errors != errors:
+                errors = pool.errors
+                self.status_message.emit(f"Inference worker error: {pool.last_error}")
+            if not self._annotate_queue.put((frame, detections, False, decoded, frame_index)):
+                break
 
-                conf = float(box.conf[0])
-                color_rgb = self._color_manager.get_rgb(label)
+    def _detect_batch(self, frames, indices):
+        detections = [None] * len(frames)
+        static = [False] * len(frames)
+        crops = []
+        owners = []
+        max_ratios = []
+        partial = {}
+        cache = self._result_cache
+        if cache is not None and (cache.size != self.inference_size
+                                  or cache.interpolation != self._processor.interpolation):
+            cache = None
+        conf_threshold = self.conf_threshold
+        for i, frame in enumerate(frames):
+            if not self._scheduler.should_detect():
+                continue
+            if cache is not None:
+                cached = cache.get(indices[i])
+                if cached is not None:
+                    detections[i] = filter_detections(cached, conf_threshold)
+                    continue
+            h, w = frame.shape[:2]
+            regions = self._motion_gate(frame) if self._motion_gate else [(0, 0, w, h)]
+            if not regions:
+                static[i] = True
+                continue
+            cropped = regions != [(0, 0, w, h)]
+            if self._tiling:
+                regions = self._tiles_for(w, h).select(regions)
+            if cropped:
+                partial[i] = regions
+            max_ratio = padded_size(self._processor.inference_size) / max(w, h) if cropped and not self._tiling else None
+            for x1, y1, x2, y2 in regions:
+                crops.append(frame[y1:y2, x1:x2])
+                owners.append((i, x1, y1))
+                max_ratios.append(max_ratio)
+
+        if crops:
+            start = time.perf_counter()
+            conf = cache.min_conf if cache is not None else None
+            preprocess_ms = 0.0
+            results, geometries = [], []
+            for first in range(0, len(crops), TILE_BATCH_SIZE):
+                chunk = slice(first, first + TILE_BATCH_SIZE)
+                chunk_results, chunk_geometries = self._processor.infer(crops[chunk], conf, max_ratios[chunk])
+                results.extend(chunk_results)
+                geometries.extend(chunk_geometries)
+                preprocess_ms += self._processor.preprocess_ms
+            inferred = time.perf_counter()
+            parts = {}
+            for (i, x1, y1), result, geometry in zip(owners, results, geometries):
+                parts.setdefault(i, []).append(offset_detections(self._processor.extract(result, geometry), x1, y1))
+            for i, frame_parts in parts.items():
+                merged = concat_detections(frame_parts)
+                detections[i] = nms_detections(merged) if len(frame_parts) > 1 and self._tiling else merged
+                if cache is not None:
+                    if not self._motion_gate:
+                        cache.put(indices[i], detections[i])
+                    detections[i] = filter_detections(detections[i], conf_threshold)
+
+            metrics = self._metrics
+            if metrics is not None:
+                metrics.observe('preprocess', preprocess_ms)
+                metrics.observe('inference', (inferred - start) * 1000 - preprocess_ms)
+                metrics.observe('postprocess', (time.perf_counter() - inferred) * 1000)
+                metrics.increment('inferred_crops', len(crops))
+
+        if self._motion_gate:
+            carried = self._motion_detections
+            for i, frame_detections in enumerate(detections):
+                if frame_detections is None:
+                    continue
+                if i in partial:
+                    detections[i] = concat_detections([outside_regions(carried, partial[i]), frame_detections])
+                carried = detections[i]
+            self._motion_detections = carried
+        return detections, static
+
+    def _tiles_for(self, width, height):
+        tile = self._processor.inference_size
+        grid = self._tile_grid
+        if grid is None or not grid.matches(width, height, tile):
+            grid = self._tile_grid = TileGrid(width, height, tile)
+        return grid
+
+    def _adjust_quality(self, frames, batches, busy):
+        quality = self._quality
+        if quality is None or busy <= 0:
+            return
+        capacity = frames * (self._frame_skip + 1) / busy
+        latency_ms = busy * 1000 / batches
+        decision = quality.update(capacity, latency_ms)
+        if decision is None:
+            return
+        self._processor.inference_size = decision['size']
+        self._frame_skip = decision['skip']
+        decision['fps'] = round(capacity, 1)
+        decision['latency_ms'] = round(latency_ms, 1)
+        self.quality_changed.emit(decision)
+
+    def _next_batch(self, batch_size, first=None):
+        playback = self._playback
+        greedy = playback is not None and (self._pacing == PACING_REALTIME or playback.paused)
+        batch = [first] if first is not None else []
+        while len(batch) < batch_size:
+            item = self._decode_queue.get_nowait() if greedy and batch else self._decode_queue.get()
+            if item is None:
+                break
+            batch.append(item)
+        return batch
+
+    def _annotate_loop(self):
+        window_start = time.time()
+        window_frames = 0
+        window_media = None
+
+        while True:
+            item = self._annotate_queue.get()
+            if item is None:
+                if self._pending_counter is not None:
+                    self.counter_updated.emit(self._pending_counter)
+                    self._pending_counter = None
+                break
 
-                cv2.rectangle(frame, (x1, y1), (x2, y2), color_rgb, 2)
-                cv2.putText(frame, f"{label} {conf:.2f}", (x1, y1 - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, color_rgb, 2)
+            self._annotate(*item)
 
-        self.counter_updated.emit(counter)
-        self.frame_ready.emit(frame)
+            playback = self._playback
+            media = playback.index.timestamp(item[4]) if playback is not None else None
+            if window_media is None:
+                window_media = media
+
+            window_frames += 1
+            if window_frames >= FPS_CALCULATION_FRAMES:
+                elapsed = time.time() - window_start
+                fps = window_frames / elapsed if elapsed > 0 else 0
+                if media is not None and elapsed > 0 and not playback.paused:
+                    self._speed = max(0.0, media - window_media) / elapsed
+                window_media = media
+                self.fps_updated.emit(fps)
+                self.metrics_updated.emit(self._queue_metrics())
+                if self._metrics is not None:
+                    self.histograms_updated.emit(self._publish_metrics(fps))
+                window_start = time.time()
+                window_frames = 0
+
+    def _queue_metrics(self):
+        metrics = {
+            'decode_queue': self._decode_queue.depth,
+            'annotate_queue': self._annotate_queue.depth,
+            'dropped_frames': self._decode_queue.dropped,
+            'display_overwritten': self._frame_ring.overwritten,
+            'preprocess_ms': round(self._processor.preprocess_ms, 2),
+            'interpolation': self._processor.interpolation,
+            'detect_interval': self._scheduler.interval,
+            'detected_frames_pct': round(self._scheduler.detected_ratio * 100, 1),
+            'inference_size': self._processor.inference_size,
+            'frame_skip': self._frame_skip,
+        }
+        grabber = self._grabber
+        if grabber is not None:
+            metrics['stream_connected'] = grabber.connected
+            metrics['stream_reconnects'] = grabber.reconnects
+            metrics['stream_dropped'] = grabber.dropped
+            metrics['stream_fps'] = round(grabber.fps, 1)
+        if self._playback is not None:
+            metrics['playback_cached_frames'] = self._playback.cached_frames
+            metrics['pacing'] = self._pacing
+            metrics['realtime_skipped'] = self._realtime_skipped
+            if self._speed is not None:
+                metrics['speed_x'] = round(self._speed, 2)
+        if self._result_cache is not None:
+            metrics['cache_hit_pct'] = round(self._result_cache.hit_ratio * 100, 1)
+            metrics['cached_frames'] = self._result_cache.frames
+        pool = self._pool
+        if pool is not None:
+            metrics['workers'] = pool.workers
+            metrics['worker_threads'] = pool.threads
+            metrics['worker_in_flight'] = pool.in_flight
+            metrics['worker_errors'] = pool.errors
+        if self._tiling and self._tile_grid is not None:
+            metrics['tiles_per_frame'] = len(self._tile_grid.tiles)
+        recorder = self._recorder
+        if recorder:
+            metrics['record_queue'] = recorder.depth
+            metrics['record_dropped'] = recorder.dropped
+            metrics['record_fps'] = round(recorder.fps, 1) if recorder.fps else None
+        if self._motion_gate:
+            metrics['motion_skipped_frames_pct'] = round(self._motion_gate.skipped_frames_ratio * 100, 1)
+            metrics['motion_skipped_pixels_pct'] = round(self._motion_gate.skipped_pixels_ratio * 100, 1)
+        return metrics
+
+    def _publish_metrics(self, fps):
+        metrics = self._metrics
+        metrics.set_counter('dropped_frames', self._decode_queue.dropped)
+        metrics.set_counter('display_overwritten', self._frame_ring.overwritten)
+        metrics.set_gauge('decode_queue', self._decode_queue.depth)
+        metrics.set_gauge('annotate_queue', self._annotate_queue.depth)
+        metrics.set_gauge('fps', round(fps, 2))
+        if self._playback is not None:
+            metrics.set_counter('realtime_skipped', self._realtime_skipped)
+            if self._speed is not None:
+                metrics.set_gauge('speed_x', round(self._speed, 3))
+        grabber = self._grabber
+        if grabber is not None:
+            metrics.set_counter('stream_reconnects', grabber.reconnects)
+            metrics.set_counter('stream_dropped', grabber.dropped)
+            metrics.set_gauge('stream_connected', int(grabber.connected))
+        recorder = self._recorder
+        if recorder:
+            metrics.set_counter('record_dropped', recorder.dropped)
+            metrics.set_gauge('record_queue', recorder.depth)
+        return metrics.snapshot()
+
+    def _annotate(self, frame, detections, static, decoded, frame_index):
+        metrics = self._metrics
+        start = time.perf_counter() if metrics is not None else 0.0
+        ids = None
+        jump = frame_index - self._frame_index
+        cut = frame_index in self._cuts
+        if cut:
+            self._cuts.discard(frame_index)
+        if self._tracker is not None and (jump <= 0 or cut):
+            self._tracker.reset()
+        if self._tracker is not None:
+            if detections is not None:
+                detections, ids = self._tracker.update(detections)
+                self._scheduler.feedback(self._tracker.stability)
+            elif static:
+                detections, ids = self._tracker.current()
+            else:
+                detections, ids = self._tracker.predict()
+        elif detections is None:
+            detections = self._last_detections
+        self._last_detections = detections
+        self._frame_index = frame_index
+
+        if self._detection_log is not None:
+            self._detection_log.append(time.time(), self._frame_index, self._source, detections)
+
+        recorder = self._recorder
+        if recorder is not None and recorder.raw:
+            recorder.submit(frame.copy() if recorder.encodes_video else None, time.time(), self._frame_index, detections)
+
+        drawn = time.perf_counter() if metrics is not None else 0.0
+        self._processor.draw(frame, detections, ids)
+        if metrics is not None:
+            metrics.observe('draw', (time.perf_counter() - drawn) * 1000)
+        if recorder is not None and not recorder.raw:
+            recorder.submit(frame, time.time())
+        counter = self._processor.count(detections)
+
+        self._frame_seq += 1
+        self._last_frame = frame
+        self._annotated_frames += 1
+        self._detections_total += sum(counter.values())
+        now = time.perf_counter()
+        if now - self._counter_emitted >= COUNTER_EMIT_INTERVAL_S:
+            self._counter_emitted = now
+            self._pending_counter = None
+            self.counter_updated.emit(counter)
+        else:
+            self._pending_counter = counter
+        slot = self._frame_ring.write(frame, self._frame_seq, decoded)
+        if slot is not None:
+            self.frame_ready.emit(slot, self._frame_seq)
+
+        if metrics is not None:
+            now = time.perf_counter()
+            metrics.observe('annotate', (now - start) * 1000)
+            metrics.observe('end_to_end', (now - decoded) * 1000)
+            metrics.increment('frames')
         return frame
 
     def stop(self):
         self._running = False
+        playback = self._playback
+        if playback is not None:
+            playback.close()
         self.wait()
+        self._last_frame = None
 
     def set_device(self, device):
-        self._device = device
-        if self._model_loaded and self._model:
-            self._model.to(device)
+        self._processor.set_device(device)
 
-    def start_recording(self, frame_shape):
-        fourcc = cv2.VideoWriter_fourcc(*'XVID')
-        self._video_writer = cv2.VideoWriter(OUTPUT_VIDEO, fourcc, VIDEO_FPS, (frame_shape[1], frame_shape[0]))
+    def start_recording(self, raw=False):
+        source_path = self._source if not self.live else None
+        recorder = VideoRecorder(raw=raw, source_path=source_path)
+        recorder.start()
+        self._recorder = recorder
         self._recording = True
+        self.recording_changed.emit(True)
 
     def stop_recording(self):
+        recorder = self._recorder
+        self._recorder = None
         self._recording = False
-        if self._video_writer:
-            self._video_writer.release()
-            self._video_writer = None
+        if recorder:
+            recorder.stop()
+            self.recording_changed.emit(False)
@@ -0,0 +1,269 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+from config import DETECTION_LOG_DIR, DETECTION_LOG_CHUNK_ROWS, DETECTION_LOG_FLUSH_S
+
+COLUMNS = {
+    'ts': np.float64,
+    'frame': np.int64,
+    'source': np.int16,
+    'cls': np.int16,
+    'conf': np.float32,
+    'xyxy': np.float32,
+}
+
+INDEX_FILE = 'index.json'
+
+
+def _write_json(path, payload):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(payload, f)
+    os.replace(tmp, path)
+
+
+def _read_index(path):
+    index_path = os.path.join(path, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return {'names': {}, 'sources': [], 'chunks': []}
+    with open(index_path) as f:
+        return json.load(f)
+
+
+class DetectionLog:
+    def __init__(self, path=DETECTION_LOG_DIR, names=None, chunk_rows=DETECTION_LOG_CHUNK_ROWS,
+                 flush_interval=DETECTION_LOG_FLUSH_S):
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+        self._chunk_rows = chunk_rows
+        self._flush_interval = flush_interval
+        self._index = _read_index(path)
+        if names:
+            self._index['names'].update({str(k): v for k, v in dict(names).items()})
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {name: [] for name in COLUMNS}
+        self._pending_rows = 0
+        self._chunk = None
+        self._columns = None
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    @property
+    def path(self):
+        return self._path
+
+    def _source_id(self, source):
+        source = str(source)
+        sources = self._index['sources']
+        if source not in sources:
+            sources.append(source)
+        return sources.index(source)
+
+    def append(self, timestamp, frame_index, source, detections):
+        count = len(detections.cls)
+        if not count:
+            return
+        with self._lock:
+            self._pending['ts'].append(np.full(count, timestamp, np.float64))
+            self._pending['frame'].append(np.full(count, frame_index, np.int64))
+            self._pending['source'].append(np.full(count, self._source_id(source), np.int16))
+            self._pending['cls'].append(detections.cls.astype(np.int16))
+            self._pending['conf'].append(detections.conf.astype(np.float32))
+            self._pending['xyxy'].append(detections.xyxy.astype(np.float32))
+            self._pending_rows += count
+            if self._pending_rows >= self._chunk_rows:
+                self._wake.set()
+
+    def flush(self):
+        with self._flush_lock:
+            self._flush()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        with self._flush_lock:
+            self._flush()
+            self._close_chunk()
+
+    def _write_loop(self):
+        while not self._closed:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _open_chunk(self):
+        name = f"chunk_{len(self._index['chunks']):06d}"
+        chunk_dir = os.path.join(self._path, name)
+        os.makedirs(chunk_dir, exist_ok=True)
+        self._columns = {
+            column: np.lib.format.open_memmap(os.path.join(chunk_dir, f"{column}.npy"), mode='w+', dtype=dtype,
+                                              shape=(self._chunk_rows, 4) if column == 'xyxy' else (self._chunk_rows,))
+            for column, dtype in COLUMNS.items()
+        }
+        self._chunk = {'name': name, 'rows': 0, 't_min': None, 't_max': None, 'class_counts': {}}
+        with self._lock:
+            self._index['chunks'].append(self._chunk)
+
+    def _close_chunk(self):
+        chunk = self._chunk
+        if chunk is None:
+            return
+        rows = chunk['rows']
+        for column, values in self._columns.items():
+            values.flush()
+            if rows < self._chunk_rows:
+                compact = np.array(values[:rows])
+                del values
+                self._columns[column] = None
+                np.save(os.path.join(self._path, chunk['name'], f"{column}.npy"), compact)
+        self._chunk = None
+        self._columns = None
+
+    def _flush(self):
+        with self._lock:
+            if not self._pending_rows:
+                return
+            pending, rows = self._pending, self._pending_rows
+            self._pending = {column: [] for column in COLUMNS}
+            self._pending_rows = 0
+
+        columns = {name: np.concatenate(parts) for name, parts in pending.items()}
+        offset = 0
+        while offset < rows:
+            if self._chunk is None:
+                self._open_chunk()
+            chunk = self._chunk
+            start = chunk['rows']
+            take = min(rows - offset, self._chunk_rows - start)
+            for column, values in columns.items():
+                self._columns[column][start:start + take] = values[offset:offset + take]
+            for values in self._columns.values():
+                values.flush()
+
+            ts = columns['ts'][offset:offset + take]
+            classes, counts = np.unique(columns['cls'][offset:offset + take], return_counts=True)
+            with self._lock:
+                class_counts = chunk['class_counts']
+                for c, n in zip(classes.tolist(), counts.tolist()):
+                    class_counts[str(c)] = class_counts.get(str(c), 0) + n
+                if chunk['t_min'] is None:
+                    chunk['t_min'] = float(ts[0])
+                chunk['t_max'] = float(ts[-1])
+                chunk['rows'] = start + take
+            offset += take
+            if chunk['rows'] >= self._chunk_rows:
+                self._close_chunk()
+
+        with self._lock:
+            payload = {'names': dict(self._index['names']), 'sources': list(self._index['sources']),
+                       'chunks': [dict(chunk) for chunk in self._index['chunks']]}
+        _write_json(os.path.join(self._path, INDEX_FILE), payload)
+
+
+class DetectionLogReader:
+    def __init__(self, path=DETECTION_LOG_DIR):
+        self._path = path
+        self._index = _read_index(path)
+        self._ids_by_name = {v: int(k) for k, v in self._index['names'].items()}
+
+    @property
+    def names(self):
+        return {int(k): v for k, v in self._index['names'].items()}
+
+    @property
+    def sources(self):
+        return list(self._index['sources'])
+
+    @property
+    def time_range(self):
+        chunks = self._index['chunks']
+        if not chunks:
+            return None
+        return chunks[0]['t_min'], chunks[-1]['t_max']
+
+    def _class_ids(self, classes):
+        if classes is None:
+            return None
+        return np.array([self._ids_by_name[c] if isinstance(c, str) else int(c) for c in classes], np.int16)
+
+    def _source_ids(self, sources):
+        if sources is None:
+            return None
+        known = self._index['sources']
+        return np.array([known.index(str(s)) for s in sources if str(s) in known], np.int16)
+
+    def _chunks(self, start, end):
+        for chunk in self._index['chunks']:
+            if (end is None or chunk['t_min'] < end) and (start is None or chunk['t_max'] >= start):
+                yield chunk
+
+    def _column(self, chunk, column):
+        return np.load(os.path.join(self._path, chunk['name'], f"{column}.npy"), mmap_mode='r')[:chunk['rows']]
+
+    def _row_range(self, chunk, start, end):
+        if (start is None or chunk['t_min'] >= start) and (end is None or chunk['t_max'] < end):
+            return 0, chunk['rows']
+        ts = self._column(chunk, 'ts')
+        lo = 0 if start is None else int(np.searchsorted(ts, start, 'left'))
+        hi = chunk['rows'] if end is None else int(np.searchsorted(ts, end, 'left'))
+        return lo, hi
+
+    def _mask(self, chunk, lo, hi, class_ids, source_ids):
+        mask = np.ones(hi - lo, bool)
+        if class_ids is not None:
+            mask &= np.isin(self._column(chunk, 'cls')[lo:hi], class_ids)
+        if source_ids is not None:
+            mask &= np.isin(self._column(chunk, 'source')[lo:hi], source_ids)
+        return mask
+
+    def query(self, start=None, end=None, classes=None, sources=None):
+        class_ids = self._class_ids(classes)
+        source_ids = self._source_ids(sources)
+        parts = {column: [] for column in COLUMNS}
+
+        for chunk in self._chunks(start, end):
+            lo, hi = self._row_range(chunk, start, end)
+            if hi <= lo:
+                continue
+            mask = self._mask(chunk, lo, hi, class_ids, source_ids)
+            for column in COLUMNS:
+                parts[column].append(np.asarray(self._column(chunk, column)[lo:hi])[mask])
+
+        result = {}
+        for column, dtype in COLUMNS.items():
+            values = parts[column]
+            result[column] = np.concatenate(values) if values else np.empty((0, 4) if column == 'xyxy' else 0, dtype)
+        return result
+
+    def count(self, start=None, end=None, classes=None, sources=None):
+        return sum(self.count_by_class(start, end, classes, sources).values())
+
+    def count_by_class(self, start=None, end=None, classes=None, sources=None):
+        class_ids = self._class_ids(classes)
+        source_ids = self._source_ids(sources)
+        names = self.names
+        totals = {}
+
+        for chunk in self._chunks(start, end):
+            lo, hi = self._row_range(chunk, start, end)
+            if hi <= lo:
+                continue
+            if source_ids is None and (lo, hi) == (0, chunk['rows']):
+                counts = {int(c): n for c, n in chunk['class_counts'].items()}
+            else:
+                mask = self._mask(chunk, lo, hi, class_ids, source_ids)
+                ids, values = np.unique(np.asarray(self._column(chunk, 'cls')[lo:hi])[mask], return_counts=True)
+                counts = dict(zip(ids.tolist(), values.tolist()))
+
+            for cls, n in counts.items():
+                if class_ids is None or cls in class_ids:
+                    label = names.get(cls, cls)
+                    totals[label] = totals.get(label, 0) + n
+        return totals
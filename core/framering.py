@@ -0,0 +1,98 @@
+import threading
+
+import cv2
+import numpy as np
+
+from config import FRAME_RING_SLOTS
+
+
+class FrameRing:
+    def __init__(self, slots=FRAME_RING_SLOTS):
+        if slots < 3:
+            raise ValueError("FrameRing needs at least 3 slots")
+        self._count = slots
+        self._buffers = [None] * slots
+        self._seqs = [0] * slots
+        self._stamps = [0.0] * slots
+        self._lock = threading.Lock()
+        self._target = None
+        self._shape = None
+        self._next = 0
+        self._latest = None
+        self._reading = None
+        self._pending = False
+        self._overwritten = 0
+
+    @property
+    def target(self):
+        return self._target
+
+    @target.setter
+    def target(self, size):
+        self._target = size if size and size[0] > 0 and size[1] > 0 else None
+
+    @property
+    def overwritten(self):
+        with self._lock:
+            return self._overwritten
+
+    def _output_size(self, frame):
+        h, w = frame.shape[:2]
+        if self._target is None:
+            return w, h
+        ratio = min(self._target[0] / w, self._target[1] / h)
+        return max(1, int(w * ratio)), max(1, int(h * ratio))
+
+    def _claim(self):
+        for offset in range(self._count):
+            slot = (self._next + offset) % self._count
+            if slot != self._latest and slot != self._reading:
+                self._next = (slot + 1) % self._count
+                return slot
+
+    def write(self, frame, seq, stamp=0.0):
+        w, h = self._output_size(frame)
+        shape = (h, w) + frame.shape[2:]
+
+        with self._lock:
+            if shape != self._shape:
+                self._buffers = [np.empty(shape, frame.dtype) for _ in range(self._count)]
+                self._shape = shape
+                self._latest = None
+            slot = self._claim()
+            buffer = self._buffers[slot]
+
+        if shape == frame.shape:
+            np.copyto(buffer, frame)
+        else:
+            interpolation = cv2.INTER_AREA if w < frame.shape[1] else cv2.INTER_LINEAR
+            cv2.resize(frame, (w, h), dst=buffer, interpolation=interpolation)
+
+        with self._lock:
+            if self._pending:
+                self._overwritten += 1
+            self._seqs[slot] = seq
+            self._stamps[slot] = stamp
+            self._latest = slot
+            notify = not self._pending
+            self._pending = True
+        return slot if notify else None
+
+    def acquire(self):
+        with self._lock:
+            if self._latest is None:
+                return None
+            self._reading = self._latest
+            self._pending = False
+            slot = self._reading
+            return slot, self._seqs[slot], self._buffers[slot], self._stamps[slot]
+
+    def reset(self):
+        with self._lock:
+            self._latest = None
+            self._pending = False
+            self._overwritten = 0
+
+    def release(self):
+        with self._lock:
+            self._reading = None
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+
+import cv2
+
+from config import (
+    STREAM_URL_SCHEMES,
+    GRABBER_FFMPEG_OPTIONS,
+    GRABBER_OPEN_TIMEOUT_MS,
+    GRABBER_READ_TIMEOUT_MS,
+    GRABBER_BACKOFF_INITIAL_S,
+    GRABBER_BACKOFF_MAX_S,
+)
+
+
+def is_stream_url(source):
+    return isinstance(source, str) and source.lower().startswith(STREAM_URL_SCHEMES)
+
+
+class FrameGrabber(threading.Thread):
+    def __init__(self, url, frame_event=None):
+        super().__init__(daemon=True)
+        self._url = url
+        self._frame_event = frame_event
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._frame = None
+        self._captured = 0.0
+        self._seq = 0
+        self._taken = 0
+        self._dropped = 0
+        self._connected = False
+        self._reconnects = 0
+        self._interval = 0.0
+
+    @property
+    def connected(self):
+        return self._connected
+
+    @property
+    def reconnects(self):
+        return self._reconnects
+
+    @property
+    def dropped(self):
+        return self._dropped
+
+    @property
+    def fps(self):
+        return 1.0 / self._interval if self._interval else 0.0
+
+    def latest(self, last_seq):
+        with self._cond:
+            if self._seq == last_seq:
+                return None
+            self._taken = self._seq
+            return self._seq, self._frame
+
+    def wait(self, last_seq, timeout):
+        with self._cond:
+            if self._seq == last_seq and not self._stop_event.is_set():
+                self._cond.wait(timeout)
+            if self._seq == last_seq:
+                return None
+            self._taken = self._seq
+            return self._seq, self._frame, self._captured
+
+    def _open(self):
+        os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", GRABBER_FFMPEG_OPTIONS)
+        params = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, GRABBER_OPEN_TIMEOUT_MS,
+                  cv2.CAP_PROP_READ_TIMEOUT_MSEC, GRABBER_READ_TIMEOUT_MS]
+        cap = cv2.VideoCapture(self._url, cv2.CAP_FFMPEG, params)
+        if not cap.isOpened():
+            cap.release()
+            return None
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
+    def run(self):
+        backoff = GRABBER_BACKOFF_INITIAL_S
+        while not self._stop_event.is_set():
+            cap = self._open()
+            if cap is None:
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, GRABBER_BACKOFF_MAX_S)
+                continue
+
+            self._connected = True
+            backoff = GRABBER_BACKOFF_INITIAL_S
+            last = None
+            while not self._stop_event.is_set():
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                captured = time.perf_counter()
+                if last is not None:
+                    self._interval = 0.9 * self._interval + 0.1 * (captured - last) if self._interval else captured - last
+                last = captured
+                with self._cond:
+                    if self._seq != self._taken:
+                        self._dropped += 1
+                    self._frame = frame
+                    self._captured = captured
+                    self._seq += 1
+                    self._cond.notify_all()
+                if self._frame_event is not None:
+                    self._frame_event.set()
+
+            cap.release()
+            self._connected = False
+            if not self._stop_event.is_set():
+                self._reconnects += 1
+                self._stop_event.wait(backoff)
+
+        with self._cond:
+            self._cond.notify_all()
+        if self._frame_event is not None:
+            self._frame_event.set()
+
+    def stop(self):
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
@@ -0,0 +1,166 @@
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import METRICS_BUCKETS_MS
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencyHistogram:
+    def __init__(self, bounds=METRICS_BUCKETS_MS):
+        self._bounds = tuple(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+
+    @property
+    def bounds(self):
+        return self._bounds
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def sum(self):
+        return self._sum
+
+    def observe(self, ms):
+        self._counts[bisect_left(self._bounds, ms)] += 1
+        self._count += 1
+        self._sum += ms
+
+    def quantile(self, q):
+        if not self._count:
+            return None
+        rank = q * self._count
+        seen = 0
+        for i, n in enumerate(self._counts):
+            if seen + n >= rank and n:
+                lower = self._bounds[i - 1] if i else 0.0
+                if i == len(self._bounds):
+                    return lower
+                return lower + (self._bounds[i] - lower) * (rank - seen) / n
+            seen += n
+        return self._bounds[-1]
+
+    def cumulative(self):
+        total = 0
+        buckets = []
+        for bound, n in zip(self._bounds, self._counts):
+            total += n
+            buckets.append((bound, total))
+        return buckets
+
+    def summary(self):
+        summary = {f"p{round(q * 100)}": _round(self.quantile(q)) for q in QUANTILES}
+        summary['count'] = self._count
+        summary['mean'] = _round(self._sum / self._count) if self._count else None
+        return summary
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+
+class PipelineMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+
+    def observe(self, stage, ms):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram()
+            histogram.observe(ms)
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_counter(self, name, value):
+        with self._lock:
+            self._counters[name] = value
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self._gauges[name] = value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'stages': {stage: h.summary() for stage, h in self._histograms.items()},
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+            }
+
+    def prometheus(self, prefix="vision"):
+        lines = []
+        with self._lock:
+            if self._histograms:
+                name = f"{prefix}_stage_latency_ms"
+                lines.append(f"# TYPE {name} histogram")
+                for stage, histogram in self._histograms.items():
+                    for bound, total in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {total}')
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum:.3f}')
+                    lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+            for key, value in self._counters.items():
+                lines.append(f"# TYPE {prefix}_{key}_total counter")
+                lines.append(f"{prefix}_{key}_total {value}")
+            for key, value in self._gauges.items():
+                lines.append(f"# TYPE {prefix}_{key} gauge")
+                lines.append(f"{prefix}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    def __init__(self, metrics, host, port):
+        self._metrics = metrics
+        self._address = (host, port)
+        self._server = None
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._server.server_address if self._server else self._address
+
+    def start(self):
+        metrics = self._metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(self._address, Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,99 @@
+import cv2
+import numpy as np
+
+from config import (
+    MOTION_SCALE_WIDTH,
+    MOTION_THRESHOLD,
+    MOTION_BACKGROUND_ALPHA,
+    MOTION_MIN_AREA_RATIO,
+    MOTION_PADDING,
+    MOTION_FULL_FRAME_RATIO,
+    MOTION_MAX_REGIONS,
+)
+
+
+def merge_regions(regions):
+    regions = [list(region) for region in regions]
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(regions)):
+            for j in range(i + 1, len(regions)):
+                a, b = regions[i], regions[j]
+                if a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]:
+                    regions[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    del regions[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return [tuple(region) for region in regions]
+
+
+class MotionGate:
+    def __init__(self, min_region=0, crop=True):
+        self._min_region = min_region
+        self._crop = crop
+        self._background = None
+        self._frames = 0
+        self._skipped_frames = 0
+        self._pixels = 0
+        self._skipped_pixels = 0
+
+    @property
+    def skipped_frames_ratio(self):
+        return self._skipped_frames / self._frames if self._frames else 0.0
+
+    @property
+    def skipped_pixels_ratio(self):
+        return self._skipped_pixels / self._pixels if self._pixels else 0.0
+
+    def reset(self):
+        self._background = None
+
+    def _expand(self, region, w, h):
+        x1, y1, x2, y2 = region
+        x1, y1, x2, y2 = x1 - MOTION_PADDING, y1 - MOTION_PADDING, x2 + MOTION_PADDING, y2 + MOTION_PADDING
+        grow_x = max(0, self._min_region - (x2 - x1)) // 2
+        grow_y = max(0, self._min_region - (y2 - y1)) // 2
+        return max(0, x1 - grow_x), max(0, y1 - grow_y), min(w, x2 + grow_x), min(h, y2 + grow_y)
+
+    def __call__(self, frame):
+        h, w = frame.shape[:2]
+        scale = MOTION_SCALE_WIDTH / w
+        small = cv2.resize(frame, (MOTION_SCALE_WIDTH, max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+
+        self._frames += 1
+        self._pixels += w * h
+        full = [(0, 0, w, h)]
+        if self._background is None:
+            self._background = gray.astype(np.float32)
+            return full
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+        cv2.accumulateWeighted(gray, self._background, MOTION_BACKGROUND_ALPHA)
+        _, mask = cv2.threshold(diff, MOTION_THRESHOLD, 255, cv2.THRESH_BINARY)
+        mask = cv2.dilate(mask, None, iterations=2)
+
+        min_area = MOTION_MIN_AREA_RATIO * mask.size
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        regions = []
+        for contour in contours:
+            if cv2.contourArea(contour) < min_area:
+                continue
+            x, y, cw, ch = cv2.boundingRect(contour)
+            regions.append(self._expand((int(x / scale), int(y / scale), int((x + cw) / scale), int((y + ch) / scale)), w, h))
+
+        if not regions:
+            self._skipped_frames += 1
+            self._skipped_pixels += w * h
+            return []
+
+        regions = merge_regions(regions)
+        covered = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in regions)
+        if not self._crop or len(regions) > MOTION_MAX_REGIONS or covered > MOTION_FULL_FRAME_RATIO * w * h:
+            return full
+
+        self._skipped_pixels += w * h - covered
+        return regions
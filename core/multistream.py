@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+
+import cv2
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from config import COUNTER_EMIT_INTERVAL_S, FPS_CALCULATION_FRAMES, MULTI_STREAM_WAIT_S
+from core.framering import FrameRing
+from core.grabber import FrameGrabber, is_stream_url
+from core.processor import FrameProcessor
+
+
+class StreamCapture(threading.Thread):
+    def __init__(self, source, frame_event):
+        super().__init__(daemon=True)
+        self._source = source
+        self._frame_event = frame_event
+        self._lock = threading.Lock()
+        self._frame = None
+        self._seq = 0
+        self._running = True
+
+    def latest(self, last_seq):
+        with self._lock:
+            if self._seq == last_seq:
+                return None
+            return self._seq, self._frame
+
+    def run(self):
+        cap = cv2.VideoCapture(self._source)
+        if not cap.isOpened():
+            return
+
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        interval = 1.0 / fps if isinstance(self._source, str) and os.path.isfile(self._source) and fps > 0 else 0
+        next_time = time.time()
+
+        while self._running:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            with self._lock:
+                self._frame = frame
+                self._seq += 1
+            self._frame_event.set()
+
+            if interval:
+                next_time += interval
+                delay = next_time - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+
+        cap.release()
+        self._frame_event.set()
+
+    def stop(self):
+        self._running = False
+
+
+class MultiStreamEngine(QThread):
+    frame_ready = pyqtSignal(int, int, int)
+    counter_updated = pyqtSignal(int, dict)
+    loading_status = pyqtSignal(str)
+    fps_updated = pyqtSignal(int, float)
+
+    def __init__(self, processor=None):
+        super().__init__()
+        self._running = False
+        self._sources = []
+        self._processor = processor or FrameProcessor()
+        self._detections_total = 0
+        self._frame_rings = []
+        self._display_sizes = {}
+
+    @property
+    def processor(self):
+        return self._processor
+
+    @property
+    def running(self):
+        return self._running
+
+    @running.setter
+    def running(self, value):
+        self._running = value
+
+    @property
+    def detections_total(self):
+        return self._detections_total
+
+    @property
+    def sources(self):
+        return list(self._sources)
+
+    def frame_ring(self, index):
+        rings = self._frame_rings
+        return rings[index] if 0 <= index < len(rings) else None
+
+    def set_display_size(self, index, width, height):
+        self._display_sizes[index] = (width, height)
+        ring = self.frame_ring(index)
+        if ring is not None:
+            ring.target = (width, height)
+
+    @sources.setter
+    def sources(self, value):
+        self._sources = list(value)
+
+    def load_model(self):
+        if self._processor.needs_load:
+            self.loading_status.emit("start")
+            self._processor.load()
+            self.loading_status.emit("finished")
+
+    def run(self):
+        self.load_model()
+        self._processor.reset_colors()
+
+        frame_event = threading.Event()
+        captures = [FrameGrabber(source, frame_event) if is_stream_url(source) else StreamCapture(source, frame_event)
+                    for source in self._sources]
+        rings = [FrameRing() for _ in captures]
+        for index, ring in enumerate(rings):
+            ring.target = self._display_sizes.get(index)
+        self._frame_rings = rings
+        for capture in captures:
+            capture.start()
+
+        last_seq = [0] * len(captures)
+        frame_seq = [0] * len(captures)
+        self._detections_total = 0
+        emitted = [0.0] * len(captures)
+        pending = {}
+        window_start = [time.time()] * len(captures)
+        window_frames = [0] * len(captures)
+
+        while self._running:
+            frame_event.wait(MULTI_STREAM_WAIT_S)
+            frame_event.clear()
+
+            batch = []
+            for index, capture in enumerate(captures):
+                latest = capture.latest(last_seq[index])
+                if latest is not None:
+                    last_seq[index], frame = latest
+                    batch.append((index, frame))
+
+            if not batch:
+                if not any(capture.is_alive() for capture in captures):
+                    break
+                continue
+
+            frames = [frame for _, frame in batch]
+            for (index, frame), result, geometry in zip(batch, *self._processor.infer(frames)):
+                detections = self._processor.extract(result, geometry)
+                self._processor.draw(frame, detections)
+                counter = self._processor.count(detections)
+                self._detections_total += sum(counter.values())
+                now = time.perf_counter()
+                if now - emitted[index] >= COUNTER_EMIT_INTERVAL_S:
+                    emitted[index] = now
+                    pending.pop(index, None)
+                    self.counter_updated.emit(index, counter)
+                else:
+                    pending[index] = counter
+                frame_seq[index] += 1
+                slot = rings[index].write(frame, frame_seq[index])
+                if slot is not None:
+                    self.frame_ready.emit(index, slot, frame_seq[index])
+
+                window_frames[index] += 1
+                if window_frames[index] >= FPS_CALCULATION_FRAMES:
+                    elapsed = time.time() - window_start[index]
+                    self.fps_updated.emit(index, window_frames[index] / elapsed if elapsed > 0 else 0)
+                    window_start[index] = time.time()
+                    window_frames[index] = 0
+
+        for index, counter in pending.items():
+            self.counter_updated.emit(index, counter)
+        for capture in captures:
+            capture.stop()
+        for capture in captures:
+            capture.join()
+
+    def stop(self):
+        self._running = False
+        self.wait()
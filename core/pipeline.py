@@ -0,0 +1,76 @@
+import threading
+from collections import deque
+
+from config import DROP_POLICY_BLOCK, DROP_POLICY_LATEST
+
+
+class FrameQueue:
+    def __init__(self, maxsize, policy=DROP_POLICY_BLOCK):
+        if policy not in (DROP_POLICY_BLOCK, DROP_POLICY_LATEST):
+            raise ValueError(f"Unknown drop policy: {policy}")
+        self._items = deque()
+        self._maxsize = maxsize
+        self._policy = policy
+        self._closed = False
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    @property
+    def policy(self):
+        return self._policy
+
+    @property
+    def depth(self):
+        with self._lock:
+            return len(self._items)
+
+    @property
+    def dropped(self):
+        with self._lock:
+            return self._dropped
+
+    @property
+    def closed(self):
+        with self._lock:
+            return self._closed
+
+    def put(self, item):
+        with self._lock:
+            if self._policy == DROP_POLICY_LATEST:
+                while len(self._items) >= self._maxsize:
+                    self._items.popleft()
+                    self._dropped += 1
+            else:
+                while len(self._items) >= self._maxsize and not self._closed:
+                    self._not_full.wait()
+            if self._closed:
+                return False
+            self._items.append(item)
+            self._not_empty.notify()
+            return True
+
+    def get(self):
+        with self._lock:
+            while not self._items and not self._closed:
+                self._not_empty.wait()
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def get_nowait(self):
+        with self._lock:
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
@@ -0,0 +1,332 @@
+import importlib.util
+import os
+import threading
+
+import cv2
+import numpy as np
+
+from config import (
+    VIDEO_FPS,
+    PLAYBACK_INDEX_DIR,
+    PLAYBACK_CACHE_BYTES,
+    PLAYBACK_MIN_CACHE_FRAMES,
+    PLAYBACK_PREFETCH_RATIO,
+)
+from core.result_cache import video_fingerprint
+
+
+def _has_av():
+    return importlib.util.find_spec('av') is not None
+
+
+def _probe_av(path):
+    try:
+        import av
+    except ImportError:
+        return None
+
+    pts, keys = [], []
+    try:
+        with av.open(path) as container:
+            stream = container.streams.video[0]
+            time_base = float(stream.time_base)
+            fps = float(stream.average_rate) if stream.average_rate else 0.0
+            for packet in container.demux(stream):
+                if packet.pts is not None:
+                    pts.append(packet.pts)
+                    keys.append(packet.is_keyframe)
+    except (av.error.FFmpegError, IndexError):
+        return None
+    if not pts:
+        return None
+    pts = np.asarray(pts, np.int64)
+    order = np.argsort(pts, kind='stable')
+    timestamps = (pts[order] - pts[order[0]]) * time_base
+    keyframes = np.flatnonzero(np.asarray(keys, bool)[order])
+    return timestamps, keyframes, fps
+
+
+def _probe_cv(path):
+    cap = cv2.VideoCapture(path)
+    count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or VIDEO_FPS
+    cap.release()
+    return np.arange(max(count, 0)) / fps, None, fps
+
+
+class VideoIndex:
+    def __init__(self, timestamps, keyframes, fps):
+        self._timestamps = np.asarray(timestamps, np.float64)
+        self._keyframes = None if keyframes is None else np.asarray(keyframes, np.int64)
+        duration = self._timestamps[-1] if len(self._timestamps) else 0.0
+        self._fps = fps or (len(self._timestamps) / duration if duration else VIDEO_FPS)
+
+    @classmethod
+    def open(cls, path, folder=PLAYBACK_INDEX_DIR):
+        return cls.load(path, folder) or cls.build(path, folder)
+
+    @classmethod
+    def estimate(cls, path):
+        return cls(*_probe_cv(path))
+
+    @classmethod
+    def load(cls, path, folder=PLAYBACK_INDEX_DIR):
+        cached = os.path.join(folder, f"{video_fingerprint(path)}.npz")
+        if not os.path.exists(cached):
+            return None
+        with np.load(cached) as data:
+            if not data['exact'] and _has_av():
+                return None
+            keyframes = data['keyframes'] if data['exact'] else None
+            return cls(data['timestamps'], keyframes, float(data['fps']))
+
+    @classmethod
+    def build(cls, path, folder=PLAYBACK_INDEX_DIR):
+        cached = os.path.join(folder, f"{video_fingerprint(path)}.npz")
+        probe = _probe_av(path) or _probe_cv(path)
+        index = cls(*probe)
+        os.makedirs(folder, exist_ok=True)
+        partial = f"{cached}.partial.npz"
+        np.savez(partial, timestamps=index._timestamps, fps=index._fps, exact=index.exact_keyframes,
+                 keyframes=index._keyframes if index.exact_keyframes else np.empty(0, np.int64))
+        os.replace(partial, cached)
+        return index
+
+    @property
+    def frame_count(self):
+        return len(self._timestamps)
+
+    @property
+    def fps(self):
+        return self._fps
+
+    @property
+    def duration(self):
+        return float(self._timestamps[-1]) if len(self._timestamps) else 0.0
+
+    @property
+    def exact_keyframes(self):
+        return self._keyframes is not None
+
+    def timestamp(self, index):
+        if not len(self._timestamps):
+            return index / self._fps
+        return float(self._timestamps[min(max(index, 0), len(self._timestamps) - 1)])
+
+    def frame_at(self, seconds):
+        return int(np.searchsorted(self._timestamps, seconds, side='right')) - 1
+
+    def keyframe_before(self, index):
+        if self._keyframes is None or not len(self._keyframes):
+            return index
+        position = np.searchsorted(self._keyframes, index, side='right') - 1
+        return int(self._keyframes[position]) if position >= 0 else 0
+
+
+class PlaybackDecoder:
+    def __init__(self, path, cache_bytes=PLAYBACK_CACHE_BYTES, on_index=None):
+        self._path = path
+        self._cap = cv2.VideoCapture(path)
+        self._on_index = on_index
+        self._index = self._indexer = None
+        if self._cap.isOpened():
+            self._index = VideoIndex.load(path)
+            if self._index is None:
+                self._index = VideoIndex.estimate(path)
+                self._indexer = threading.Thread(target=self._build_index, daemon=True)
+        self._cache_bytes = cache_bytes
+        self._capacity = PLAYBACK_MIN_CACHE_FRAMES
+        self._ahead = 1
+        self._max_ahead = None
+        self._grab_until = 0
+        self._generation = 0
+        self._cache = {}
+        self._cond = threading.Condition()
+        self._playhead = 0
+        self._position = -1
+        self._decode_pos = 0
+        self._end = self._index.frame_count if self._index and self._index.frame_count else None
+        self._paused = False
+        self._steps = 0
+        self._closed = False
+        self._thread = None
+
+    @property
+    def opened(self):
+        return self._index is not None
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def indexing(self):
+        return self._indexer is not None and self._indexer.is_alive()
+
+    @property
+    def frame_count(self):
+        return self._end or self._index.frame_count
+
+    @property
+    def position(self):
+        return self._position
+
+    @property
+    def paused(self):
+        return self._paused
+
+    @property
+    def cached_frames(self):
+        return len(self._cache)
+
+    @property
+    def generation(self):
+        return self._generation
+
+    @property
+    def prefetch(self):
+        return self._max_ahead
+
+    @prefetch.setter
+    def prefetch(self, frames):
+        with self._cond:
+            self._max_ahead = max(1, int(frames)) if frames else None
+            self._cond.notify_all()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self._thread.start()
+        if self._indexer is not None:
+            self._indexer.start()
+        elif self._on_index is not None:
+            self._on_index(self._index)
+
+    def _build_index(self):
+        index = VideoIndex.build(self._path)
+        with self._cond:
+            if self._closed:
+                return
+            if index.frame_count and self._end in (None, self._index.frame_count):
+                self._end = index.frame_count
+            self._index = index
+            self._cond.notify_all()
+        if self._on_index is not None:
+            self._on_index(index)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._cap.release()
+        self._cache = {}
+
+    def read(self):
+        with self._cond:
+            while not self._closed:
+                if self._paused and not self._steps:
+                    self._cond.wait()
+                    continue
+                index = self._playhead
+                if self._end is not None and index >= self._end:
+                    return None
+                frame = self._cache.get(index)
+                if frame is None:
+                    self._cond.notify_all()
+                    self._cond.wait()
+                    continue
+                self._playhead = index + 1
+                self._position = index
+                if self._steps:
+                    self._steps -= 1
+                self._cond.notify_all()
+                return index, frame.copy()
+        return None
+
+    def skip(self, count):
+        with self._cond:
+            self._playhead += count
+            self._grab_until = self._playhead
+            self._cond.notify_all()
+
+    def seek(self, index):
+        with self._cond:
+            limit = (self._end or index + 1) - 1
+            self._playhead = min(max(0, int(index)), limit)
+            self._steps = 1 if self._paused else 0
+            self._grab_until = 0
+            self._generation += 1
+            self._cond.notify_all()
+
+    def step(self, delta):
+        with self._cond:
+            limit = (self._end or self._position + delta + 1) - 1
+            self._playhead = min(max(0, self._position + delta), limit)
+            self._paused = True
+            self._steps = 1
+            self._grab_until = 0
+            self._generation += 1
+            self._cond.notify_all()
+
+    def pause(self):
+        with self._cond:
+            self._paused = True
+            self._generation += 1
+
+    def resume(self):
+        with self._cond:
+            self._paused = False
+            self._steps = 0
+            self._generation += 1
+            self._cond.notify_all()
+
+    def _next_missing(self):
+        stop = self._playhead + min(self._ahead, self._max_ahead or self._ahead)
+        if self._end is not None:
+            stop = min(stop, self._end)
+        for index in range(self._playhead, stop):
+            if index not in self._cache:
+                return index
+        return None
+
+    def _evict(self):
+        behind = self._capacity - self._ahead
+        for index in [i for i in self._cache if not self._playhead - behind <= i < self._playhead + self._ahead]:
+            del self._cache[index]
+
+    def _decode_loop(self):
+        while True:
+            with self._cond:
+                target = None
+                while not self._closed:
+                    target = self._next_missing()
+                    if target is not None:
+                        break
+                    self._cond.wait()
+                if self._closed:
+                    return
+                self._evict()
+                behind = self._capacity - self._ahead
+
+            if not self._decode_pos <= target <= self._decode_pos + behind:
+                start = max(self._index.keyframe_before(target), target - behind, 0)
+                self._cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+                self._decode_pos = start
+
+            if self._decode_pos < max(self._grab_until, self._playhead - behind):
+                ok, frame = self._cap.grab(), None
+            else:
+                ok, frame = self._cap.read()
+            with self._cond:
+                if not ok:
+                    self._end = self._decode_pos
+                elif frame is not None and self._decode_pos >= self._playhead - behind:
+                    if not self._cache:
+                        self._capacity = max(PLAYBACK_MIN_CACHE_FRAMES, self._cache_bytes // frame.nbytes)
+                        self._ahead = max(1, int(self._capacity * PLAYBACK_PREFETCH_RATIO))
+                    self._cache[self._decode_pos] = frame
+                    self._decode_pos += 1
+                else:
+                    self._decode_pos += 1
+                self._cond.notify_all()
@@ -0,0 +1,44 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from core.startup import StartupTimer
+
+
+class ModelPreloader(QThread):
+    loading_status = pyqtSignal(str)
+    cuda_checked = pyqtSignal(bool)
+    timings_ready = pyqtSignal(str)
+    status_message = pyqtSignal(str)
+
+    def __init__(self, processor, timer=None):
+        super().__init__()
+        self._processor = processor
+        self._timer = timer or StartupTimer()
+
+    def run(self):
+        self.loading_status.emit("start")
+        try:
+            self._preload()
+        except Exception as e:
+            self.loading_status.emit("finished")
+            self.status_message.emit(f"Model preload failed: {e}")
+            return
+        self.loading_status.emit("finished")
+        self.timings_ready.emit(self._timer.report())
+
+    def _preload(self):
+        import torch
+        self._timer.mark("torch_import")
+        try:
+            cuda_available = torch.cuda.is_available()
+        except Exception:
+            cuda_available = False
+        self.cuda_checked.emit(cuda_available)
+
+        import ultralytics  # noqa: F401
+        self._timer.mark("ultralytics_import")
+
+        self._processor.load()
+        self._timer.mark("model_load")
+
+        self._processor.warm_up()
+        self._timer.mark("warm_up")
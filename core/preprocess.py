@@ -0,0 +1,114 @@
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from config import LETTERBOX_FILL, MODEL_STRIDE
+
+Geometry = namedtuple('Geometry', 'ratio pad_x pad_y width height')
+
+INTERPOLATIONS = {
+    'linear': cv2.INTER_LINEAR,
+    'area': cv2.INTER_AREA,
+}
+
+
+def padded_size(size):
+    return -(-size // MODEL_STRIDE) * MODEL_STRIDE
+
+
+def fit_ratio(height, width, size, max_ratio=None):
+    ratio = size / max(height, width)
+    return ratio if max_ratio is None else min(ratio, max_ratio)
+
+
+def canvas_shape(shapes, size, rect=True, max_ratios=None):
+    size = padded_size(size)
+    if not rect:
+        return size, size
+    max_ratios = max_ratios or [None] * len(shapes)
+    height = width = 0
+    for (h, w), max_ratio in zip(shapes, max_ratios):
+        ratio = fit_ratio(h, w, size, max_ratio)
+        height, width = max(height, int(round(h * ratio))), max(width, int(round(w * ratio)))
+    return padded_size(max(height, 1)), padded_size(max(width, 1))
+
+
+class Letterbox:
+    def __init__(self, size, interpolation='linear', rect=False):
+        import torch
+
+        self._torch = torch
+        self._size = padded_size(size)
+        self._rect = rect
+        self._interpolation = interpolation
+        self._cv_interpolation = INTERPOLATIONS[interpolation]
+        self._shape = (self._size, self._size)
+        self._host = np.empty((0,) + self._shape + (3,), np.uint8)
+        self._tensor = torch.empty((0, 3) + self._shape)
+        self._geometries = []
+        self._resized = []
+        self._last_ms = 0.0
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def rect(self):
+        return self._rect
+
+    @property
+    def interpolation(self):
+        return self._interpolation
+
+    @property
+    def last_ms(self):
+        return self._last_ms
+
+    def _reserve(self, count, shape):
+        if shape == self._shape:
+            if count <= len(self._host):
+                return
+        else:
+            self._shape = shape
+        self._host = np.full((count,) + shape + (3,), LETTERBOX_FILL, np.uint8)
+        self._tensor = self._torch.empty((count, 3) + shape)
+        self._geometries = [None] * count
+        self._resized = [None] * count
+
+    def _geometry(self, frame, max_ratio=None):
+        h, w = frame.shape[:2]
+        height, width = self._shape
+        ratio = min(height / h, width / w)
+        if max_ratio is not None:
+            ratio = min(ratio, max_ratio)
+        new_w, new_h = min(width, int(round(w * ratio))), min(height, int(round(h * ratio)))
+        return Geometry(ratio, (width - new_w) // 2, (height - new_h) // 2, w, h), new_w, new_h
+
+    def __call__(self, frames, max_ratios=None):
+        start = time.perf_counter()
+        count = len(frames)
+        max_ratios = max_ratios or [None] * count
+        self._reserve(count, canvas_shape([frame.shape[:2] for frame in frames], self._size, self._rect, max_ratios))
+
+        geometries = []
+        for slot, (frame, max_ratio) in enumerate(zip(frames, max_ratios)):
+            geometry, new_w, new_h = self._geometry(frame, max_ratio)
+            canvas = self._host[slot]
+            if geometry != self._geometries[slot]:
+                canvas[:] = LETTERBOX_FILL
+                self._resized[slot] = np.empty((new_h, new_w, 3), np.uint8)
+                self._geometries[slot] = geometry
+
+            resized = self._resized[slot]
+            cv2.resize(frame, (new_w, new_h), dst=resized, interpolation=self._cv_interpolation)
+            cv2.cvtColor(resized, cv2.COLOR_BGR2RGB, dst=resized)
+            canvas[geometry.pad_y:geometry.pad_y + new_h, geometry.pad_x:geometry.pad_x + new_w] = resized
+            geometries.append(geometry)
+
+        tensor = self._tensor[:count]
+        tensor.copy_(self._torch.from_numpy(self._host[:count]).permute(0, 3, 1, 2)).div_(255.0)
+        self._last_ms = (time.perf_counter() - start) * 1000
+        return tensor, geometries
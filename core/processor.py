@@ -0,0 +1,147 @@
+import threading
+
+import numpy as np
+
+from config import (
+    DEFAULT_CONFIDENCE,
+    DEFAULT_INFERENCE_SIZE,
+    DEFAULT_INTERPOLATION,
+    DEFAULT_BACKEND,
+    BACKEND_TORCH,
+)
+from core.backends import resolve_model, supports_batch
+from core.colors import ColorManager
+from core.preprocess import Letterbox, padded_size
+from core.renderer import DetectionRenderer
+from core.results import count_detections, detections_from_result
+
+
+class FrameProcessor:
+    def __init__(self, device='cpu', conf_threshold=DEFAULT_CONFIDENCE, inference_size=DEFAULT_INFERENCE_SIZE,
+                 backend=DEFAULT_BACKEND):
+        self._device = device
+        self._backend = backend
+        self._conf_threshold = conf_threshold
+        self._inference_size = inference_size
+        self._interpolation = DEFAULT_INTERPOLATION
+        self._letterbox = None
+        self._model = None
+        self._model_key = None
+        self._load_lock = threading.Lock()
+        self._color_manager = ColorManager()
+        self._renderer = DetectionRenderer(self._color_manager)
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    @property
+    def needs_load(self):
+        return self._model is None or self._model_key != self._desired_key()
+
+    @property
+    def device(self):
+        return self._device
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @backend.setter
+    def backend(self, value):
+        self._backend = value
+
+    @property
+    def names(self):
+        return self._model.names
+
+    @property
+    def conf_threshold(self):
+        return self._conf_threshold
+
+    @conf_threshold.setter
+    def conf_threshold(self, value):
+        self._conf_threshold = value
+
+    @property
+    def inference_size(self):
+        return self._inference_size
+
+    @inference_size.setter
+    def inference_size(self, value):
+        self._inference_size = value
+
+    @property
+    def interpolation(self):
+        return self._interpolation
+
+    @interpolation.setter
+    def interpolation(self, value):
+        self._interpolation = value
+
+    @property
+    def rect_input(self):
+        return supports_batch(self._backend)
+
+    @property
+    def preprocess_ms(self):
+        return self._letterbox.last_ms if self._letterbox else 0.0
+
+    def _desired_key(self):
+        if self._backend == BACKEND_TORCH:
+            return self._backend, None
+        return self._backend, padded_size(self._inference_size)
+
+    def load(self):
+        with self._load_lock:
+            if not self.needs_load:
+                return
+            from ultralytics import YOLO
+
+            key = self._desired_key()
+            model = YOLO(resolve_model(*key), task="detect")
+            if self._backend == BACKEND_TORCH:
+                model.to(self._device)
+            self._model = model
+            self._model_key = key
+
+    def warm_up(self):
+        self.load()
+        self.infer([np.zeros((self._inference_size, self._inference_size, 3), np.uint8)])
+
+    def set_device(self, device):
+        self._device = device
+        if self._model is not None and self._backend == BACKEND_TORCH:
+            self._model.to(device)
+
+    def reset_colors(self):
+        self._color_manager.reset()
+
+    def _get_letterbox(self):
+        lb = self._letterbox
+        rect = self.rect_input
+        if (lb is None or lb.size != padded_size(self._inference_size) or lb.interpolation != self._interpolation
+                or lb.rect != rect):
+            self._letterbox = Letterbox(self._inference_size, self._interpolation, rect)
+        return self._letterbox
+
+    def infer(self, frames, conf_threshold=None, max_ratios=None):
+        conf = self._conf_threshold if conf_threshold is None else conf_threshold
+        tensor, geometries = self._get_letterbox()(frames, max_ratios)
+        if supports_batch(self._backend) or len(tensor) == 1:
+            return self._predict(tensor, conf), geometries
+        return [result for i in range(len(tensor)) for result in self._predict(tensor[i:i + 1], conf)], geometries
+
+    def _predict(self, tensor, conf):
+        if self._backend == BACKEND_TORCH:
+            return self._model(tensor, conf=conf, verbose=False)
+        return self._model(tensor, conf=conf, device=self._device, verbose=False)
+
+    def extract(self, result, geometry):
+        return detections_from_result(result, geometry)
+
+    def count(self, detections):
+        return count_detections(detections, self._model.names)
+
+    def draw(self, frame, detections, ids=None):
+        return self._renderer.draw(frame, detections, self._model.names, ids)
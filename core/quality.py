@@ -0,0 +1,86 @@
+from config import (
+    MIN_INFERENCE_SIZE,
+    MAX_INFERENCE_SIZE,
+    QUALITY_TARGET_FPS,
+    QUALITY_HYSTERESIS,
+    QUALITY_COOLDOWN_WINDOWS,
+    QUALITY_SIZE_STEP,
+    QUALITY_MAX_SKIP,
+)
+
+
+class QualityController:
+    def __init__(self, mode, target, size, resizable=True, min_size=MIN_INFERENCE_SIZE, max_size=MAX_INFERENCE_SIZE,
+                 step=QUALITY_SIZE_STEP, max_skip=QUALITY_MAX_SKIP, hysteresis=QUALITY_HYSTERESIS,
+                 cooldown=QUALITY_COOLDOWN_WINDOWS):
+        self._mode = mode
+        self._target = float(target)
+        self._resizable = resizable
+        self._min_size = min_size
+        self._max_size = max_size
+        self._step = step
+        self._max_skip = max_skip
+        self._hysteresis = hysteresis
+        self._cooldown = cooldown
+        self._wait = 0
+        self._size = self._clamp(size)
+        self._skip = 0
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @property
+    def target(self):
+        return self._target
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def skip(self):
+        return self._skip
+
+    def reset(self, size):
+        self._size = self._clamp(size)
+        self._skip = 0
+        self._wait = self._cooldown
+
+    def _clamp(self, size):
+        return max(self._min_size, min(self._max_size, int(size)))
+
+    def _score(self, fps, latency_ms):
+        if self._mode == QUALITY_TARGET_FPS:
+            return fps / self._target if self._target else 1.0
+        return self._target / latency_ms if latency_ms else 1.0
+
+    def update(self, fps, latency_ms):
+        if self._wait:
+            self._wait -= 1
+            return None
+
+        score = self._score(fps, latency_ms)
+        size, skip = self._size, self._skip
+        if score < 1 - self._hysteresis:
+            if self._resizable and size > self._min_size:
+                size = self._clamp(size - self._step)
+            elif skip < self._max_skip:
+                skip += 1
+            reason = "over budget"
+        elif score > 1 + self._hysteresis:
+            if skip and score * skip / (skip + 1) >= 1:
+                skip -= 1
+            elif self._resizable and size < self._max_size:
+                grown = self._clamp(size + self._step)
+                if score * (size / grown) ** 2 >= 1:
+                    size = grown
+            reason = "headroom"
+        else:
+            return None
+
+        if (size, skip) == (self._size, self._skip):
+            return None
+        self._size, self._skip = size, skip
+        self._wait = self._cooldown
+        return {'size': size, 'skip': skip, 'reason': reason, 'score': round(score, 2)}
@@ -0,0 +1,172 @@
+import json
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+from config import (
+    OUTPUT_VIDEO,
+    VIDEO_FPS,
+    RECORD_QUEUE_SIZE,
+    RECORD_SEGMENT_SECONDS,
+    RECORD_SEGMENT_BYTES,
+    RECORD_FPS_PROBE_FRAMES,
+    RECORD_SIZE_CHECK_FRAMES,
+)
+
+_STOP = object()
+
+
+class VideoRecorder:
+    def __init__(self, path=OUTPUT_VIDEO, raw=False, source_path=None, segment_seconds=RECORD_SEGMENT_SECONDS,
+                 segment_bytes=RECORD_SEGMENT_BYTES, queue_size=RECORD_QUEUE_SIZE):
+        base, ext = os.path.splitext(path)
+        self._prefix = f"{base}_{time.strftime('%Y%m%d_%H%M%S')}"
+        self._ext = ext or '.avi'
+        self._raw = raw
+        self._source_path = source_path
+        self._segment_seconds = segment_seconds
+        self._segment_bytes = segment_bytes
+        self._queue = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._dropped = 0
+        self._written = 0
+        self._segments = []
+        self._fps = None
+
+        self._writer = None
+        self._sidecar = None
+        self._segment_path = None
+        self._segment_start = None
+        self._segment_frames = 0
+        self._next_size_check = RECORD_SIZE_CHECK_FRAMES
+
+    @property
+    def raw(self):
+        return self._raw
+
+    @property
+    def encodes_video(self):
+        return not (self._raw and self._source_path)
+
+    @property
+    def dropped(self):
+        return self._dropped
+
+    @property
+    def written(self):
+        return self._written
+
+    @property
+    def fps(self):
+        return self._fps
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    @property
+    def segments(self):
+        return list(self._segments)
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, frame, timestamp, frame_index=None, detections=None):
+        try:
+            self._queue.put_nowait((frame, timestamp, frame_index, detections))
+            return True
+        except queue.Full:
+            self._dropped += 1
+            return False
+
+    def stop(self):
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        probe = []
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            if self._fps is None:
+                probe.append(item)
+                if len(probe) >= RECORD_FPS_PROBE_FRAMES:
+                    self._fps = self._measure_fps(probe)
+                    for buffered in probe:
+                        self._write(*buffered)
+                    probe = []
+                continue
+            self._write(*item)
+
+        if probe:
+            self._fps = self._measure_fps(probe)
+            for buffered in probe:
+                self._write(*buffered)
+        self._close_segment()
+
+    def _measure_fps(self, items):
+        elapsed = items[-1][1] - items[0][1]
+        if len(items) < 2 or elapsed <= 0:
+            return VIDEO_FPS
+        return min(max((len(items) - 1) / elapsed, 1.0), 120.0)
+
+    def _open_segment(self, frame, timestamp):
+        self._segment_path = f"{self._prefix}_{len(self._segments):03d}{self._ext}"
+        if self.encodes_video:
+            fourcc = cv2.VideoWriter_fourcc(*'XVID')
+            self._writer = cv2.VideoWriter(self._segment_path, fourcc, self._fps, (frame.shape[1], frame.shape[0]))
+        if self._raw:
+            self._sidecar = open(os.path.splitext(self._segment_path)[0] + '.jsonl', 'w')
+            header = {'fps': self._fps, 'source': self._source_path, 'video': self._segment_path if self.encodes_video else None}
+            self._sidecar.write(json.dumps(header) + '\n')
+        self._segments.append(self._segment_path)
+        self._segment_start = timestamp
+        self._segment_frames = 0
+        self._next_size_check = RECORD_SIZE_CHECK_FRAMES
+
+    def _close_segment(self):
+        if self._writer:
+            self._writer.release()
+            self._writer = None
+        if self._sidecar:
+            self._sidecar.close()
+            self._sidecar = None
+
+    def _should_rotate(self, timestamp):
+        if timestamp - self._segment_start >= self._segment_seconds:
+            return True
+        if self._writer is None or self._segment_frames < self._next_size_check:
+            return False
+        self._next_size_check = self._segment_frames + RECORD_SIZE_CHECK_FRAMES
+        return os.path.exists(self._segment_path) and os.path.getsize(self._segment_path) >= self._segment_bytes
+
+    def _write(self, frame, timestamp, frame_index, detections):
+        if self._segment_start is None or self._should_rotate(timestamp):
+            self._close_segment()
+            self._open_segment(frame, timestamp)
+
+        repeats = 1
+        if self._writer:
+            expected = int((timestamp - self._segment_start) * self._fps) + 1
+            repeats = max(0, expected - self._segment_frames)
+
+        if self._sidecar:
+            shown = self._segment_frames if repeats else max(0, self._segment_frames - 1)
+            record = {'frame': shown, 't': round(timestamp, 4)}
+            if frame_index is not None:
+                record['source_frame'] = frame_index
+            if detections is not None:
+                record['xyxy'] = detections.xyxy.tolist()
+                record['conf'] = [round(c, 4) for c in detections.conf.tolist()]
+                record['cls'] = detections.cls.tolist()
+            self._sidecar.write(json.dumps(record) + '\n')
+
+        if self._writer:
+            for _ in range(repeats):
+                self._writer.write(frame)
+        self._segment_frames += repeats
+        self._written += 1
@@ -0,0 +1,20 @@
+import cv2
+
+from core.colors import ColorManager
+
+
+class DetectionRenderer:
+    def __init__(self, color_manager=None):
+        self._color_manager = color_manager or ColorManager()
+
+    def draw(self, frame, detections, names, ids=None):
+        colors = self._color_manager.palette_for(detections.cls, names)
+        prefixes = [f"#{track_id} " for track_id in ids.tolist()] if ids is not None else [""] * len(colors)
+
+        for (x1, y1, x2, y2), conf, cls, color, prefix in zip(detections.xyxy.tolist(), detections.conf.tolist(),
+                                                               detections.cls.tolist(), colors.tolist(), prefixes):
+            color = tuple(color)
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+            cv2.putText(frame, f"{prefix}{names[cls]} {conf:.2f}", (x1, y1 - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+        return frame
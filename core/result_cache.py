@@ -0,0 +1,144 @@
+import hashlib
+import os
+
+import numpy as np
+
+from config import (
+    RESULT_CACHE_DIR,
+    RESULT_CACHE_MIN_CONF,
+    RESULT_CACHE_MAX_BYTES,
+    RESULT_CACHE_SAMPLE_BYTES,
+    RESULT_CACHE_SAMPLES,
+)
+from core.backends import backend_tag, weights_hash
+from core.results import Detections
+
+
+def video_fingerprint(path):
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(str(size).encode())
+    with open(path, 'rb') as f:
+        if size <= RESULT_CACHE_SAMPLE_BYTES * (RESULT_CACHE_SAMPLES + 2):
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        else:
+            span = size - RESULT_CACHE_SAMPLE_BYTES
+            for i in range(RESULT_CACHE_SAMPLES + 2):
+                f.seek(span * i // (RESULT_CACHE_SAMPLES + 1))
+                digest.update(f.read(RESULT_CACHE_SAMPLE_BYTES))
+    return digest.hexdigest()[:24]
+
+
+def enforce_limit(root=RESULT_CACHE_DIR, max_bytes=RESULT_CACHE_MAX_BYTES):
+    entries = []
+    for folder, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(folder, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+        folder = os.path.dirname(path)
+        if folder != root and not os.listdir(folder):
+            os.rmdir(folder)
+
+
+class ResultCache:
+    def __init__(self, video_path, backend, size, mode='full', interpolation='linear', root=RESULT_CACHE_DIR,
+                 max_bytes=RESULT_CACHE_MAX_BYTES, min_conf=RESULT_CACHE_MIN_CONF):
+        self._root = root
+        self._max_bytes = max_bytes
+        self._min_conf = min_conf
+        self._size = size
+        self._interpolation = interpolation
+        self._folder = os.path.join(root, video_fingerprint(video_path))
+        model = weights_hash()
+        name = f"{model}-{backend_tag(backend)}-{size}-{interpolation}-{mode}-{min_conf:g}.npz"
+        self._path = os.path.join(self._folder, name)
+        self._frames = {}
+        self._dirty = False
+        self._hits = 0
+        self._misses = 0
+
+        self._invalidate(model)
+        self._load()
+
+    @property
+    def min_conf(self):
+        return self._min_conf
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def interpolation(self):
+        return self._interpolation
+
+    @property
+    def frames(self):
+        return len(self._frames)
+
+    @property
+    def hit_ratio(self):
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups else 0.0
+
+    def _invalidate(self, model):
+        if not os.path.isdir(self._folder):
+            return
+        for name in os.listdir(self._folder):
+            if not name.startswith(f"{model}-"):
+                os.remove(os.path.join(self._folder, name))
+
+    def _load(self):
+        if not os.path.exists(self._path):
+            return
+        try:
+            with np.load(self._path) as data:
+                indices, counts = data['indices'], data['counts']
+                xyxy, conf, cls = data['xyxy'], data['conf'], data['cls']
+        except (OSError, ValueError, KeyError):
+            os.remove(self._path)
+            return
+
+        ends = np.cumsum(counts)
+        for index, start, end in zip(indices.tolist(), (ends - counts).tolist(), ends.tolist()):
+            self._frames[index] = Detections(xyxy[start:end], conf[start:end], cls[start:end])
+        os.utime(self._path)
+
+    def get(self, index):
+        detections = self._frames.get(index)
+        if detections is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return detections
+
+    def put(self, index, detections):
+        self._frames[index] = detections
+        self._dirty = True
+
+    def close(self):
+        if not self._dirty:
+            return
+        indices = np.fromiter(sorted(self._frames), np.int64, len(self._frames))
+        parts = [self._frames[index] for index in indices.tolist()]
+        os.makedirs(self._folder, exist_ok=True)
+        partial = f"{self._path}.partial.npz"
+        np.savez(
+            partial,
+            indices=indices,
+            counts=np.array([len(p.conf) for p in parts], np.int64),
+            xyxy=np.concatenate([p.xyxy for p in parts]) if parts else np.empty((0, 4), np.int32),
+            conf=np.concatenate([p.conf for p in parts]) if parts else np.empty(0, np.float32),
+            cls=np.concatenate([p.cls for p in parts]) if parts else np.empty(0, np.int32),
+        )
+        os.replace(partial, self._path)
+        self._dirty = False
+        enforce_limit(self._root, self._max_bytes)
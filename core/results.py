@@ -0,0 +1,59 @@
+from collections import namedtuple
+
+import numpy as np
+
+Detections = namedtuple('Detections', 'xyxy conf cls')
+
+
+def empty_detections():
+    return Detections(np.empty((0, 4), np.int32), np.empty(0, np.float32), np.empty(0, np.int32))
+
+
+def detections_from_result(result, geometry=None):
+    data = result.boxes.data.cpu().numpy()
+    if not len(data):
+        return empty_detections()
+
+    xyxy = data[:, :4]
+    if geometry is not None:
+        xyxy = (xyxy - (geometry.pad_x, geometry.pad_y, geometry.pad_x, geometry.pad_y)) / geometry.ratio
+        np.clip(xyxy, 0, (geometry.width, geometry.height, geometry.width, geometry.height), out=xyxy)
+    return Detections(xyxy.astype(np.int32), data[:, 4].astype(np.float32), data[:, 5].astype(np.int32))
+
+
+def count_detections(detections, names):
+    counts = np.bincount(detections.cls, minlength=len(names))
+    return {names[cls]: int(counts[cls]) for cls in np.flatnonzero(counts).tolist()}
+
+
+def filter_detections(detections, conf_threshold):
+    keep = detections.conf >= conf_threshold
+    if keep.all():
+        return detections
+    return Detections(detections.xyxy[keep], detections.conf[keep], detections.cls[keep])
+
+
+def offset_detections(detections, dx, dy):
+    if not dx and not dy:
+        return detections
+    return detections._replace(xyxy=detections.xyxy + np.array((dx, dy, dx, dy), np.int32))
+
+
+def outside_regions(detections, regions):
+    if not len(detections.conf) or not regions:
+        return detections
+    cx = (detections.xyxy[:, 0] + detections.xyxy[:, 2]) / 2
+    cy = (detections.xyxy[:, 1] + detections.xyxy[:, 3]) / 2
+    keep = np.ones(len(cx), bool)
+    for x1, y1, x2, y2 in regions:
+        keep &= ~((cx >= x1) & (cx < x2) & (cy >= y1) & (cy < y2))
+    return Detections(detections.xyxy[keep], detections.conf[keep], detections.cls[keep])
+
+
+def concat_detections(parts):
+    if not parts:
+        return empty_detections()
+    if len(parts) == 1:
+        return parts[0]
+    return Detections(np.concatenate([p.xyxy for p in parts]), np.concatenate([p.conf for p in parts]),
+                      np.concatenate([p.cls for p in parts]))
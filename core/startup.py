@@ -0,0 +1,24 @@
+import time
+
+
+class StartupTimer:
+    def __init__(self, origin=None):
+        self._origin = origin if origin is not None else time.perf_counter()
+        self._marks = {}
+
+    @property
+    def marks(self):
+        return dict(self._marks)
+
+    def mark(self, phase):
+        if phase not in self._marks:
+            self._marks[phase] = time.perf_counter() - self._origin
+        return self._marks[phase]
+
+    def report(self):
+        lines = []
+        previous = 0.0
+        for phase, elapsed in sorted(self._marks.items(), key=lambda item: item[1]):
+            lines.append(f"{phase:<18} {elapsed:6.2f}s  (+{elapsed - previous:.2f}s)")
+            previous = elapsed
+        return "\n".join(lines)
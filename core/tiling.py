@@ -0,0 +1,75 @@
+import math
+
+import numpy as np
+
+from config import TILE_OVERLAP, TILE_MIN_SCALE, TILE_INCLUDE_FULL_FRAME, TILE_NMS_METRIC, TILE_NMS_THRESHOLD
+from core.results import Detections
+
+
+def _starts(length, tile, overlap):
+    if length <= tile:
+        return [0]
+    stride = max(1, int(tile * (1 - overlap)))
+    count = math.ceil((length - tile) / stride) + 1
+    return np.linspace(0, length - tile, count).round().astype(int).tolist()
+
+
+class TileGrid:
+    def __init__(self, width, height, tile, overlap=TILE_OVERLAP, include_full=TILE_INCLUDE_FULL_FRAME):
+        self._key = (width, height, tile, overlap, include_full)
+        self._tiles = []
+        if max(width, height) >= tile * TILE_MIN_SCALE:
+            tw, th = min(tile, width), min(tile, height)
+            self._tiles = [(x, y, x + tw, y + th)
+                           for y in _starts(height, th, overlap) for x in _starts(width, tw, overlap)]
+        if include_full or not self._tiles:
+            self._tiles.append((0, 0, width, height))
+
+    @property
+    def tiles(self):
+        return self._tiles
+
+    @property
+    def tiled(self):
+        return len(self._tiles) > 1
+
+    def matches(self, width, height, tile, overlap=TILE_OVERLAP, include_full=TILE_INCLUDE_FULL_FRAME):
+        return self._key == (width, height, tile, overlap, include_full)
+
+    def select(self, regions):
+        selected = []
+        for tile in self._tiles:
+            x1, y1, x2, y2 = tile
+            if any(x1 < rx2 and rx1 < x2 and y1 < ry2 and ry1 < y2 for rx1, ry1, rx2, ry2 in regions):
+                selected.append(tile)
+        return selected
+
+
+def nms_detections(detections, threshold=TILE_NMS_THRESHOLD, metric=TILE_NMS_METRIC):
+    n = len(detections.conf)
+    if n < 2:
+        return detections
+
+    order = np.argsort(-detections.conf, kind='stable')
+    boxes = detections.xyxy[order].astype(np.float32)
+    boxes += (detections.cls[order].astype(np.float32) * (boxes.max() + 1))[:, None]
+
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    lt = np.maximum(boxes[:, None, :2], boxes[None, :, :2])
+    rb = np.minimum(boxes[:, None, 2:], boxes[None, :, 2:])
+    wh = np.clip(rb - lt, 0, None)
+    inter = wh[..., 0] * wh[..., 1]
+    if metric == "ios":
+        denom = np.minimum(areas[:, None], areas[None, :])
+    else:
+        denom = areas[:, None] + areas[None, :] - inter
+    overlap = np.divide(inter, denom, out=np.zeros_like(inter), where=denom > 0)
+    np.fill_diagonal(overlap, 0)
+
+    suppressed = np.zeros(n, bool)
+    for i in range(n):
+        if not suppressed[i]:
+            suppressed[i + 1:] |= overlap[i, i + 1:] > threshold
+
+    keep = np.sort(order[~suppressed])
+    return Detections(detections.xyxy[keep], detections.conf[keep], detections.cls[keep])
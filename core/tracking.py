@@ -0,0 +1,160 @@
+import numpy as np
+
+from config import ADAPTIVE_MAX_INTERVAL, TRACK_IOU_THRESHOLD, TRACK_MAX_MISSED, TRACK_VELOCITY_SMOOTHING
+from core.results import Detections
+
+
+def iou_matrix(a, b):
+    a = np.asarray(a, np.float32)
+    b = np.asarray(b, np.float32)
+    if not len(a) or not len(b):
+        return np.zeros((len(a), len(b)), np.float32)
+
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
+
+
+def greedy_match(iou, threshold):
+    rows, cols = np.nonzero(iou >= threshold)
+    order = np.argsort(-iou[rows, cols], kind='stable')
+    used_rows, used_cols, pairs = set(), set(), []
+    for row, col in zip(rows[order].tolist(), cols[order].tolist()):
+        if row not in used_rows and col not in used_cols:
+            used_rows.add(row)
+            used_cols.add(col)
+            pairs.append((row, col))
+    return pairs
+
+
+class IoUTracker:
+    def __init__(self, iou_threshold=TRACK_IOU_THRESHOLD, max_missed=TRACK_MAX_MISSED):
+        self._iou_threshold = iou_threshold
+        self._max_missed = max_missed
+        self._next_id = 1
+        self.reset()
+
+    def reset(self):
+        self._boxes = np.empty((0, 4), np.float32)
+        self._anchors = np.empty((0, 4), np.float32)
+        self._velocity = np.empty((0, 4), np.float32)
+        self._conf = np.empty(0, np.float32)
+        self._cls = np.empty(0, np.int32)
+        self._ids = np.empty(0, np.int64)
+        self._missed = np.empty(0, np.int32)
+        self._steps = np.empty(0, np.int32)
+        self._stability = 1.0
+
+    @property
+    def stability(self):
+        return self._stability
+
+    def _output(self):
+        return Detections(self._boxes.astype(np.int32), self._conf.copy(), self._cls.copy()), self._ids.copy()
+
+    def current(self):
+        return self._output()
+
+    def predict(self):
+        self._boxes += self._velocity
+        self._steps += 1
+        return self._output()
+
+    def update(self, detections):
+        boxes = detections.xyxy.astype(np.float32)
+        predicted = self._boxes + self._velocity
+        self._steps += 1
+
+        iou = iou_matrix(predicted, boxes)
+        iou[self._cls[:, None] != detections.cls[None, :]] = 0
+        pairs = greedy_match(iou, self._iou_threshold)
+        total = max(len(self._ids), len(boxes))
+        self._stability = len(pairs) / total if total else 1.0
+
+        track_idx = np.array([p[0] for p in pairs], np.int64)
+        det_idx = np.array([p[1] for p in pairs], np.int64)
+
+        self._boxes = predicted
+        if len(pairs):
+            measured = (boxes[det_idx] - self._anchors[track_idx]) / self._steps[track_idx, None]
+            alpha = TRACK_VELOCITY_SMOOTHING
+            self._velocity[track_idx] = alpha * measured + (1 - alpha) * self._velocity[track_idx]
+            self._boxes[track_idx] = boxes[det_idx]
+            self._anchors[track_idx] = boxes[det_idx]
+            self._conf[track_idx] = detections.conf[det_idx]
+            self._steps[track_idx] = 0
+            self._missed[track_idx] = 0
+
+        unmatched = np.ones(len(self._ids), bool)
+        unmatched[track_idx] = False
+        self._missed[unmatched] += 1
+        keep = self._missed <= self._max_missed
+        self._drop(keep)
+
+        new = np.ones(len(boxes), bool)
+        new[det_idx] = False
+        self._spawn(boxes[new], detections.conf[new], detections.cls[new])
+        return self._output()
+
+    def _drop(self, keep):
+        self._boxes = self._boxes[keep]
+        self._anchors = self._anchors[keep]
+        self._velocity = self._velocity[keep]
+        self._conf = self._conf[keep]
+        self._cls = self._cls[keep]
+        self._ids = self._ids[keep]
+        self._missed = self._missed[keep]
+        self._steps = self._steps[keep]
+
+    def _spawn(self, boxes, conf, cls):
+        count = len(boxes)
+        if not count:
+            return
+        self._boxes = np.concatenate([self._boxes, boxes])
+        self._anchors = np.concatenate([self._anchors, boxes])
+        self._velocity = np.concatenate([self._velocity, np.zeros((count, 4), np.float32)])
+        self._conf = np.concatenate([self._conf, conf.astype(np.float32)])
+        self._cls = np.concatenate([self._cls, cls.astype(np.int32)])
+        self._ids = np.concatenate([self._ids, np.arange(self._next_id, self._next_id + count)])
+        self._missed = np.concatenate([self._missed, np.zeros(count, np.int32)])
+        self._steps = np.concatenate([self._steps, np.zeros(count, np.int32)])
+        self._next_id += count
+
+
+class DetectionScheduler:
+    def __init__(self, interval):
+        self._adaptive = interval == 0
+        self._interval = 1 if self._adaptive else max(1, interval)
+        self._since = self._interval
+        self._detected = 0
+        self._frames = 0
+
+    @property
+    def interval(self):
+        return self._interval
+
+    @property
+    def detected_ratio(self):
+        return self._detected / self._frames if self._frames else 0.0
+
+    def should_detect(self):
+        self._frames += 1
+        self._since += 1
+        if self._since < self._interval:
+            return False
+        self._since = 0
+        self._detected += 1
+        return True
+
+    def feedback(self, stability):
+        if not self._adaptive:
+            return
+        if stability >= 0.9:
+            self._interval = min(self._interval + 1, ADAPTIVE_MAX_INTERVAL)
+        elif stability < 0.6:
+            self._interval = max(1, self._interval // 2)
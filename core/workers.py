@@ -0,0 +1,203 @@
+import multiprocessing
+import os
+import queue
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from config import DEFAULT_BACKEND, WORKER_SLOTS_PER_WORKER, WORKER_START_TIMEOUT_S, WORKER_POLL_S
+from core.backends import resolve_model
+from core.preprocess import padded_size
+from core.results import Detections, empty_detections
+
+
+def _worker_main(slot_names, device, backend, inference_size, threads, tasks, results):
+    import torch
+    from core.processor import FrameProcessor
+
+    torch.set_num_threads(threads)
+    processor = FrameProcessor(device, inference_size=inference_size, backend=backend)
+    slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+    try:
+        try:
+            processor.load()
+        except Exception as e:
+            results.put(('error', repr(e)))
+            return
+        results.put(('ready', os.getpid()))
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            slot, index, shape, conf_threshold, inference_size = task
+            processor.conf_threshold = conf_threshold
+            processor.inference_size = inference_size
+            if processor.needs_load:
+                processor.load()
+            frame = np.ndarray(shape, np.uint8, buffer=slots[slot].buf)
+            try:
+                output, geometries = processor.infer([frame])
+                detections = processor.extract(output[0], geometries[0])
+            except Exception as e:
+                results.put((slot, index, None, repr(e)))
+            else:
+                results.put((slot, index, tuple(detections), None))
+            finally:
+                del frame
+    finally:
+        for shm in slots:
+            shm.close()
+
+
+class InferencePool:
+    def __init__(self, workers, device='cpu', backend=DEFAULT_BACKEND, threads=None, slots=None):
+        self._workers = max(1, int(workers))
+        self._device = device
+        self._backend = backend
+        self._threads = threads or max(1, (os.cpu_count() or 1) // self._workers)
+        self._slot_count = slots or self._workers * WORKER_SLOTS_PER_WORKER
+        self._slot_bytes = 0
+        self._shms = []
+        self._processes = []
+        self._tasks = None
+        self._results = None
+        self._free = queue.Queue()
+        self._done = {}
+        self._cond = threading.Condition()
+        self._next = 0
+        self._submitted = 0
+        self._closed = False
+        self._collector = None
+        self._errors = 0
+        self._last_error = None
+
+    @property
+    def workers(self):
+        return self._workers
+
+    @property
+    def threads(self):
+        return self._threads
+
+    @property
+    def in_flight(self):
+        return self._slot_count - self._free.qsize()
+
+    @property
+    def slot_bytes(self):
+        return self._slot_bytes
+
+    @property
+    def alive(self):
+        return all(process.is_alive() for process in self._processes)
+
+    @property
+    def errors(self):
+        return self._errors
+
+    @property
+    def last_error(self):
+        return self._last_error
+
+    def start(self, frame_nbytes, inference_size):
+        resolve_model(self._backend, padded_size(inference_size))
+        self._slot_bytes = frame_nbytes
+        self._shms = [shared_memory.SharedMemory(create=True, size=frame_nbytes) for _ in range(self._slot_count)]
+        for slot in range(self._slot_count):
+            self._free.put(slot)
+
+        context = multiprocessing.get_context('spawn')
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        names = [shm.name for shm in self._shms]
+        for _ in range(self._workers):
+            process = context.Process(target=_worker_main, daemon=True,
+                                      args=(names, self._device, self._backend, inference_size, self._threads, self._tasks, self._results))
+            process.start()
+            self._processes.append(process)
+
+        try:
+            for _ in range(self._workers):
+                message = self._results.get(timeout=WORKER_START_TIMEOUT_S)
+                if message[0] != 'ready':
+                    raise RuntimeError(f"Inference worker failed to start: {message[1]}")
+        except (RuntimeError, queue.Empty):
+            self.stop()
+            raise
+
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    def submit(self, index, frame, conf_threshold, inference_size):
+        if frame.nbytes > self._slot_bytes:
+            raise ValueError(f"Frame of {frame.nbytes} bytes exceeds the {self._slot_bytes}-byte shared slot")
+        while True:
+            try:
+                slot = self._free.get(timeout=WORKER_POLL_S)
+                break
+            except queue.Empty:
+                if not self.alive:
+                    raise RuntimeError("Inference worker exited unexpectedly")
+        np.ndarray(frame.shape, np.uint8, buffer=self._shms[slot].buf)[...] = frame
+        self._submitted += 1
+        self._tasks.put((slot, index, frame.shape, conf_threshold, inference_size))
+
+    def skip(self, index):
+        self._submitted += 1
+        self._store(index, None)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def results(self):
+        while True:
+            with self._cond:
+                while self._next not in self._done and not (self._closed and self._next >= self._submitted):
+                    if not self._cond.wait(WORKER_POLL_S) and not self.alive:
+                        return
+                if self._next not in self._done:
+                    return
+                detections = self._done.pop(self._next)
+                index = self._next
+                self._next += 1
+            yield index, detections
+
+    def _store(self, index, detections):
+        with self._cond:
+            self._done[index] = detections
+            self._cond.notify_all()
+
+    def _collect(self):
+        while True:
+            message = self._results.get()
+            if message is None:
+                break
+            slot, index, fields, error = message
+            self._free.put(slot)
+            if error is not None:
+                self._errors += 1
+                self._last_error = error
+                self._store(index, empty_detections())
+            else:
+                self._store(index, Detections(*fields))
+
+    def stop(self):
+        self.close()
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        if self._collector is not None:
+            self._results.put(None)
+            self._collector.join()
+            self._collector = None
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms = []
@@ -0,0 +1,3 @@
+from headless.runner import Task, TaskResult, build_tasks, run_tasks
+
+__all__ = ['Task', 'TaskResult', 'build_tasks', 'run_tasks']
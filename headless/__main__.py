@@ -0,0 +1,78 @@
+import argparse
+import os
+import time
+
+from config import (
+    BACKEND_LABELS,
+    DEFAULT_BACKEND,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONFIDENCE,
+    DEFAULT_INFERENCE_SIZE,
+    HEADLESS_CHUNK_FRAMES,
+    HEADLESS_OUTPUT_DIR,
+)
+from core.backends import calibration_dir, set_calibration_dir, unavailable_reason
+from headless.runner import build_tasks, run_tasks
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(prog="python -m headless", description="Run object detection over videos and image directories without the GUI.")
+    parser.add_argument("inputs", nargs="+", help="video files or directories of images")
+    parser.add_argument("-o", "--output", default=HEADLESS_OUTPUT_DIR, help="output directory")
+    parser.add_argument("-w", "--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="worker processes")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, choices=list(BACKEND_LABELS))
+    parser.add_argument("--conf", type=float, default=DEFAULT_CONFIDENCE)
+    parser.add_argument("--size", type=int, default=DEFAULT_INFERENCE_SIZE)
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--chunk-frames", type=int, default=HEADLESS_CHUNK_FRAMES, help="frames per video shard")
+    parser.add_argument("--calibration-dir", default=calibration_dir(),
+                        help="representative frames for the calibrated INT8 model")
+    args = parser.parse_args()
+    set_calibration_dir(args.calibration_dir)
+    reason = unavailable_reason(args.backend)
+    if reason:
+        parser.error(reason)
+    return args
+
+
+def _report_progress(result, done, total):
+    task = result.task
+    span = "" if task.kind == 'image' else f" [{task.start}:{task.start + result.frames}]"
+    print(f"[{done}/{total}] {task.path}{span} {result.frames} frames in {result.seconds:.1f}s")
+
+
+def _print_summary(results, wall_time, workers):
+    per_file = {}
+    for result in results:
+        frames, seconds = per_file.get(result.task.path, (0, 0.0))
+        per_file[result.task.path] = (frames + result.frames, seconds + result.seconds)
+
+    print()
+    print(f"{'input':<48} {'frames':>8} {'cpu s':>8} {'fps':>8}")
+    for path, (frames, seconds) in sorted(per_file.items()):
+        fps = frames / seconds if seconds > 0 else 0
+        print(f"{path[-48:]:<48} {frames:>8} {seconds:>8.1f} {fps:>8.1f}")
+
+    total_frames = sum(r.frames for r in results)
+    busy = sum(r.seconds for r in results)
+    print()
+    print(f"{total_frames} frames, {len(results)} tasks, {workers} workers, {wall_time:.1f}s wall")
+    print(f"throughput: {total_frames / wall_time if wall_time > 0 else 0:.1f} fps "
+          f"(per worker {total_frames / busy if busy > 0 else 0:.1f} fps)")
+
+
+def main():
+    args = _parse_args()
+    tasks = build_tasks(args.inputs, args.output, args.chunk_frames)
+    if not tasks:
+        print("Nothing to process.")
+        return
+
+    start = time.time()
+    results = run_tasks(tasks, args.workers, args.device, args.conf, args.size, args.batch, args.backend, _report_progress)
+    _print_summary(results, time.time() - start, args.workers)
+
+
+if __name__ == "__main__":
+    main()
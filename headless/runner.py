@@ -0,0 +1,224 @@
+import csv
+import multiprocessing
+import os
+import shutil
+import subprocess
+import time
+from collections import namedtuple
+
+import cv2
+
+from config import HEADLESS_VIDEO_NAME, IMAGE_SUFFIXES, VIDEO_SUFFIXES, VIDEO_FPS
+from core.backends import resolve_model
+from core.preprocess import padded_size
+from core.processor import FrameProcessor
+
+Task = namedtuple('Task', 'kind path start end output_dir')
+TaskResult = namedtuple('TaskResult', 'task frames seconds')
+
+_processor = None
+
+
+def _output_name(path, used):
+    stem = os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+    name = stem
+    suffix = 2
+    while name in used:
+        name = f"{stem}_{suffix}"
+        suffix += 1
+    used.add(name)
+    return name
+
+
+def build_tasks(inputs, output_dir, chunk_frames):
+    tasks = []
+    used = set()
+    for path in inputs:
+        target = os.path.join(output_dir, _output_name(path, used))
+
+        if os.path.isdir(path):
+            for entry in sorted(os.listdir(path)):
+                if entry.lower().endswith(IMAGE_SUFFIXES):
+                    tasks.append(Task('image', os.path.join(path, entry), 0, 1, target))
+        elif path.lower().endswith(VIDEO_SUFFIXES):
+            cap = cv2.VideoCapture(path)
+            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            cap.release()
+            if total <= 0:
+                tasks.append(Task('video', path, 0, None, target))
+                continue
+            for start in range(0, total, chunk_frames):
+                tasks.append(Task('video', path, start, min(start + chunk_frames, total), target))
+        else:
+            raise ValueError(f"Unsupported input: {path}")
+    return tasks
+
+
+def _init_worker(device, conf_threshold, inference_size, backend, threads):
+    global _processor
+    import torch
+
+    torch.set_num_threads(threads)
+    _processor = FrameProcessor(device, conf_threshold, inference_size, backend)
+    _processor.load()
+
+
+def _part_path(task, suffix):
+    if task.kind == 'image':
+        return os.path.join(task.output_dir, f"{os.path.basename(task.path)}{suffix}")
+    return os.path.join(task.output_dir, f"part_{task.start:08d}{suffix}")
+
+
+def _write_rows(writer, source, frame_index, detections):
+    names = _processor.names
+    for (x1, y1, x2, y2), conf, cls in zip(detections.xyxy.tolist(), detections.conf.tolist(), detections.cls.tolist()):
+        writer.writerow([source, frame_index, names[cls], f"{conf:.4f}", x1, y1, x2, y2])
+
+
+def _run_image(task):
+    frame = cv2.imread(task.path)
+    if frame is None:
+        return 0
+
+    results, geometries = _processor.infer([frame])
+    detections = _processor.extract(results[0], geometries[0])
+    _processor.draw(frame, detections)
+
+    cv2.imwrite(os.path.join(task.output_dir, os.path.basename(task.path)), frame)
+    with open(_part_path(task, '.csv'), 'w', newline='') as f:
+        _write_rows(csv.writer(f), os.path.basename(task.path), 0, detections)
+    return 1
+
+
+def _run_video(task, batch_size):
+    cap = cv2.VideoCapture(task.path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, task.start)
+    fps = cap.get(cv2.CAP_PROP_FPS) or VIDEO_FPS
+    source = os.path.basename(task.path)
+
+    writer = None
+    frame_index = task.start
+    with open(_part_path(task, '.csv'), 'w', newline='') as f:
+        rows = csv.writer(f)
+        while task.end is None or frame_index < task.end:
+            frames = []
+            while len(frames) < batch_size and (task.end is None or frame_index + len(frames) < task.end):
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                frames.append(frame)
+            if not frames:
+                break
+
+            for frame, result, geometry in zip(frames, *_processor.infer(frames)):
+                detections = _processor.extract(result, geometry)
+                _processor.draw(frame, detections)
+                _write_rows(rows, source, frame_index, detections)
+
+                if writer is None:
+                    fourcc = cv2.VideoWriter_fourcc(*'XVID')
+                    writer = cv2.VideoWriter(_part_path(task, '.avi'), fourcc, fps, (frame.shape[1], frame.shape[0]))
+                writer.write(frame)
+                frame_index += 1
+
+    cap.release()
+    if writer:
+        writer.release()
+    return frame_index - task.start
+
+
+def _run_task(args):
+    task, batch_size = args
+    os.makedirs(task.output_dir, exist_ok=True)
+    start = time.time()
+    frames = _run_image(task) if task.kind == 'image' else _run_video(task, batch_size)
+    return TaskResult(task, frames, time.time() - start)
+
+
+def _merge_detections(output_dir, tasks):
+    with open(os.path.join(output_dir, 'detections.csv'), 'w', newline='') as out:
+        csv.writer(out).writerow(['source', 'frame', 'label', 'confidence', 'x1', 'y1', 'x2', 'y2'])
+        for task in tasks:
+            part = _part_path(task, '.csv')
+            if not os.path.exists(part):
+                continue
+            with open(part, newline='') as f:
+                out.write(f.read())
+            os.remove(part)
+
+
+def _concat_video(parts, target):
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        return False
+    listing = f"{target}.txt"
+    with open(listing, 'w') as f:
+        for part in parts:
+            escaped = os.path.abspath(part).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    try:
+        command = [ffmpeg, '-v', 'error', '-y', '-f', 'concat', '-safe', '0', '-i', listing, '-c', 'copy', target]
+        return subprocess.run(command, capture_output=True).returncode == 0
+    finally:
+        os.remove(listing)
+
+
+def _reencode_video(parts, target):
+    writer = None
+    for part in parts:
+        cap = cv2.VideoCapture(part)
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if writer is None:
+                fourcc = cv2.VideoWriter_fourcc(*'XVID')
+                fps = cap.get(cv2.CAP_PROP_FPS) or VIDEO_FPS
+                writer = cv2.VideoWriter(target, fourcc, fps, (frame.shape[1], frame.shape[0]))
+            writer.write(frame)
+        cap.release()
+    if writer:
+        writer.release()
+
+
+def _merge_video(output_dir, tasks):
+    parts = [path for path in (_part_path(task, '.avi') for task in tasks) if os.path.exists(path)]
+    if not parts:
+        return
+    target = os.path.join(output_dir, HEADLESS_VIDEO_NAME)
+    if len(parts) == 1:
+        os.replace(parts[0], target)
+        return
+    if not _concat_video(parts, target):
+        _reencode_video(parts, target)
+    for part in parts:
+        os.remove(part)
+
+
+def _merge_outputs(results):
+    groups = {}
+    for result in results:
+        groups.setdefault(result.task.output_dir, []).append(result.task)
+
+    for output_dir, tasks in groups.items():
+        tasks.sort(key=lambda t: (t.path, t.start))
+        _merge_detections(output_dir, tasks)
+        if tasks[0].kind == 'video':
+            _merge_video(output_dir, tasks)
+
+
+def run_tasks(tasks, workers, device, conf_threshold, inference_size, batch_size, backend, progress=None):
+    resolve_model(backend, padded_size(inference_size))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    context = multiprocessing.get_context('spawn')
+    results = []
+
+    with context.Pool(workers, initializer=_init_worker,
+                      initargs=(device, conf_threshold, inference_size, backend, threads)) as pool:
+        for result in pool.imap_unordered(_run_task, [(task, batch_size) for task in tasks]):
+            results.append(result)
+            if progress:
+                progress(result, len(results), len(tasks))
+
+    _merge_outputs(results)
+    return results
@@ -1,8 +1,11 @@
+import time
+
+STARTUP_ORIGIN = time.perf_counter()
+
+import logging
 import sys
 import cv2
-import time
-import torch
-from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout, QFileDialog
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout, QFileDialog, QInputDialog, QStackedWidget
 from PyQt5.QtCore import Qt, QTimer
 
 from config import (
@@ -14,26 +17,45 @@ from config import (
     VIDEO_EXTENSIONS,
     SCREENSHOT_PREFIX,
     UI_UPDATE_INTERVAL_MS,
+    GUI_LOAD_WINDOW_S,
     LOADING_ANIMATION_INTERVAL_MS,
+    METRICS_HOST,
+    METRICS_PORT,
 )
 from config.styles import DARK_THEME_STYLESHEET
-from core import DetectionEngine
-from ui import VideoDisplay, StatsPanel, ControlPanel, DetectionList, CollapsibleWidget
+from core import DetectionEngine, MultiStreamEngine, ModelPreloader, StartupTimer
+from core.grabber import is_stream_url
+from core.metrics import MetricsServer
+from ui import VideoDisplay, VideoGrid, PlaybackBar, StatsPanel, ControlPanel, DetectionList, CollapsibleWidget
+
+logger = logging.getLogger(__name__)
 
 
 class App(QWidget):
-    def __init__(self):
+    def __init__(self, startup_timer=None):
         super().__init__()
+        self._startup_timer = startup_timer or StartupTimer()
+        self._preloader = None
+        self._metrics_server = None
         self.setWindowTitle("AI Vision Studio")
         self.resize(DEFAULT_WINDOW_WIDTH, DEFAULT_WINDOW_HEIGHT)
-        self._latest_frame = None
+        self._frame_pending = False
+        self._pending_counter = None
+        self._gui_busy = 0.0
+        self._gui_window = time.perf_counter()
+        self._gui_ms_per_s = 0.0
         self._total_detections = 0
         self._current_fps = 0
+        self._multi_sources = []
+        self._stream_frames = set()
+        self._stream_counters = {}
+        self._stream_fps = {}
 
         self._setup_stylesheet()
         self._setup_ui()
         self._setup_connections()
         self._start_timers()
+        self._start_metrics_server()
 
     def _setup_stylesheet(self):
         self.setStyleSheet(DARK_THEME_STYLESHEET)
@@ -50,6 +72,7 @@ class App(QWidget):
         main_layout.addWidget(side_panel)
 
         self._detection_engine = DetectionEngine()
+        self._multi_engine = MultiStreamEngine(self._detection_engine.processor)
 
     def _create_video_section(self):
         container = QWidget()
@@ -59,8 +82,16 @@ class App(QWidget):
         header = self._create_header()
         layout.addLayout(header)
 
+        self._video_stack = QStackedWidget()
         self._video_display = VideoDisplay()
-        layout.addWidget(self._video_display)
+        self._video_grid = VideoGrid()
+        self._video_stack.addWidget(self._video_display)
+        self._video_stack.addWidget(self._video_grid)
+        layout.addWidget(self._video_stack)
+
+        self._playback_bar = PlaybackBar()
+        self._playback_bar.setVisible(False)
+        layout.addWidget(self._playback_bar)
 
         self._loading_label = QLabel("")
         self._loading_label.setObjectName("loadingLabel")
@@ -136,14 +167,60 @@ class App(QWidget):
 
         cp.conf_slider.valueChanged.connect(lambda v: self._update_conf_value(v))
         cp.size_slider.valueChanged.connect(lambda v: self._update_size_value(v))
+        cp.size_slider.sliderReleased.connect(self._apply_size)
+        cp.quality_combo.currentIndexChanged.connect(self._on_quality_changed)
+        cp.pacing_combo.currentIndexChanged.connect(self._on_pacing_changed)
 
         cp.source_combo.currentIndexChanged.connect(self._on_source_changed)
-        cp.device_combo.currentTextChanged.connect(self._on_device_changed)
+        cp.device_combo.currentIndexChanged.connect(self._on_device_changed)
+        cp.interp_combo.currentTextChanged.connect(self._on_interpolation_changed)
 
         self._detection_engine.frame_ready.connect(self._on_new_frame)
+        self._video_display.size_changed.connect(self._detection_engine.set_display_size)
         self._detection_engine.counter_updated.connect(self._update_counter)
         self._detection_engine.loading_status.connect(self._handle_loading)
         self._detection_engine.fps_updated.connect(self._update_fps)
+        self._detection_engine.metrics_updated.connect(self._update_metrics)
+        self._detection_engine.histograms_updated.connect(self._stats_panel.update_latency)
+        self._detection_engine.quality_changed.connect(self._on_quality_decision)
+        self._detection_engine.status_message.connect(self._show_status)
+        self._detection_engine.recording_changed.connect(self._on_recording_changed)
+
+        self._playback_bar.seek_requested.connect(self._detection_engine.seek)
+        self._playback_bar.step_requested.connect(self._detection_engine.step)
+        self._playback_bar.pause_toggled.connect(self._detection_engine.set_paused)
+
+        self._multi_engine.frame_ready.connect(self._on_stream_frame)
+        self._video_grid.size_changed.connect(self._multi_engine.set_display_size)
+        self._multi_engine.counter_updated.connect(self._update_stream_counter)
+        self._multi_engine.loading_status.connect(self._handle_loading)
+        self._multi_engine.fps_updated.connect(self._update_stream_fps)
+
+    def _start_metrics_server(self):
+        metrics = self._detection_engine.metrics
+        if METRICS_PORT is None or metrics is None:
+            return
+        self._metrics_server = MetricsServer(metrics, METRICS_HOST, METRICS_PORT)
+        try:
+            self._metrics_server.start()
+        except OSError as e:
+            self._metrics_server = None
+            self._show_status(f"Metrics endpoint unavailable: {e}")
+
+    def preload(self):
+        self._preloader = ModelPreloader(self._detection_engine.processor, self._startup_timer)
+        self._preloader.loading_status.connect(self._handle_loading)
+        self._preloader.cuda_checked.connect(self._on_cuda_checked)
+        self._preloader.timings_ready.connect(self._on_startup_timings)
+        self._preloader.status_message.connect(self._show_status)
+        self._preloader.start()
+
+    def _on_cuda_checked(self, available):
+        if available:
+            self._control_panel.add_cuda_devices()
+
+    def _on_startup_timings(self, report):
+        self._loading_label.setToolTip(report)
 
     def _start_timers(self):
         self._loading_timer = QTimer()
@@ -168,6 +245,10 @@ class App(QWidget):
             self._loading_label.setText("Ready ✓")
             self._control_panel.start_btn.setEnabled(True)
 
+    def _show_status(self, message):
+        logger.warning(message)
+        self._loading_label.setText(message)
+
     def _on_source_changed(self, index):
         if index == 1:
             choice = QFileDialog.getOpenFileName(self, "Select Video", "", VIDEO_EXTENSIONS)[0]
@@ -176,74 +257,254 @@ class App(QWidget):
                 self._control_panel.source_combo.setCurrentText("Video File")
             else:
                 self._control_panel.source_combo.setCurrentIndex(0)
+        elif index == 2:
+            text, ok = QInputDialog.getText(self, "Multiple Streams", "Sources (comma separated camera indexes, video paths or URLs):")
+            sources = [item.strip() for item in text.split(",") if item.strip()] if ok else []
+            if sources:
+                self._multi_sources = [int(item) if item.isdigit() else item for item in sources]
+            else:
+                self._control_panel.source_combo.setCurrentIndex(0)
+        elif index == 3:
+            text, ok = QInputDialog.getText(self, "Network Stream", "Stream URL (rtsp://, http://, ...):")
+            if ok and is_stream_url(text.strip()):
+                self._detection_engine.source = text.strip()
+            else:
+                self._control_panel.source_combo.setCurrentIndex(0)
 
-    def _on_device_changed(self, text):
-        device = "cuda" if text == "GPU" else "cpu"
+    def _on_device_changed(self, index):
+        device, backend = self._control_panel.device_combo.itemData(index)
+        self._detection_engine.processor.backend = backend
         self._detection_engine.set_device(device)
 
+    def _on_interpolation_changed(self, text):
+        self._detection_engine.processor.interpolation = text.lower()
+
     def _start_detection(self):
+        if self._control_panel.source_combo.currentIndex() == 2:
+            self._start_multi_detection()
+            return
+
+        self._video_stack.setCurrentWidget(self._video_display)
         source = 0 if self._control_panel.source_combo.currentIndex() == 0 else self._detection_engine.source
         self._detection_engine.source = source
         self._detection_engine.conf_threshold = self._control_panel.conf_slider.value() / 100
         self._detection_engine.inference_size = self._control_panel.size_slider.value()
+        self._detection_engine.detect_interval = self._control_panel.interval_combo.currentData()
+        self._detection_engine.motion_gating = self._control_panel.motion_check.isChecked()
+        self._detection_engine.tiling = self._control_panel.tiling_check.isChecked()
+        self._detection_engine.workers = self._control_panel.workers_combo.currentData()
+        self._detection_engine.result_caching = self._control_panel.cache_check.isChecked()
+        self._detection_engine.pacing = self._control_panel.pacing_combo.currentData()
+        self._detection_engine.detection_logging = self._control_panel.log_check.isChecked()
+        self._detection_engine.set_quality_target(*(self._control_panel.quality_combo.currentData() or (None, None)))
+        self._control_panel.quality_value.setText("")
+        self._playback_bar.set_paused(False)
+        self._detection_list.update_items({})
         self._detection_engine.running = True
         self._detection_engine.start()
         self._total_detections = 0
 
+    def _start_multi_detection(self):
+        self._stream_frames = set()
+        self._stream_counters = {}
+        self._stream_fps = {}
+        self._video_grid.set_count(len(self._multi_sources))
+        self._video_stack.setCurrentWidget(self._video_grid)
+
+        self._multi_engine.sources = self._multi_sources
+        self._multi_engine.processor.conf_threshold = self._control_panel.conf_slider.value() / 100
+        self._multi_engine.processor.inference_size = self._control_panel.size_slider.value()
+        self._detection_list.update_items({})
+        self._multi_engine.running = True
+        self._multi_engine.start()
+        self._total_detections = 0
+
     def _stop_detection(self):
         self._detection_engine.stop()
-        self._latest_frame = None
+        self._multi_engine.stop()
+        self._playback_bar.setVisible(False)
+        self._frame_pending = False
+        self._pending_counter = None
+        self._stream_frames = set()
         self._loading_label.setText("")
 
-    def _on_new_frame(self, frame):
-        self._latest_frame = frame.copy()
+    def _on_new_frame(self, slot, seq):
+        self._frame_pending = True
+        if "first_detection" not in self._startup_timer.marks:
+            self._startup_timer.mark("first_detection")
+            self._loading_label.setToolTip(self._startup_timer.report())
+
+    def _on_stream_frame(self, index, slot, seq):
+        self._stream_frames.add(index)
 
     def _update_display(self):
-        if self._latest_frame is not None:
-            self._video_display.update_frame(self._latest_frame)
+        tick = time.perf_counter()
+        if self._frame_pending:
+            self._frame_pending = False
+            ring = self._detection_engine.frame_ring
+            acquired = ring.acquire()
+            if acquired is not None:
+                _, seq, image, stamp = acquired
+                start = time.perf_counter()
+                self._video_display.update_frame(image, seq)
+                ring.release()
+                metrics = self._detection_engine.metrics
+                if metrics is not None:
+                    now = time.perf_counter()
+                    metrics.observe('display', (now - start) * 1000)
+                    if stamp:
+                        metrics.observe('capture_to_display', (now - stamp) * 1000)
+        for index in self._stream_frames:
+            ring = self._multi_engine.frame_ring(index)
+            acquired = ring.acquire() if ring is not None else None
+            if acquired is not None:
+                _, seq, image, _ = acquired
+                self._video_grid.update_frame(index, image, seq)
+                ring.release()
+        self._stream_frames = set()
+        self._apply_counter()
+        self._update_playback()
+        self._account_gui(tick)
+
+    def _account_gui(self, start):
+        now = time.perf_counter()
+        self._gui_busy += now - start
+        elapsed = now - self._gui_window
+        if elapsed < GUI_LOAD_WINDOW_S:
+            return
+        self._gui_ms_per_s = self._gui_busy * 1000 / elapsed
+        self._gui_busy = 0.0
+        self._gui_window = now
+        metrics = self._detection_engine.metrics
+        if metrics is not None:
+            metrics.set_gauge('gui_ms_per_s', round(self._gui_ms_per_s, 2))
+
+    def _update_playback(self):
+        playback = self._detection_engine.playback
+        if playback is None:
+            if self._playback_bar.isVisible() and not self._detection_engine.isRunning():
+                self._playback_bar.setVisible(False)
+            return
+        video_index = playback.index
+        self._playback_bar.set_range(playback.frame_count, video_index.duration)
+        self._playback_bar.set_position(playback.position, video_index.timestamp(playback.position))
+        self._playback_bar.setVisible(True)
 
     def _update_counter(self, counter):
+        start = time.perf_counter()
+        self._pending_counter = counter
+        self._total_detections = self._detection_engine.detections_total
+        self._account_gui(start)
+
+    def _update_stream_counter(self, index, counter):
+        start = time.perf_counter()
+        self._stream_counters[index] = counter
+        self._pending_counter = self._stream_counters
+        self._total_detections = self._multi_engine.detections_total
+        self._account_gui(start)
+
+    def _apply_counter(self):
+        counter = self._pending_counter
+        if counter is None:
+            return
+        self._pending_counter = None
+        if counter is self._stream_counters:
+            merged = {}
+            for stream_counter in counter.values():
+                for label, count in stream_counter.items():
+                    merged[label] = merged.get(label, 0) + count
+            counter = merged
         self._detection_list.update_items(counter)
-        total = sum(counter.values())
-        self._total_detections += total
-        self._stats_panel.update_stats(self._current_fps, total, self._total_detections)
+        self._stats_panel.update_stats(self._current_fps, sum(counter.values()), self._total_detections)
+
+    def _update_stream_fps(self, index, fps):
+        self._stream_fps[index] = fps
+        self._video_grid.set_fps(index, fps)
+        self._update_fps(sum(self._stream_fps.values()))
 
     def _update_fps(self, fps):
         self._current_fps = fps
         self._fps_label.setText(f"FPS: {fps:.1f}")
 
+    def _update_metrics(self, metrics):
+        metrics = dict(metrics, gui_display_ms=round(self._video_display.paint_ms, 2),
+                       gui_ms_per_s=round(self._gui_ms_per_s, 2))
+        if 'speed_x' in metrics:
+            self._fps_label.setText(f"FPS: {self._current_fps:.1f} · {metrics['speed_x']:.2f}×")
+        self._fps_label.setToolTip("\n".join(f"{key}: {value}" for key, value in metrics.items()))
+
     def _save_screenshot(self):
-        if self._latest_frame is not None:
+        frame = self._detection_engine.snapshot()
+        if frame is not None:
             filename = f"{SCREENSHOT_PREFIX}{int(time.time())}.png"
-            cv2.imwrite(filename, self._latest_frame)
+            cv2.imwrite(filename, frame)
             self._loading_label.setText(f"Saved: {filename}")
 
     def _toggle_record(self):
-        cp = self._control_panel
-        if not self._detection_engine.recording:
-            if self._latest_frame is not None:
-                self._detection_engine.start_recording(self._latest_frame.shape)
-                cp.record_btn.setText("⏹  Stop Recording")
-                self._loading_label.setText("Recording...")
+        engine = self._detection_engine
+        if not engine.recording:
+            if engine.isRunning() and engine.has_frame:
+                engine.start_recording(self._control_panel.raw_record_check.isChecked())
         else:
-            self._detection_engine.stop_recording()
-            cp.record_btn.setText("⏺  Record")
+            engine.stop_recording()
+
+    def _on_recording_changed(self, recording):
+        if recording:
+            self._control_panel.record_btn.setText("⏹  Stop Recording")
+            self._loading_label.setText("Recording...")
+        else:
+            self._control_panel.record_btn.setText("⏺  Record")
             self._loading_label.setText("Recording saved!")
 
     def _update_conf_value(self, value):
         self._control_panel.conf_value.setText(f"{value}%")
+        self._detection_engine.conf_threshold = value / 100
 
     def _update_size_value(self, value):
         self._control_panel.size_value.setText(f"{value}px")
+        if not self._control_panel.size_slider.isSliderDown():
+            self._apply_size()
+
+    def _apply_size(self):
+        if self._detection_engine.running:
+            self._detection_engine.inference_size = self._control_panel.size_slider.value()
+
+    def _on_quality_changed(self, index):
+        target = self._control_panel.quality_combo.itemData(index)
+        self._detection_engine.set_quality_target(*(target or (None, None)))
+        self._control_panel.quality_value.setText("")
+
+    def _on_pacing_changed(self, index):
+        self._detection_engine.pacing = self._control_panel.pacing_combo.itemData(index)
+
+    def _on_quality_decision(self, decision):
+        cp = self._control_panel
+        cp.size_slider.blockSignals(True)
+        cp.size_slider.setValue(decision['size'])
+        cp.size_slider.blockSignals(False)
+        cp.size_value.setText(f"{decision['size']}px (auto)")
+        skip = f", skipping {decision['skip']}/{decision['skip'] + 1} frames" if decision['skip'] else ""
+        cp.quality_value.setText(f"{decision['reason']}: {decision['size']}px{skip} "
+                                 f"({decision['fps']} fps, {decision['latency_ms']} ms)")
 
     def closeEvent(self, event):
         self._ui_timer.stop()
+        if self._preloader:
+            self._preloader.wait()
         self._detection_engine.stop()
+        self._multi_engine.stop()
+        if self._metrics_server:
+            self._metrics_server.stop()
         event.accept()
 
 
 if __name__ == "__main__":
+    startup_timer = StartupTimer(STARTUP_ORIGIN)
     app = QApplication(sys.argv)
-    window = App()
+    startup_timer.mark("qt_ready")
+    window = App(startup_timer)
     window.show()
+    app.processEvents()
+    startup_timer.mark("window_shown")
+    window.preload()
     sys.exit(app.exec())
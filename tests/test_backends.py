@@ -0,0 +1,28 @@
+from config import BACKEND_INT8_STATIC, CALIBRATION_DIR_ENV
+import core.backends as backends
+
+
+def test_calibration_dir_follows_environment(tmp_path, monkeypatch):
+    monkeypatch.delenv(CALIBRATION_DIR_ENV, raising=False)
+    assert backends.calibration_dir() == backends.CALIBRATION_DIR
+    backends.set_calibration_dir(str(tmp_path))
+    assert backends.calibration_dir() == str(tmp_path)
+
+
+def test_calibration_hash_changes_with_folder_contents(tmp_path, monkeypatch):
+    monkeypatch.setenv(CALIBRATION_DIR_ENV, str(tmp_path))
+    empty = backends.calibration_hash()
+    (tmp_path / 'frame.jpg').write_bytes(b'x')
+    (tmp_path / 'notes.txt').write_bytes(b'x')
+    assert backends.calibration_images() == [str(tmp_path / 'frame.jpg')]
+    assert backends.calibration_hash() != empty
+
+
+def test_empty_calibration_folder_is_reported(tmp_path, monkeypatch):
+    monkeypatch.setenv(CALIBRATION_DIR_ENV, str(tmp_path))
+    monkeypatch.setattr(backends, 'missing_modules', lambda backend: [])
+    reason = backends.unavailable_reason(BACKEND_INT8_STATIC)
+    assert str(tmp_path) in reason and CALIBRATION_DIR_ENV in reason
+    assert BACKEND_INT8_STATIC not in backends.available_backends()
+    (tmp_path / 'frame.png').write_bytes(b'x')
+    assert backends.unavailable_reason(BACKEND_INT8_STATIC) is None
@@ -0,0 +1,80 @@
+import os
+import time
+
+import numpy as np
+
+from core.detection_log import DetectionLog, DetectionLogReader
+from core.results import Detections
+
+
+def _detections(classes, conf=0.5):
+    count = len(classes)
+    xyxy = np.tile(np.arange(4, dtype=np.int32), (count, 1))
+    return Detections(xyxy, np.full(count, conf, np.float32), np.asarray(classes, np.int32))
+
+
+def _chunk_dirs(path):
+    return sorted(entry for entry in os.listdir(path) if entry.startswith('chunk_'))
+
+
+def test_flushes_append_into_the_open_chunk(tmp_path):
+    log = DetectionLog(str(tmp_path), names={0: 'person', 1: 'car'}, chunk_rows=100, flush_interval=3600)
+    for frame in range(5):
+        log.append(float(frame), frame, 0, _detections([0, 1]))
+        log.flush()
+    assert _chunk_dirs(str(tmp_path)) == ['chunk_000000']
+
+    reader = DetectionLogReader(str(tmp_path))
+    assert reader.count() == 10
+    log.close()
+    assert len(np.load(os.path.join(str(tmp_path), 'chunk_000000', 'ts.npy'))) == 10
+
+
+def test_rows_roll_over_into_new_chunks(tmp_path):
+    log = DetectionLog(str(tmp_path), chunk_rows=4, flush_interval=3600)
+    for frame in range(5):
+        log.append(float(frame), frame, 'cam', _detections([frame % 2, 2]))
+    log.close()
+
+    assert len(_chunk_dirs(str(tmp_path))) == 3
+    reader = DetectionLogReader(str(tmp_path))
+    assert reader.time_range == (0.0, 4.0)
+    result = reader.query()
+    assert result['frame'].tolist() == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+    assert result['xyxy'].shape == (10, 4)
+
+
+def test_query_filters_by_time_class_and_source(tmp_path):
+    log = DetectionLog(str(tmp_path), names={0: 'person', 1: 'car'}, chunk_rows=3, flush_interval=3600)
+    for frame in range(6):
+        log.append(float(frame), frame, frame % 2, _detections([0, 1]))
+    log.close()
+
+    reader = DetectionLogReader(str(tmp_path))
+    assert reader.count_by_class() == {'person': 6, 'car': 6}
+    assert reader.count_by_class(start=2.0, end=4.0) == {'person': 2, 'car': 2}
+    assert reader.count(classes=['car'], sources=[1]) == 3
+    assert reader.query(start=5.0)['frame'].tolist() == [5, 5]
+
+
+def test_reopen_continues_in_a_new_chunk(tmp_path):
+    log = DetectionLog(str(tmp_path), chunk_rows=10, flush_interval=3600)
+    log.append(0.0, 0, 0, _detections([0]))
+    log.close()
+    log = DetectionLog(str(tmp_path), chunk_rows=10, flush_interval=3600)
+    log.append(1.0, 1, 0, _detections([0, 0]))
+    log.close()
+
+    assert len(_chunk_dirs(str(tmp_path))) == 2
+    assert DetectionLogReader(str(tmp_path)).count() == 3
+
+
+def test_background_writer_flushes_on_interval(tmp_path):
+    log = DetectionLog(str(tmp_path), chunk_rows=10, flush_interval=0.01)
+    log.append(0.0, 0, 0, _detections([0]))
+    for _ in range(200):
+        if DetectionLogReader(str(tmp_path)).count():
+            break
+        time.sleep(0.01)
+    log.close()
+    assert DetectionLogReader(str(tmp_path)).count() == 1
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from core.framering import FrameRing
+
+
+def _frame(value, shape=(4, 6, 3)):
+    return np.full(shape, value, np.uint8)
+
+
+def test_first_write_notifies_and_later_writes_coalesce():
+    ring = FrameRing()
+    assert ring.write(_frame(1), 1) is not None
+    assert ring.write(_frame(2), 2) is None
+    assert ring.overwritten == 1
+
+    slot, seq, buffer, stamp = ring.acquire()
+    assert seq == 2
+    assert buffer[0, 0, 0] == 2
+    ring.release()
+    assert ring.write(_frame(3), 3) is not None
+
+
+def test_reader_slot_is_not_overwritten():
+    ring = FrameRing()
+    ring.write(_frame(1), 1)
+    slot, _, buffer, _ = ring.acquire()
+    for value in range(2, 8):
+        ring.write(_frame(value), value)
+    assert buffer[0, 0, 0] == 1
+    ring.release()
+    assert ring.acquire()[1] == 7
+
+
+def test_stamp_is_returned():
+    ring = FrameRing()
+    ring.write(_frame(1), 1, 12.5)
+    assert ring.acquire()[3] == 12.5
+
+
+def test_reset_after_stop_before_acquire_notifies_again():
+    ring = FrameRing()
+    assert ring.write(_frame(1), 1) is not None
+    assert ring.write(_frame(2), 2) is None
+
+    ring.reset()
+    assert ring.acquire() is None
+    assert ring.write(_frame(3), 1) is not None
+    assert ring.acquire()[1] == 1
+
+
+def test_shape_change_reallocates():
+    ring = FrameRing()
+    ring.write(_frame(1), 1)
+    ring.acquire()
+    ring.release()
+    ring.write(_frame(2, (8, 8, 3)), 2)
+    _, seq, buffer, _ = ring.acquire()
+    assert seq == 2
+    assert buffer.shape == (8, 8, 3)
+
+
+def test_target_resizes_into_slot():
+    ring = FrameRing()
+    ring.target = (3, 10)
+    ring.write(_frame(5), 1)
+    assert ring.acquire()[2].shape == (2, 3, 3)
+
+
+def test_needs_three_slots():
+    with pytest.raises(ValueError):
+        FrameRing(2)
@@ -0,0 +1,43 @@
+import cv2
+import numpy as np
+
+from config import HEADLESS_VIDEO_NAME
+from headless.runner import Task, _merge_video, _output_name, _part_path
+
+
+def _write_part(task, frames):
+    writer = cv2.VideoWriter(_part_path(task, '.avi'), cv2.VideoWriter_fourcc(*'XVID'), 10, (64, 48))
+    for value in range(frames):
+        writer.write(np.full((48, 64, 3), value * 20, np.uint8))
+    writer.release()
+
+
+def _frame_count(path):
+    cap = cv2.VideoCapture(path)
+    count = 0
+    while cap.grab():
+        count += 1
+    cap.release()
+    return count
+
+
+def test_output_names_are_unique():
+    used = set()
+    names = [_output_name(path, used) for path in ('a/clip.mp4', 'b/clip.mp4', 'clip.avi', 'frames/')]
+    assert names == ['clip', 'clip_2', 'clip_3', 'frames']
+
+
+def test_merge_video_joins_shards_in_order(tmp_path):
+    tasks = [Task('video', 'clip.mp4', start, start + 5, str(tmp_path)) for start in (0, 5, 10)]
+    for task in tasks:
+        _write_part(task, 5)
+    _merge_video(str(tmp_path), tasks)
+    assert _frame_count(str(tmp_path / HEADLESS_VIDEO_NAME)) == 15
+    assert sorted(p.name for p in tmp_path.iterdir()) == [HEADLESS_VIDEO_NAME]
+
+
+def test_single_shard_is_moved(tmp_path):
+    task = Task('video', 'clip.mp4', 0, 5, str(tmp_path))
+    _write_part(task, 5)
+    _merge_video(str(tmp_path), [task])
+    assert _frame_count(str(tmp_path / HEADLESS_VIDEO_NAME)) == 5
@@ -0,0 +1,38 @@
+from core.metrics import LatencyHistogram, PipelineMetrics
+
+
+def test_quantiles_interpolate_within_buckets():
+    histogram = LatencyHistogram((10, 20, 40))
+    for ms in (5, 15, 15, 30):
+        histogram.observe(ms)
+    assert histogram.count == 4
+    assert histogram.quantile(0.5) == 15.0
+    assert histogram.quantile(0.25) == 10.0
+    assert histogram.cumulative() == [(10, 1), (20, 3), (40, 4)]
+
+
+def test_overflow_bucket_reports_last_bound():
+    histogram = LatencyHistogram((10, 20))
+    histogram.observe(500)
+    assert histogram.quantile(0.99) == 20
+
+
+def test_empty_summary():
+    summary = LatencyHistogram((10,)).summary()
+    assert summary == {'p50': None, 'p95': None, 'p99': None, 'count': 0, 'mean': None}
+
+
+def test_pipeline_metrics_snapshot_and_prometheus():
+    metrics = PipelineMetrics()
+    metrics.observe('inference', 12.0)
+    metrics.increment('inferred_crops', 3)
+    metrics.set_gauge('fps', 24.5)
+    snapshot = metrics.snapshot()
+    assert snapshot['stages']['inference']['count'] == 1
+    assert snapshot['counters'] == {'inferred_crops': 3}
+    text = metrics.prometheus()
+    assert 'vision_stage_latency_ms_count{stage="inference"} 1' in text
+    assert 'vision_inferred_crops_total 3' in text
+    assert 'vision_fps 24.5' in text
+    metrics.reset()
+    assert metrics.snapshot() == {'stages': {}, 'counters': {}, 'gauges': {}}
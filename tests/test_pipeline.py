@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+from config import DROP_POLICY_BLOCK, DROP_POLICY_LATEST
+from core.pipeline import FrameQueue
+
+
+def test_latest_policy_drops_oldest():
+    queue = FrameQueue(2, DROP_POLICY_LATEST)
+    for item in range(5):
+        assert queue.put(item)
+    assert queue.dropped == 3
+    assert [queue.get(), queue.get()] == [3, 4]
+
+
+def test_block_policy_waits_for_room():
+    queue = FrameQueue(1, DROP_POLICY_BLOCK)
+    queue.put(1)
+    done = threading.Event()
+    producer = threading.Thread(target=lambda: (queue.put(2), done.set()))
+    producer.start()
+    assert not done.wait(0.05)
+    assert queue.get() == 1
+    assert done.wait(1)
+    assert queue.get() == 2
+    producer.join()
+
+
+def test_close_drains_then_returns_none():
+    queue = FrameQueue(4)
+    queue.put(1)
+    queue.close()
+    assert not queue.put(2)
+    assert queue.get() == 1
+    assert queue.get() is None
+
+
+def test_get_nowait():
+    queue = FrameQueue(4)
+    assert queue.get_nowait() is None
+    queue.put(1)
+    assert queue.get_nowait() == 1
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        FrameQueue(1, "newest")
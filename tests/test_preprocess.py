@@ -0,0 +1,25 @@
+from core.preprocess import canvas_shape, fit_ratio, padded_size
+
+
+def _pixels(shapes, size, max_ratios=None):
+    height, width = canvas_shape(shapes, size, True, max_ratios)
+    return len(shapes) * height * width
+
+
+def test_rect_canvas_keeps_aspect():
+    assert canvas_shape([(720, 1280)], 640) == (384, 640)
+    assert canvas_shape([(720, 1280)], 640, rect=False) == (640, 640)
+
+
+def test_gated_crops_use_fewer_pixels_than_full_frame():
+    h, w = 720, 1280
+    full = _pixels([(h, w)], 640)
+    crops = [(320, 320), (400, 480)] * 2
+    ratio = padded_size(640) / max(h, w)
+    assert _pixels(crops, 640, [ratio] * len(crops)) < full
+    assert _pixels(crops, 640) > full
+
+
+def test_fit_ratio_caps_upscaling():
+    assert fit_ratio(320, 320, 640) == 2.0
+    assert fit_ratio(320, 320, 640, 0.5) == 0.5
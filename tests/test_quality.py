@@ -0,0 +1,53 @@
+from config import QUALITY_TARGET_FPS, QUALITY_TARGET_LATENCY
+from core.quality import QualityController
+
+
+def _controller(**kwargs):
+    options = dict(min_size=320, max_size=1280, step=64, max_skip=2, hysteresis=0.15, cooldown=0)
+    options.update(kwargs)
+    return QualityController(QUALITY_TARGET_FPS, 30, 640, **options)
+
+
+def test_over_budget_shrinks_then_skips():
+    quality = _controller(resizable=False)
+    decision = quality.update(15, 60)
+    assert decision['skip'] == 1 and decision['size'] == 640
+    quality = _controller()
+    assert quality.update(15, 60)['size'] == 576
+
+
+def test_within_hysteresis_holds():
+    quality = _controller()
+    assert quality.update(28, 30) is None
+    assert quality.update(33, 30) is None
+
+
+def test_headroom_removes_skip_before_growing():
+    quality = _controller(resizable=False)
+    quality.update(10, 100)
+    decision = quality.update(90, 10)
+    assert decision['skip'] == 0
+
+
+def test_growth_only_when_it_still_meets_target():
+    quality = _controller()
+    assert quality.update(36, 30) is None
+    assert quality.update(60, 15)['size'] == 704
+
+
+def test_cooldown_skips_windows():
+    quality = _controller(cooldown=1)
+    assert quality.update(10, 100) is not None
+    assert quality.update(10, 100) is None
+    assert quality.update(10, 100) is not None
+
+
+def test_latency_target():
+    quality = QualityController(QUALITY_TARGET_LATENCY, 50, 640, cooldown=0)
+    assert quality.update(30, 100)['reason'] == "over budget"
+
+
+def test_reset_clamps_size():
+    quality = _controller()
+    quality.reset(4000)
+    assert quality.size == 1280 and quality.skip == 0
@@ -0,0 +1,36 @@
+import json
+
+import numpy as np
+
+from config import RECORD_FPS_PROBE_FRAMES, RECORD_SIZE_CHECK_FRAMES
+from core.recorder import VideoRecorder
+
+
+def _record(recorder, timestamps, shape=(48, 64, 3)):
+    rng = np.random.default_rng(0)
+    recorder.start()
+    for index, timestamp in enumerate(timestamps):
+        recorder._queue.put((rng.integers(0, 255, shape, np.uint8), timestamp, index, None))
+    recorder.stop()
+
+
+def _sidecar_rows(segment):
+    with open(segment.rsplit('.', 1)[0] + '.jsonl') as f:
+        return [json.loads(line) for line in f][1:]
+
+
+def test_sidecar_keeps_rows_for_duplicate_timestamps(tmp_path):
+    recorder = VideoRecorder(str(tmp_path / 'rec.avi'), raw=True)
+    timestamps = [(i // 2) * 0.1 for i in range(RECORD_FPS_PROBE_FRAMES + 10)]
+    _record(recorder, timestamps)
+    rows = _sidecar_rows(recorder.segments[0])
+    assert [row['source_frame'] for row in rows] == list(range(len(timestamps)))
+    assert all(a['frame'] <= b['frame'] for a, b in zip(rows, rows[1:]))
+
+
+def test_size_rotation_fires_when_repeats_step_over_the_check(tmp_path):
+    recorder = VideoRecorder(str(tmp_path / 'rec.avi'), segment_bytes=1)
+    probe = [i * 0.1 for i in range(RECORD_FPS_PROBE_FRAMES)]
+    gaps = [probe[-1] + i * 0.7 for i in range(1, RECORD_SIZE_CHECK_FRAMES)]
+    _record(recorder, probe + gaps, (240, 320, 3))
+    assert len(recorder.segments) > 1
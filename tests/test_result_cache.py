@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pytest
+
+import core.backends as backends
+import core.result_cache as result_cache
+from config import BACKEND_INT8_STATIC
+from core.result_cache import ResultCache, enforce_limit
+from core.results import Detections
+
+
+@pytest.fixture
+def video(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, 'weights_hash', lambda: 'model-a')
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(os.urandom(4096))
+    return str(path)
+
+
+def _detections(count):
+    return Detections(np.arange(count * 4, dtype=np.int32).reshape(count, 4),
+                      np.linspace(0.1, 0.9, count, dtype=np.float32), np.arange(count, dtype=np.int32))
+
+
+def test_round_trip(tmp_path, video):
+    root = str(tmp_path / "cache")
+    cache = ResultCache(video, 'torch', 640, root=root)
+    cache.put(0, _detections(3))
+    cache.put(2, _detections(0))
+    cache.close()
+
+    cache = ResultCache(video, 'torch', 640, root=root)
+    assert cache.frames == 2
+    assert cache.get(0).xyxy.tolist() == _detections(3).xyxy.tolist()
+    assert len(cache.get(2).conf) == 0
+    assert cache.get(1) is None
+    assert cache.hit_ratio == 2 / 3
+
+
+def test_key_includes_size_and_mode(tmp_path, video):
+    root = str(tmp_path / "cache")
+    cache = ResultCache(video, 'torch', 640, root=root)
+    cache.put(0, _detections(1))
+    cache.close()
+    assert ResultCache(video, 'torch', 320, root=root).frames == 0
+    assert ResultCache(video, 'torch', 640, 'tiled', root=root).frames == 0
+
+
+def test_key_includes_interpolation_and_calibration(tmp_path, video, monkeypatch):
+    root = str(tmp_path / "cache")
+    monkeypatch.setattr(backends, 'calibration_hash', lambda folder=None: 'calib-a')
+    cache = ResultCache(video, BACKEND_INT8_STATIC, 640, root=root)
+    cache.put(0, _detections(1))
+    cache.close()
+    assert ResultCache(video, BACKEND_INT8_STATIC, 640, root=root).frames == 1
+    assert ResultCache(video, BACKEND_INT8_STATIC, 640, interpolation='area', root=root).frames == 0
+    monkeypatch.setattr(backends, 'calibration_hash', lambda folder=None: 'calib-b')
+    assert ResultCache(video, BACKEND_INT8_STATIC, 640, root=root).frames == 0
+
+
+def test_new_weights_invalidate_entries(tmp_path, video, monkeypatch):
+    root = str(tmp_path / "cache")
+    cache = ResultCache(video, 'torch', 640, root=root)
+    cache.put(0, _detections(1))
+    cache.close()
+    monkeypatch.setattr(result_cache, 'weights_hash', lambda: 'model-b')
+    cache = ResultCache(video, 'torch', 640, root=root)
+    assert cache.frames == 0
+    assert not any(files for _, _, files in os.walk(root))
+
+
+def test_enforce_limit_evicts_oldest(tmp_path):
+    root = tmp_path / "cache"
+    for index, name in enumerate(("old", "new")):
+        folder = root / name
+        folder.mkdir(parents=True)
+        path = folder / "entry.npz"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (index, index))
+    enforce_limit(str(root), 150)
+    assert sorted(os.listdir(root)) == ["new"]
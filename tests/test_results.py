@@ -0,0 +1,36 @@
+import numpy as np
+
+from core.results import (
+    Detections,
+    concat_detections,
+    empty_detections,
+    filter_detections,
+    offset_detections,
+    outside_regions,
+)
+
+
+def _detections():
+    return Detections(np.array([[0, 0, 10, 10], [100, 100, 120, 120]], np.int32),
+                      np.array([0.2, 0.7], np.float32), np.array([1, 2], np.int32))
+
+
+def test_filter_detections():
+    detections = _detections()
+    assert filter_detections(detections, 0.1) is detections
+    assert filter_detections(detections, 0.5).cls.tolist() == [2]
+
+
+def test_offset_and_concat():
+    moved = offset_detections(_detections(), 5, 7)
+    assert moved.xyxy[0].tolist() == [5, 7, 15, 17]
+    merged = concat_detections([_detections(), moved])
+    assert len(merged.conf) == 4
+    assert len(concat_detections([]).conf) == 0
+
+
+def test_outside_regions_keeps_boxes_centred_elsewhere():
+    detections = _detections()
+    assert outside_regions(detections, [(90, 90, 200, 200)]).cls.tolist() == [1]
+    assert outside_regions(detections, []) is detections
+    assert len(outside_regions(empty_detections(), [(0, 0, 5, 5)]).conf) == 0
@@ -0,0 +1,60 @@
+import numpy as np
+
+from core.results import Detections
+from core.tiling import TileGrid, nms_detections
+
+
+def _detections(boxes, conf, cls):
+    return Detections(np.array(boxes, np.int32), np.array(conf, np.float32), np.array(cls, np.int32))
+
+
+def test_small_frame_is_not_tiled():
+    grid = TileGrid(800, 600, 640)
+    assert grid.tiles == [(0, 0, 800, 600)]
+    assert not grid.tiled
+
+
+def test_tiles_cover_large_frame_with_overlap():
+    grid = TileGrid(3840, 2160, 640, overlap=0.2, include_full=False)
+    xs = sorted({x1 for x1, _, _, _ in grid.tiles})
+    assert xs[0] == 0 and max(x2 for _, _, x2, _ in grid.tiles) == 3840
+    assert max(y2 for _, _, _, y2 in grid.tiles) == 2160
+    assert all(b - a <= 640 * 0.8 for a, b in zip(xs, xs[1:]))
+    assert all((x2 - x1, y2 - y1) == (640, 640) for x1, y1, x2, y2 in grid.tiles)
+
+
+def test_include_full_frame_and_matches():
+    grid = TileGrid(3840, 2160, 640, include_full=True)
+    assert grid.tiles[-1] == (0, 0, 3840, 2160)
+    assert grid.matches(3840, 2160, 640, include_full=True)
+    assert not grid.matches(1920, 1080, 640, include_full=True)
+
+
+def test_select_keeps_tiles_touching_regions():
+    grid = TileGrid(2560, 1440, 640, overlap=0.0, include_full=False)
+    selected = grid.select([(10, 10, 20, 20)])
+    assert selected == [(0, 0, 640, 640)]
+
+
+def test_nms_merges_duplicates_across_tiles():
+    detections = _detections([[100, 100, 200, 200], [102, 98, 201, 203], [400, 400, 500, 500]],
+                             [0.6, 0.9, 0.8], [0, 0, 0])
+    kept = nms_detections(detections, threshold=0.5, metric="iou")
+    assert sorted(kept.conf.tolist()) == [np.float32(0.8), np.float32(0.9)]
+
+
+def test_nms_is_class_aware():
+    detections = _detections([[100, 100, 200, 200], [100, 100, 200, 200]], [0.9, 0.8], [0, 1])
+    assert len(nms_detections(detections, threshold=0.5, metric="iou").conf) == 2
+
+
+def test_ios_suppresses_box_cut_by_tile_edge():
+    detections = _detections([[100, 100, 300, 200], [100, 100, 180, 200]], [0.9, 0.7], [2, 2])
+    assert len(nms_detections(detections, threshold=0.6, metric="iou").conf) == 2
+    kept = nms_detections(detections, threshold=0.6, metric="ios")
+    assert kept.xyxy.tolist() == [[100, 100, 300, 200]]
+
+
+def test_nms_single_detection_passthrough():
+    detections = _detections([[0, 0, 10, 10]], [0.5], [0])
+    assert nms_detections(detections) is detections
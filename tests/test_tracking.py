@@ -0,0 +1,66 @@
+import numpy as np
+
+from core.results import Detections
+from core.tracking import DetectionScheduler, IoUTracker, greedy_match, iou_matrix
+
+
+def _detections(boxes, cls=None):
+    count = len(boxes)
+    return Detections(np.array(boxes, np.int32).reshape(-1, 4), np.full(count, 0.8, np.float32),
+                      np.array(cls if cls is not None else [0] * count, np.int32))
+
+
+def test_iou_matrix_and_greedy_match():
+    iou = iou_matrix([[0, 0, 10, 10], [20, 20, 30, 30]], [[21, 21, 31, 31], [0, 0, 10, 10]])
+    assert iou[0, 1] == 1.0
+    assert greedy_match(iou, 0.3) == [(0, 1), (1, 0)]
+
+
+def test_tracker_keeps_ids_for_moving_objects():
+    tracker = IoUTracker()
+    detections, ids = tracker.update(_detections([[0, 0, 50, 50], [100, 100, 150, 150]]))
+    first = dict(zip(detections.xyxy[:, 0].tolist(), ids.tolist()))
+    detections, ids = tracker.update(_detections([[105, 100, 155, 150], [5, 0, 55, 50]]))
+    second = dict(zip(detections.xyxy[:, 0].tolist(), ids.tolist()))
+    assert second == {5: first[0], 105: first[100]}
+
+
+def test_tracker_predicts_with_velocity():
+    tracker = IoUTracker()
+    tracker.update(_detections([[0, 0, 50, 50]]))
+    tracker.update(_detections([[10, 0, 60, 50]]))
+    detections, _ = tracker.predict()
+    assert detections.xyxy[0, 0] > 10
+
+
+def test_tracker_does_not_match_across_classes():
+    tracker = IoUTracker()
+    _, first = tracker.update(_detections([[0, 0, 50, 50]], [0]))
+    detections, ids = tracker.update(_detections([[0, 0, 50, 50]], [1]))
+    assert ids[detections.cls == 1].tolist() != first.tolist()
+
+
+def test_tracker_drops_lost_tracks_and_resets():
+    tracker = IoUTracker(max_missed=2)
+    tracker.update(_detections([[0, 0, 50, 50]]))
+    for _ in range(3):
+        detections, ids = tracker.update(_detections([]))
+    assert not len(ids)
+    tracker.update(_detections([[0, 0, 50, 50]]))
+    tracker.reset()
+    assert not len(tracker.current()[1])
+
+
+def test_scheduler_fixed_interval():
+    scheduler = DetectionScheduler(3)
+    assert [scheduler.should_detect() for _ in range(7)] == [True, False, False, True, False, False, True]
+    assert scheduler.detected_ratio == 3 / 7
+
+
+def test_adaptive_scheduler_backs_off_and_recovers():
+    scheduler = DetectionScheduler(0)
+    for _ in range(3):
+        scheduler.feedback(1.0)
+    assert scheduler.interval == 4
+    scheduler.feedback(0.1)
+    assert scheduler.interval == 2
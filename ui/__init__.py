@@ -1,4 +1,5 @@
 from ui.components import CollapsibleWidget
-from ui.widgets import VideoDisplay, StatsPanel, ControlPanel, DetectionList
+from ui.widgets import VideoDisplay, VideoGrid, PlaybackBar, StatsPanel, ControlPanel, DetectionList
 
-__all__ = ['CollapsibleWidget', 'VideoDisplay', 'StatsPanel', 'ControlPanel', 'DetectionList']
+__all__ = ['CollapsibleWidget', 'VideoDisplay', 'VideoGrid', 'PlaybackBar', 'StatsPanel', 'ControlPanel',
+           'DetectionList']
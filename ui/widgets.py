@@ -1,63 +1,211 @@
-import cv2
+import math
+import time
 from PyQt5.QtWidgets import (
-    QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
-    QFileDialog, QSlider, QComboBox, QFrame, QListWidget, QListWidgetItem
+    QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QGridLayout,
+    QFileDialog, QSlider, QComboBox, QCheckBox, QFrame, QListView
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal, QAbstractListModel, QModelIndex
 from PyQt5.QtGui import QImage, QPixmap, QColor
 
 from config import (
     DEFAULT_CONFIDENCE,
     DEFAULT_INFERENCE_SIZE,
+    DEFAULT_INTERPOLATION,
+    DEFAULT_DETECT_INTERVAL,
+    DEFAULT_BATCH_SIZE,
     MIN_INFERENCE_SIZE,
     MAX_INFERENCE_SIZE,
     SIDE_PANEL_WIDTH,
     VIDEO_EXTENSIONS,
     SCREENSHOT_PREFIX,
+    BACKEND_LABELS,
+    GRID_TILE_MIN_WIDTH,
+    GRID_TILE_MIN_HEIGHT,
+    QUALITY_TARGET_FPS,
+    QUALITY_TARGET_LATENCY,
+    DEFAULT_PACING,
+    PACING_REALTIME,
+    PACING_THROUGHPUT,
 )
 from config.styles import DARK_THEME_STYLESHEET
-from core.detection import DetectionEngine, ColorManager
+from core import DetectionEngine, ColorManager
+from core.backends import available_backends, missing_modules, unavailable_reason, BACKEND_MODULES, CUDA_BACKENDS
 from ui.components import CollapsibleWidget
 
 
 class VideoDisplay(QFrame):
-    def __init__(self, parent=None):
+    size_changed = pyqtSignal(int, int)
+
+    def __init__(self, parent=None, min_width=800, min_height=600):
         super().__init__(parent)
+        self._last_seq = None
+        self._paint_ms = 0.0
         self.setObjectName("videoContainer")
         self._layout = QVBoxLayout(self)
         self._layout.setContentsMargins(0, 0, 0, 0)
 
         self._image_label = QLabel()
         self._image_label.setAlignment(Qt.AlignCenter)
-        self._image_label.setMinimumSize(800, 600)
+        self._image_label.setMinimumSize(min_width, min_height)
         self._layout.addWidget(self._image_label)
 
-    def update_frame(self, frame):
-        if frame is not None:
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb.shape
-            qt_img = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888)
-            scaled = QPixmap.fromImage(qt_img).scaled(
-                self._image_label.width(), self._image_label.height(),
-                Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
-            self._image_label.setPixmap(scaled)
+    @property
+    def paint_ms(self):
+        return self._paint_ms
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.size_changed.emit(self._image_label.width(), self._image_label.height())
+
+    def update_frame(self, frame, seq=None):
+        if frame is None or (seq is not None and seq == self._last_seq):
+            return
+
+        start = time.perf_counter()
+        h, w = frame.shape[:2]
+        label_w, label_h = self._image_label.width(), self._image_label.height()
+        qt_img = QImage(frame.data, w, h, frame.strides[0], QImage.Format_BGR888)
+        pixmap = QPixmap.fromImage(qt_img)
+        if w > label_w or h > label_h:
+            pixmap = pixmap.scaled(label_w, label_h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self._image_label.setPixmap(pixmap)
+
+        self._last_seq = seq
+        self._paint_ms = 0.9 * self._paint_ms + 0.1 * (time.perf_counter() - start) * 1000
+
+
+class VideoGrid(QWidget):
+    size_changed = pyqtSignal(int, int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._layout = QGridLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._layout.setSpacing(6)
+        self._tiles = []
+        self._captions = []
+
+    @property
+    def count(self):
+        return len(self._tiles)
+
+    def set_count(self, count):
+        while self._layout.count():
+            item = self._layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+        self._tiles = []
+        self._captions = []
+
+        columns = max(1, math.ceil(math.sqrt(count)))
+        for index in range(count):
+            tile = QWidget()
+            tile_layout = QVBoxLayout(tile)
+            tile_layout.setContentsMargins(0, 0, 0, 0)
+            tile_layout.setSpacing(2)
+
+            display = VideoDisplay(min_width=GRID_TILE_MIN_WIDTH, min_height=GRID_TILE_MIN_HEIGHT)
+            display.size_changed.connect(lambda w, h, i=index: self.size_changed.emit(i, w, h))
+            tile_layout.addWidget(display)
+
+            caption = QLabel(f"#{index + 1}  FPS: --")
+            caption.setObjectName("tileLabel")
+            tile_layout.addWidget(caption)
+
+            self._layout.addWidget(tile, index // columns, index % columns)
+            self._tiles.append(display)
+            self._captions.append(caption)
+
+    def update_frame(self, index, frame, seq=None):
+        if 0 <= index < len(self._tiles):
+            self._tiles[index].update_frame(frame, seq)
+
+    def set_fps(self, index, fps):
+        if 0 <= index < len(self._captions):
+            self._captions[index].setText(f"#{index + 1}  FPS: {fps:.1f}")
+
+
+class PlaybackBar(QWidget):
+    seek_requested = pyqtSignal(int)
+    step_requested = pyqtSignal(int)
+    pause_toggled = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paused = False
+        self._duration = 0.0
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 6, 0, 0)
+
+        self._back_btn = QPushButton("⏮")
+        self._play_btn = QPushButton("⏸")
+        self._forward_btn = QPushButton("⏭")
+        for button in (self._back_btn, self._play_btn, self._forward_btn):
+            button.setFixedWidth(36)
+            layout.addWidget(button)
+
+        self._slider = QSlider(Qt.Horizontal)
+        self._slider.setMinimum(0)
+        self._slider.setFixedHeight(10)
+        layout.addWidget(self._slider, 1)
+
+        self._time_label = QLabel("0:00 / 0:00")
+        self._time_label.setObjectName("playbackTime")
+        layout.addWidget(self._time_label)
+
+        self._back_btn.clicked.connect(lambda: self._step(-1))
+        self._forward_btn.clicked.connect(lambda: self._step(1))
+        self._play_btn.clicked.connect(lambda: self.set_paused(not self._paused, notify=True))
+        self._slider.sliderMoved.connect(self.seek_requested.emit)
+
+    @staticmethod
+    def _format(seconds):
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+    def _step(self, delta):
+        self.set_paused(True)
+        self.step_requested.emit(delta)
+
+    def set_range(self, frame_count, duration):
+        if self._slider.maximum() != max(0, frame_count - 1):
+            self._slider.setMaximum(max(0, frame_count - 1))
+        self._duration = duration
+
+    def set_position(self, index, seconds):
+        if not self._slider.isSliderDown():
+            self._slider.setValue(max(0, index))
+        self._time_label.setText(f"{self._format(seconds)} / {self._format(self._duration)}")
+
+    def set_paused(self, paused, notify=False):
+        self._paused = paused
+        self._play_btn.setText("▶" if paused else "⏸")
+        if notify:
+            self.pause_toggled.emit(paused)
 
 
 class StatsPanel(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("statsCard")
-        self._layout = QHBoxLayout(self)
+        outer = QVBoxLayout(self)
+        self._layout = QHBoxLayout()
+        outer.addLayout(self._layout)
 
-        self._fps_widget = self._create_stat_widget("0", "FPS")
-        self._objs_widget = self._create_stat_widget("0", "Objects")
-        self._total_widget = self._create_stat_widget("0", "Total")
+        self._fps_widget, self._fps_value = self._create_stat_widget("0", "FPS")
+        self._objs_widget, self._objs_value = self._create_stat_widget("0", "Objects")
+        self._total_widget, self._total_value = self._create_stat_widget("0", "Total")
 
         self._layout.addWidget(self._fps_widget)
         self._layout.addWidget(self._objs_widget)
         self._layout.addWidget(self._total_widget)
 
+        self._latency_label = QLabel()
+        self._latency_label.setObjectName("latencyOverlay")
+        self._latency_label.setVisible(False)
+        outer.addWidget(self._latency_label)
+
     def _create_stat_widget(self, value, label):
         widget = QWidget()
         layout = QVBoxLayout(widget)
@@ -73,29 +221,51 @@ class StatsPanel(QWidget):
         lbl.setAlignment(Qt.AlignCenter)
         layout.addWidget(lbl)
 
-        return widget
+        return widget, val
 
     def update_stats(self, fps, objects, total):
-        self._fps_widget.findChild(QLabel).setText(f"{fps:.0f}")
-        self._objs_widget.findChild(QLabel).setText(str(objects))
-        self._total_widget.findChild(QLabel).setText(str(total))
+        self._fps_value.setText(f"{fps:.0f}")
+        self._objs_value.setText(str(objects))
+        self._total_value.setText(str(total))
+
+    def update_latency(self, snapshot):
+        stages = snapshot.get('stages', {})
+        if not stages:
+            self._latency_label.setVisible(False)
+            return
+        lines = [f"{'stage':<12}{'p50':>8}{'p95':>8}{'p99':>8}"]
+        for stage, summary in stages.items():
+            values = "".join(f"{summary[key] if summary[key] is not None else '-':>8}" for key in ('p50', 'p95', 'p99'))
+            lines.append(f"{stage:<12}{values}")
+        counters = snapshot.get('counters', {})
+        gauges = snapshot.get('gauges', {})
+        lines.append(f"dropped {counters.get('dropped_frames', 0)}  "
+                     f"queues {gauges.get('decode_queue', 0)}/{gauges.get('annotate_queue', 0)}")
+        self._latency_label.setText("\n".join(lines))
+        self._latency_label.setVisible(True)
 
 
 class ControlPanel:
     def __init__(self, parent=None):
-        import torch
-        
         self._widget = CollapsibleWidget("Controls")
         self._source_combo = QComboBox()
-        self._source_combo.addItems(["Webcam", "Select Video File"])
+        self._source_combo.addItems(["Webcam", "Select Video File", "Multiple Streams", "Network Stream"])
 
         self._device_combo = QComboBox()
-        self._device_combo.addItem("CPU")
-        try:
-            if torch.cuda.is_available():
-                self._device_combo.addItem("GPU")
-        except Exception:
-            pass
+        for backend in BACKEND_MODULES:
+            if missing_modules(backend):
+                continue
+            self._device_combo.addItem(f"CPU ({BACKEND_LABELS[backend]})", ("cpu", backend))
+            reason = unavailable_reason(backend)
+            if reason:
+                item = self._device_combo.model().item(self._device_combo.count() - 1)
+                item.setEnabled(False)
+                item.setToolTip(reason)
+
+        self._workers_combo = QComboBox()
+        self._workers_combo.addItem("In-process", 0)
+        for count in (2, 4, 8, 16):
+            self._workers_combo.addItem(f"{count} worker processes", count)
 
         self._conf_slider = QSlider(Qt.Horizontal)
         self._conf_slider.setMinimum(1)
@@ -114,10 +284,42 @@ class ControlPanel:
 
         self._size_value = QLabel(f"{DEFAULT_INFERENCE_SIZE}px")
 
+        self._interp_combo = QComboBox()
+        self._interp_combo.addItems(["Linear", "Area"])
+        self._interp_combo.setCurrentText(DEFAULT_INTERPOLATION.capitalize())
+
+        self._interval_combo = QComboBox()
+        for text, interval in (("Every frame", 1), ("Every 2 frames", 2), ("Every 4 frames", 4),
+                               ("Every 8 frames", 8), ("Adaptive", 0)):
+            self._interval_combo.addItem(text, interval)
+        self._interval_combo.setCurrentIndex(self._interval_combo.findData(DEFAULT_DETECT_INTERVAL))
+
+        self._quality_combo = QComboBox()
+        self._quality_combo.addItem("Fixed", None)
+        for text, target in (("Hold 30 FPS", (QUALITY_TARGET_FPS, 30)), ("Hold 15 FPS", (QUALITY_TARGET_FPS, 15)),
+                             ("Hold 10 FPS", (QUALITY_TARGET_FPS, 10)), ("Under 50 ms", (QUALITY_TARGET_LATENCY, 50)),
+                             ("Under 100 ms", (QUALITY_TARGET_LATENCY, 100))):
+            self._quality_combo.addItem(text, target)
+        self._quality_value = QLabel("")
+
+        self._pacing_combo = QComboBox()
+        self._pacing_combo.addItem("Real-time", PACING_REALTIME)
+        self._pacing_combo.setItemData(0, "Plays at the file's own speed, one frame per inference", Qt.ToolTipRole)
+        self._pacing_combo.addItem("Max throughput", PACING_THROUGHPUT)
+        self._pacing_combo.setItemData(1, f"Runs video files in batches of {DEFAULT_BATCH_SIZE} frames as fast as "
+                                          f"the model allows", Qt.ToolTipRole)
+        self._pacing_combo.setCurrentIndex(self._pacing_combo.findData(DEFAULT_PACING))
+
+        self._motion_check = QCheckBox("Skip static frames")
+        self._tiling_check = QCheckBox("Tile high-resolution frames")
+        self._log_check = QCheckBox("Log detections")
+        self._cache_check = QCheckBox("Cache results for video files")
+
         self._start_btn = QPushButton("▶  Start Detection")
         self._stop_btn = QPushButton("⏹  Stop")
         self._screenshot_btn = QPushButton("📷  Screenshot")
         self._record_btn = QPushButton("⏺  Record")
+        self._raw_record_check = QCheckBox("Record raw + detections")
 
         self._build_ui()
 
@@ -131,6 +333,7 @@ class ControlPanel:
 
         layout.addWidget(self._create_label("Device"))
         layout.addWidget(self._device_combo)
+        layout.addWidget(self._workers_combo)
 
         layout.addWidget(self._create_label("Confidence"))
         layout.addWidget(self._conf_slider)
@@ -140,6 +343,23 @@ class ControlPanel:
         layout.addWidget(self._size_slider)
         layout.addWidget(self._size_value)
 
+        layout.addWidget(self._create_label("Quality"))
+        layout.addWidget(self._quality_combo)
+        layout.addWidget(self._quality_value)
+
+        layout.addWidget(self._create_label("Video Pacing"))
+        layout.addWidget(self._pacing_combo)
+
+        layout.addWidget(self._create_label("Resize Filter"))
+        layout.addWidget(self._interp_combo)
+
+        layout.addWidget(self._create_label("Detect"))
+        layout.addWidget(self._interval_combo)
+        layout.addWidget(self._motion_check)
+        layout.addWidget(self._tiling_check)
+        layout.addWidget(self._log_check)
+        layout.addWidget(self._cache_check)
+
         btn_layout = QHBoxLayout()
         btn_layout.addWidget(self._start_btn)
         btn_layout.addWidget(self._stop_btn)
@@ -149,9 +369,15 @@ class ControlPanel:
         btn_layout2.addWidget(self._screenshot_btn)
         btn_layout2.addWidget(self._record_btn)
         layout.addLayout(btn_layout2)
+        layout.addWidget(self._raw_record_check)
 
         self._widget.content_layout.addWidget(content)
 
+    def add_cuda_devices(self):
+        for backend in available_backends():
+            if backend in CUDA_BACKENDS:
+                self._device_combo.addItem(f"GPU ({BACKEND_LABELS[backend]})", ("cuda", backend))
+
     def _create_label(self, text):
         lbl = QLabel(text)
         lbl.setObjectName("section-label")
@@ -169,6 +395,10 @@ class ControlPanel:
     def device_combo(self):
         return self._device_combo
 
+    @property
+    def workers_combo(self):
+        return self._workers_combo
+
     @property
     def conf_slider(self):
         return self._conf_slider
@@ -185,6 +415,42 @@ class ControlPanel:
     def size_value(self):
         return self._size_value
 
+    @property
+    def interp_combo(self):
+        return self._interp_combo
+
+    @property
+    def quality_combo(self):
+        return self._quality_combo
+
+    @property
+    def quality_value(self):
+        return self._quality_value
+
+    @property
+    def pacing_combo(self):
+        return self._pacing_combo
+
+    @property
+    def interval_combo(self):
+        return self._interval_combo
+
+    @property
+    def motion_check(self):
+        return self._motion_check
+
+    @property
+    def tiling_check(self):
+        return self._tiling_check
+
+    @property
+    def cache_check(self):
+        return self._cache_check
+
+    @property
+    def log_check(self):
+        return self._log_check
+
     @property
     def start_btn(self):
         return self._start_btn
@@ -201,17 +467,64 @@ class ControlPanel:
     def record_btn(self):
         return self._record_btn
 
+    @property
+    def raw_record_check(self):
+        return self._raw_record_check
 
-class DetectionList(QListWidget):
+
+class DetectionModel(QAbstractListModel):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setObjectName("detectionList")
+        self._labels = []
+        self._counts = {}
+        self._colors = {}
         self._color_manager = ColorManager()
 
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._labels)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        label = self._labels[index.row()]
+        if role == Qt.DisplayRole:
+            return f"  {label}: {self._counts[label]}"
+        if role == Qt.ForegroundRole:
+            hex_color = self._color_manager.get_color(label)
+            color = self._colors.get(hex_color)
+            if color is None:
+                color = self._colors[hex_color] = QColor(hex_color)
+            return color
+        return None
+
+    def set_counts(self, counter):
+        for row in range(len(self._labels) - 1, -1, -1):
+            if self._labels[row] not in counter:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._counts[self._labels.pop(row)]
+                self.endRemoveRows()
+
+        for row, label in enumerate(sorted(counter)):
+            count = counter[label]
+            if row < len(self._labels) and self._labels[row] == label:
+                if self._counts[label] != count:
+                    self._counts[label] = count
+                    changed = self.index(row)
+                    self.dataChanged.emit(changed, changed, [Qt.DisplayRole])
+                continue
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._labels.insert(row, label)
+            self._counts[label] = count
+            self.endInsertRows()
+
+
+class DetectionList(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("detectionList")
+        self.setUniformItemSizes(True)
+        self._model = DetectionModel(self)
+        self.setModel(self._model)
+
     def update_items(self, counter):
-        self.clear()
-        for label, count in sorted(counter.items()):
-            color = self._color_manager.get_color(label)
-            item = QListWidgetItem(f"  {label}: {count}")
-            item.setForeground(QColor(color))
-            self.addItem(item)
+        self._model.set_counts(counter)